@@ -0,0 +1,137 @@
+"""
+Client-side load balancing across CMS replicas.
+
+The gateway talks to every replica in CMS_API_URLS directly instead of
+going through an external load balancer:
+
+- Calls for one page carry an affinity key (its slug) and are routed by
+  consistent hashing, so each replica's local caches - stored renderings,
+  payloads, Django's cache - stay warm for its share of pages, and adding
+  or removing a replica only moves about 1/N of the pages.
+- Other calls go to the replica with fewer outstanding requests out of two
+  picked at random ("p2c", the default) or the one with the fewest overall
+  ("least_outstanding"), set with CMS_BALANCER.
+- Health is tracked passively: after CMS_EJECT_AFTER consecutive failures a
+  replica is ejected for CMS_EJECT_SECONDS, doubling for every ejection in a
+  row up to eight times that. Ejected replicas are skipped by both
+  strategies; if every replica is ejected, all of them are used again.
+"""
+import bisect
+import hashlib
+import logging
+import os
+import random
+import time
+from typing import Callable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CMS_BALANCER = os.getenv("CMS_BALANCER", "p2c")
+CMS_EJECT_AFTER = int(os.getenv("CMS_EJECT_AFTER", 5))
+CMS_EJECT_SECONDS = float(os.getenv("CMS_EJECT_SECONDS", 30))
+# Points per replica on the hash ring; more points spread pages more evenly
+HASH_RING_POINTS = int(os.getenv("CMS_HASH_RING_POINTS", 100))
+
+
+def _hash(value: str) -> int:
+    # Stable across processes, unlike hash(), so every gateway worker agrees
+    return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+
+class Upstream:
+    """One CMS replica and what the gateway has seen of it"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.outstanding = 0
+        self.failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+
+    def __repr__(self) -> str:
+        return f"Upstream({self.url!r})"
+
+    def snapshot(self, now: float) -> dict:
+        return {
+            "outstanding": self.outstanding,
+            "consecutive_failures": self.failures,
+            "ejected_for": round(max(0.0, self.ejected_until - now), 1),
+        }
+
+
+class Balancer:
+    def __init__(
+        self,
+        urls: Iterable[str],
+        strategy: str = CMS_BALANCER,
+        eject_after: int = CMS_EJECT_AFTER,
+        eject_seconds: float = CMS_EJECT_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.upstreams = [Upstream(url) for url in urls]
+        if not self.upstreams:
+            raise ValueError("At least one CMS URL is required")
+        self.strategy = strategy
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self.clock = clock
+        self._ring = sorted(
+            (_hash(f"{upstream.url}#{point}"), index)
+            for index, upstream in enumerate(self.upstreams)
+            for point in range(HASH_RING_POINTS)
+        )
+        self._ring_keys = [point for point, _index in self._ring]
+
+    def _available(self, exclude) -> List[Upstream]:
+        now = self.clock()
+        candidates = [upstream for upstream in self.upstreams if upstream not in exclude]
+        healthy = [upstream for upstream in candidates if upstream.ejected_until <= now]
+        return healthy or candidates
+
+    def _by_hash(self, key: str, available: List[Upstream]) -> Upstream:
+        """First available replica clockwise from the key on the ring"""
+        start = bisect.bisect(self._ring_keys, _hash(key))
+        for offset in range(len(self._ring)):
+            upstream = self.upstreams[self._ring[(start + offset) % len(self._ring)][1]]
+            if upstream in available:
+                return upstream
+        return available[0]
+
+    def choose(self, key: Optional[str] = None, exclude: Iterable[Upstream] = ()) -> Optional[Upstream]:
+        """Pick a replica for a call, or None when every replica is excluded"""
+        available = self._available(set(exclude))
+        if not available:
+            return None
+        if len(available) == 1:
+            return available[0]
+        if key:
+            return self._by_hash(key, available)
+        if self.strategy == "least_outstanding":
+            fewest = min(upstream.outstanding for upstream in available)
+            return random.choice([upstream for upstream in available if upstream.outstanding == fewest])
+        first, second = random.sample(available, 2)
+        return first if first.outstanding <= second.outstanding else second
+
+    def started(self, upstream: Upstream) -> None:
+        upstream.outstanding += 1
+
+    def finished(self, upstream: Upstream, ok: Optional[bool]) -> None:
+        """Record the end of a call; `ok` is None when it ended without an outcome"""
+        upstream.outstanding -= 1
+        if ok is None:
+            return
+        if ok:
+            upstream.failures = 0
+            upstream.ejections = 0
+            return
+        upstream.failures += 1
+        if upstream.failures >= self.eject_after and upstream.ejected_until <= self.clock():
+            upstream.ejections += 1
+            seconds = self.eject_seconds * 2 ** min(upstream.ejections - 1, 3)
+            upstream.ejected_until = self.clock() + seconds
+            upstream.failures = 0
+            logger.warning(f"Ejecting CMS replica {upstream.url} for {seconds:.0f}s")
+
+    def snapshot(self) -> dict:
+        now = self.clock()
+        return {upstream.url: upstream.snapshot(now) for upstream in self.upstreams}
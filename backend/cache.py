@@ -0,0 +1,143 @@
+"""
+In-process caches for the gateway.
+
+Search results are cached per locale under a normalized form of the query
+(case-folded and whitespace-collapsed) and evicted in
+least-frequently-used order, which suits the heavily skewed search traffic.
+
+The last good body of every CMS GET is kept in `stale_responses`, to be
+served when the CMS is unavailable (see resilience).
+"""
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Return the cache key form of a query: whitespace-collapsed and case-folded, as the CMS searches it"""
+    return _WHITESPACE_RE.sub(" ", query or "").strip().casefold()
+
+
+class LFUCache:
+    """
+    Fixed-size cache that evicts the least frequently used entry, oldest
+    first among equals. Entries also expire after `ttl` seconds.
+
+    The gateway runs on a single event loop, so no locking is needed.
+    """
+
+    def __init__(self, max_entries: int, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: Dict[Hashable, list] = {}  # key -> [value, count, expires_at]
+        self._buckets: Dict[int, OrderedDict] = {}  # count -> keys in insertion order
+        self._min_count = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _touch(self, key: Hashable, entry: list) -> None:
+        count = entry[1]
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        entry[1] = count + 1
+        self._buckets.setdefault(count + 1, OrderedDict())[key] = None
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        bucket = self._buckets[entry[1]]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[entry[1]]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or (entry[2] is not None and entry[2] < time.monotonic()):
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return default
+        self._touch(key, entry)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry[0] = value
+            entry[2] = expires_at
+            self._touch(key, entry)
+            return
+
+        if len(self._entries) >= self.max_entries:
+            bucket = self._buckets.get(self._min_count) or self._buckets[min(self._buckets)]
+            self._remove(next(iter(bucket)))
+
+        self._entries[key] = [value, 1, expires_at]
+        self._buckets.setdefault(1, OrderedDict())[key] = None
+        self._min_count = 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._buckets.clear()
+        self._min_count = 0
+
+
+class SearchCache:
+    """Search results partitioned by locale, keyed on the normalized query"""
+
+    def __init__(self, max_entries: int, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._partitions: Dict[str, LFUCache] = {}
+
+    def _partition(self, locale: str) -> LFUCache:
+        partition = self._partitions.get(locale)
+        if partition is None:
+            partition = self._partitions[locale] = LFUCache(self.max_entries, self.ttl)
+        return partition
+
+    @property
+    def hits(self) -> int:
+        return sum(partition.hits for partition in self._partitions.values())
+
+    @property
+    def misses(self) -> int:
+        return sum(partition.misses for partition in self._partitions.values())
+
+    def get(self, locale: str, query: str) -> Any:
+        return self._partition(locale).get(normalize_query(query))
+
+    def set(self, locale: str, query: str, results: Any) -> None:
+        self._partition(locale).set(normalize_query(query), results)
+
+    def clear(self) -> None:
+        for partition in self._partitions.values():
+            partition.clear()
+
+
+# Cleared when the CMS sends publish events (routers/events.py); the short TTL
+# covers changes that send none, such as drugs and remedies
+search_cache = SearchCache(
+    max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", 500)),
+    ttl=float(os.getenv("SEARCH_CACHE_TTL", 60)),
+)
+
+# Last good CMS bodies, served while a circuit is open or the CMS is down
+stale_responses = LFUCache(
+    max_entries=int(os.getenv("STALE_CACHE_MAX_ENTRIES", 1000)),
+    ttl=float(os.getenv("STALE_CACHE_TTL", 24 * 60 * 60)),
+)
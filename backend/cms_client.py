@@ -0,0 +1,300 @@
+"""
+Shared client for the CMS API.
+
+All routers go through one pooled httpx.AsyncClient instead of opening a new
+connection per call. `fetch_from_cms` decodes the JSON body; `fetch_raw_from_cms`
+returns the body untouched so routes that do not transform the data can pass
+it straight through (see `passthrough` and `validated_passthrough`).
+
+Calls are protected by per-family circuit breakers and bulkheads, with the
+last good body served when the CMS is unavailable (see resilience).
+
+Requests are balanced across the CMS replicas in CMS_API_URLS, with calls
+for one page pinned to a replica by their `affinity` key (see balancer).
+Timeouts follow the observed p99 of each endpoint family, and a GET still
+unanswered after the family's p95 is sent again to another replica;
+whichever answers first wins and the other is cancelled (see latency).
+
+Every fetch takes an optional `lang`, normalized to a locale the CMS serves
+and forwarded as ?lang=, so the CMS picks the matching precomputed payload.
+"""
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Any, Optional, Type
+
+import httpx
+from fastapi import HTTPException
+from fastapi.responses import Response
+from pydantic import BaseModel, ValidationError
+
+from balancer import Balancer, Upstream
+from cache import stale_responses
+from latency import get_histogram, observed
+from metrics import cms_duration, cms_responses
+from resilience import Rejected, guard, route_group
+from serialization import loads
+
+logger = logging.getLogger(__name__)
+
+# Set the CMS API URL from environment variable with a fallback
+CMS_API_URL = os.getenv("CMS_API_URL", "http://localhost:8001/api")
+CMS_TIMEOUT = float(os.getenv("CMS_TIMEOUT", 10.0))
+# CMS replicas, comma separated; a single CMS_API_URL still works
+CMS_API_URLS = [
+    url.strip().rstrip("/") for url in os.getenv("CMS_API_URLS", CMS_API_URL).split(",") if url.strip()
+]
+# Adaptive timeouts: observed p99 times this, never below CMS_MIN_TIMEOUT
+CMS_MIN_TIMEOUT = float(os.getenv("CMS_MIN_TIMEOUT", 1.0))
+TIMEOUT_P99_MULTIPLIER = float(os.getenv("TIMEOUT_P99_MULTIPLIER", 3.0))
+# Duplicate slow GETs to a second replica after the observed p95
+CMS_HEDGING = os.getenv("CMS_HEDGING", "true").lower() in ("1", "true", "yes")
+
+# Locales the CMS serves; the first one is the fallback for anything else
+SUPPORTED_LOCALES = tuple(code.strip() for code in os.getenv("CMS_LOCALES", "en,hi").split(",") if code.strip())
+DEFAULT_LOCALE = SUPPORTED_LOCALES[0]
+
+# Share of passthrough responses checked against their schema in production;
+# every response is checked in other environments
+RESPONSE_VALIDATION_SAMPLE_RATE = float(os.getenv("RESPONSE_VALIDATION_SAMPLE_RATE", 0.01))
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the pooled client, creating it on first use in this event loop"""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            timeout=CMS_TIMEOUT,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def normalize_locale(lang: Optional[str]) -> str:
+    """Map 'hi', 'HI' or 'hi-IN' to 'hi'; anything unsupported to the default"""
+    code = (lang or "").strip().lower().replace("_", "-").split("-")[0]
+    return code if code in SUPPORTED_LOCALES else DEFAULT_LOCALE
+
+
+def with_locale(params, lang: Optional[str]):
+    """Add the normalized ?lang= to request params; unchanged when lang is None"""
+    if lang is None:
+        return params
+    return {**(params or {}), "lang": normalize_locale(lang)}
+
+
+def _stale_key(method: str, endpoint: str, params):
+    if method != "GET":
+        return None
+    return endpoint, tuple(sorted((key, str(value)) for key, value in (params or {}).items()))
+
+
+def _stale_or_unavailable(stale_key, endpoint: str, reason: str, retry_after: Optional[float] = None) -> bytes:
+    """Return the last good body for a request, or raise a 503"""
+    stale = stale_responses.get(stale_key) if stale_key is not None else None
+    if stale is not None:
+        logger.warning(f"Serving stale response for {endpoint}: {reason}")
+        return stale
+    headers = {"Retry-After": str(max(1, round(retry_after)))} if retry_after is not None else None
+    raise HTTPException(
+        status_code=503,
+        detail=f"Service unavailable: Unable to connect to CMS API.",
+        headers=headers,
+    )
+
+
+balancer = Balancer(CMS_API_URLS)
+
+
+def timeout_for(group: str) -> float:
+    p99 = observed(group, 99)
+    if p99 is None:
+        return CMS_TIMEOUT
+    return min(CMS_TIMEOUT, max(CMS_MIN_TIMEOUT, p99 * TIMEOUT_P99_MULTIPLIER))
+
+
+def hedge_delay(group: str, method: str, timeout: float) -> Optional[float]:
+    """Seconds to wait before hedging a call, or None when it should not be hedged"""
+    if not CMS_HEDGING or method != "GET" or len(balancer.upstreams) < 2:
+        return None
+    p95 = observed(group, 95)
+    return p95 if p95 is not None and p95 < timeout else None
+
+
+async def _send(upstream: Upstream, group: str, method: str, endpoint: str, params, json, timeout: float) -> httpx.Response:
+    started = time.perf_counter()
+    balancer.started(upstream)
+    try:
+        response = await get_client().request(
+            method, f"{upstream.url}/{endpoint}", params=params, json=json, timeout=timeout
+        )
+    except asyncio.CancelledError:
+        # A hedge loser took at least this long; keep the tail visible
+        get_histogram(group).record(time.perf_counter() - started)
+        balancer.finished(upstream, None)
+        raise
+    except httpx.RequestError:
+        balancer.finished(upstream, False)
+        raise
+    except BaseException:
+        balancer.finished(upstream, None)
+        raise
+    elapsed = time.perf_counter() - started
+    get_histogram(group).record(elapsed)
+    cms_duration.observe(elapsed, group)
+    balancer.finished(upstream, response.status_code < 500)
+    return response
+
+
+async def _send_hedged(group: str, method: str, endpoint: str, params, json, affinity: Optional[str]) -> httpx.Response:
+    """Send a call, duplicating it to a second replica once it is slower than p95"""
+    primary = balancer.choose(affinity)
+    timeout = timeout_for(group)
+    first = asyncio.create_task(_send(primary, group, method, endpoint, params, json, timeout))
+    delay = hedge_delay(group, method, timeout)
+    if delay is None:
+        return await first
+
+    pending = {first}
+    try:
+        done, pending = await asyncio.wait(pending, timeout=delay)
+        if done:
+            return first.result()
+        secondary = balancer.choose(affinity, exclude=[primary])
+        if secondary is None:
+            return await first
+        logger.info(f"Hedging {endpoint} to {secondary.url} after {delay * 1000:.0f}ms")
+        pending.add(asyncio.create_task(_send(secondary, group, method, endpoint, params, json, timeout)))
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def request_raw_from_cms(
+    method: str, endpoint: str, params=None, json=None, affinity: Optional[str] = None
+) -> bytes:
+    """
+    Call an endpoint and return the (decompressed) response body.
+
+    Calls run under the endpoint family's circuit breaker and bulkhead (see
+    resilience). When a call is rejected or the CMS is down, a GET returns
+    the last good body for the same request if there is one.
+
+    Otherwise errors are raised as HTTPException: 503 when the CMS cannot be
+    reached or the call was rejected, the CMS status code for error
+    responses, and 500 for anything else.
+    """
+    stale_key = _stale_key(method, endpoint, params)
+    group = route_group(endpoint)
+    try:
+        async with guard(group):
+            response = await _send_hedged(group, method, endpoint, params, json, affinity)
+            response.raise_for_status()
+    except Rejected as exc:
+        cms_responses.inc(exc.group, "rejected")
+        logger.warning(f"Not calling CMS for {endpoint}: {type(exc).__name__} for {exc.group}")
+        return _stale_or_unavailable(stale_key, endpoint, type(exc).__name__, exc.retry_after)
+    except httpx.RequestError as exc:
+        cms_responses.inc(group, "error")
+        logger.error(f"Error fetching {endpoint}: {exc}")
+        return _stale_or_unavailable(stale_key, endpoint, str(exc))
+    except httpx.HTTPStatusError as exc:
+        logger.error(f"Error response {exc.response.status_code} from CMS: {exc}")
+        status_code = exc.response.status_code
+        cms_responses.inc(group, status_code)
+        if status_code >= 500 and stale_responses.get(stale_key) is not None:
+            return _stale_or_unavailable(stale_key, endpoint, f"CMS returned {status_code}")
+        try:
+            detail = loads(exc.response.content)
+        except ValueError:
+            detail = str(exc)
+        raise HTTPException(status_code=status_code, detail=detail)
+    except Exception as exc:
+        logger.error(f"Unexpected error fetching {endpoint}: {exc}")
+        raise HTTPException(status_code=500, detail=str(exc))
+
+    cms_responses.inc(group, response.status_code)
+    if stale_key is not None:
+        stale_responses.set(stale_key, response.content)
+    return response.content
+
+
+async def fetch_raw_from_cms(
+    endpoint: str, params=None, lang: Optional[str] = None, affinity: Optional[str] = None
+) -> bytes:
+    """GET an endpoint and return the response body undecoded"""
+    return await request_raw_from_cms("GET", endpoint, with_locale(params, lang), affinity=affinity)
+
+
+async def fetch_from_cms(
+    endpoint: str, params=None, lang: Optional[str] = None, affinity: Optional[str] = None
+) -> Any:
+    """Fetch an endpoint and decode its JSON body"""
+    content = await fetch_raw_from_cms(endpoint, params, lang, affinity)
+    try:
+        return loads(content)
+    except ValueError as exc:
+        logger.error(f"Invalid JSON from CMS for {endpoint}: {exc}")
+        raise HTTPException(status_code=500, detail=str(exc))
+
+
+async def passthrough(
+    endpoint: str, params=None, lang: Optional[str] = None, affinity: Optional[str] = None
+) -> Response:
+    """Return the CMS body to the client as-is, without decoding it"""
+    return Response(content=await fetch_raw_from_cms(endpoint, params, lang, affinity), media_type="application/json")
+
+
+def should_validate() -> bool:
+    if os.getenv("ENV", "production") != "production":
+        return True
+    return random.random() < RESPONSE_VALIDATION_SAMPLE_RATE
+
+
+async def validated_passthrough(
+    endpoint: str,
+    model: Type[BaseModel],
+    params=None,
+    lang: Optional[str] = None,
+    affinity: Optional[str] = None,
+) -> Response:
+    """
+    Return the CMS body as-is instead of decoding it into `model` and
+    encoding it again.
+
+    The body is checked against `model` on a sample of requests (all of
+    them outside production). Mismatches are logged, not raised, so a schema
+    drift shows up in the logs without taking the endpoint down.
+    """
+    content = await fetch_raw_from_cms(endpoint, params, lang, affinity)
+    if should_validate():
+        try:
+            model.model_validate_json(content)
+        except ValidationError as exc:
+            logger.warning(
+                f"CMS response for {endpoint} does not match {model.__name__}: "
+                f"{exc.error_count()} errors, first: {exc.errors()[0]['loc']} {exc.errors()[0]['msg']}"
+            )
+    return Response(content=content, media_type="application/json")
@@ -1,31 +1,101 @@
+"""
+Database access for gateway-owned data (consultations, counters).
+
+Routes run on uvicorn's event loop, so the engine is async: DATABASE_URL
+keeps its usual form (alembic uses it as is) and is switched to the asyncpg
+or aiosqlite driver here. Use the session dependency in routers:
+
+    async def handler(db: AsyncSession = Depends(get_db)): ...
+
+The pool is sized explicitly per worker (DB_POOL_SIZE connections plus
+DB_MAX_OVERFLOW under bursts, waiting at most DB_POOL_TIMEOUT seconds for
+one), connections are checked before use and replaced after
+DB_POOL_RECYCLE seconds, so a restarted database or a proxy dropping idle
+connections surfaces as a reconnect rather than a failed request.
+
+Without DATABASE_URL the gateway still starts; routes that need the
+database answer 503.
+"""
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from typing import AsyncIterator, Optional
+
 from dotenv import load_dotenv
+from fastapi import HTTPException
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
 
 # Load environment variables
 load_dotenv()
 
 # Get DATABASE_URL from environment variable
-DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_URL = os.getenv("DATABASE_URL", "")
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 5))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+
+# Sync driver -> the async driver used for the same database
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
 
-if not DATABASE_URL:
-    raise ValueError("No DATABASE_URL environment variable found")
+def async_url(url: str) -> str:
+    """DATABASE_URL with its driver swapped for the asyncio one"""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    if driver.startswith("postgresql+asyncpg"):
+        # asyncpg takes ssl=, not libpq's sslmode=
+        query = dict(parsed.query)
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        parsed = parsed.set(query=query)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
 
-# Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
 
-# Create sessionmaker
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def create_engine(url: str) -> AsyncEngine:
+    options = {"pool_pre_ping": True}
+    if make_url(url).get_backend_name() != "sqlite":
+        # SQLite files and :memory: databases use their own pool classes
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    return create_async_engine(async_url(url), **options)
+
+
+engine: Optional[AsyncEngine] = create_engine(DATABASE_URL) if DATABASE_URL else None
+
+# Objects stay usable after commit, so handlers can build responses from them
+SessionLocal = async_sessionmaker(engine, expire_on_commit=False, autoflush=False) if engine else None
 
 # Create base class for models
 Base = declarative_base()
 
+
 # Dependency
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncIterator[AsyncSession]:
+    if SessionLocal is None:
+        raise HTTPException(status_code=503, detail="Database is not configured")
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+
+def pool_status() -> dict:
+    """Connections checked out and idle in this worker's pool, for metrics"""
+    pool = engine.pool if engine else None
+    if pool is None or not hasattr(pool, "checkedout"):
+        return {}
+    return {"checked_out": pool.checkedout(), "idle": pool.checkedin(), "overflow": max(pool.overflow(), 0)}
+
+
+async def close_engine():
+    if engine is not None:
+        await engine.dispose()
@@ -0,0 +1,106 @@
+"""
+Latency tracking for calls to the CMS.
+
+Each endpoint family (see resilience.route_group) keeps a histogram of
+response times with exponentially sized buckets, so percentiles cost a
+walk over a few dozen counters. Histograms cover the last one to two
+LATENCY_WINDOW periods: two generations are kept and the older one is
+dropped each period, so estimates follow changes in CMS behaviour.
+
+cms_client derives from them
+- the call timeout: the observed p99 times TIMEOUT_P99_MULTIPLIER, kept
+  between CMS_MIN_TIMEOUT and CMS_TIMEOUT, and
+- the hedging delay: the observed p95, after which a GET is duplicated to
+  another CMS replica.
+Until a family has LATENCY_MIN_SAMPLES samples, CMS_TIMEOUT applies and no
+request is hedged.
+"""
+import bisect
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+LATENCY_WINDOW = float(os.getenv("LATENCY_WINDOW", 60))
+LATENCY_MIN_SAMPLES = int(os.getenv("LATENCY_MIN_SAMPLES", 50))
+
+# Bucket upper bounds in seconds: 1ms growing by 20% up to about two minutes
+_BOUNDS: List[float] = []
+_bound = 0.001
+while _bound < 120:
+    _BOUNDS.append(_bound)
+    _bound *= 1.2
+
+
+class LatencyHistogram:
+    """Bucketed response times over a rolling window"""
+
+    def __init__(self, window: float = LATENCY_WINDOW, clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self.clock = clock
+        self._current = [0] * (len(_BOUNDS) + 1)
+        self._previous = [0] * (len(_BOUNDS) + 1)
+        self._rotated_at = clock()
+
+    def _rotate(self) -> None:
+        now = self.clock()
+        elapsed = now - self._rotated_at
+        if elapsed < self.window:
+            return
+        # After two idle windows both generations are stale
+        self._previous = self._current if elapsed < 2 * self.window else [0] * len(self._current)
+        self._current = [0] * len(self._current)
+        self._rotated_at = now
+
+    def record(self, seconds: float) -> None:
+        self._rotate()
+        self._current[bisect.bisect_left(_BOUNDS, seconds)] += 1
+
+    @property
+    def count(self) -> int:
+        self._rotate()
+        return sum(self._current) + sum(self._previous)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th percentile (0-100), or None without samples"""
+        self._rotate()
+        counts = [a + b for a, b in zip(self._current, self._previous)]
+        total = sum(counts)
+        if not total:
+            return None
+        rank = max(1, -(-total * q // 100))  # nearest rank
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if seen >= rank:
+                return _BOUNDS[index] if index < len(_BOUNDS) else _BOUNDS[-1]
+        return _BOUNDS[-1]
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+_histograms: Dict[str, LatencyHistogram] = {}
+
+
+def get_histogram(group: str) -> LatencyHistogram:
+    histogram = _histograms.get(group)
+    if histogram is None:
+        histogram = _histograms[group] = LatencyHistogram()
+    return histogram
+
+
+def observed(group: str, q: float) -> Optional[float]:
+    """The group's q-th percentile once it has enough samples, else None"""
+    histogram = get_histogram(group)
+    if histogram.count < LATENCY_MIN_SAMPLES:
+        return None
+    return histogram.percentile(q)
+
+
+def snapshot() -> dict:
+    return {group: histogram.snapshot() for group, histogram in sorted(_histograms.items())}
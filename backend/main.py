@@ -1,17 +1,26 @@
 from fastapi import FastAPI, Request, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, RedirectResponse
+import asyncio
 import os
 from fastapi import APIRouter
 import logging
 from fastapi_socketio import SocketManager
-from typing import Dict, Any
 import sentry_sdk
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 from sentry_sdk.integrations.starlette import StarletteIntegration
 
-from routers import articles, conditions, symptoms, drugs, news  # Make sure to import news router
+from routers import articles, batch, conditions, consultations, symptoms, drugs, events, news  # Make sure to import news router
 from models import ErrorResponse
+from cache import search_cache, stale_responses
+from cms_client import balancer, close_client, normalize_locale
+import database
+import latency
+import metrics
+import realtime
+import resilience
+from sampling import sampler
+from serialization import DefaultJSONResponse
 
 router = APIRouter()
 
@@ -26,8 +35,10 @@ sentry_sdk.init(
         StarletteIntegration(transaction_style="endpoint"),
         FastApiIntegration(),
     ],
-    traces_sample_rate=1.0,
-    profiles_sample_rate=1.0,
+    # Per-route, adjustable at runtime (see sampling)
+    traces_sampler=sampler.traces_sampler,
+    profiles_sampler=sampler.profiles_sampler,
+    before_send_transaction=sampler.before_send_transaction,
 )
 
 # Configure logging
@@ -42,6 +53,7 @@ app = FastAPI(
     title="HealthInfo API",
     description="API for the HealthInfo medical information website",
     version="1.0.0",
+    default_response_class=DefaultJSONResponse,
 )
 
 # Add CORS middleware
@@ -55,12 +67,56 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Configure Socket.IO
-socket_manager = SocketManager(app=app, cors_allowed_origins="*")
+app.add_middleware(metrics.MetricsMiddleware)
+
+# Values kept elsewhere, read when /metrics is scraped
+metrics.registry.register(metrics.Counter(
+    "gateway_cache_hits_total", "Cache lookups that found an entry", ("cache",),
+    collect=lambda: {("search",): search_cache.hits, ("stale",): stale_responses.hits},
+))
+metrics.registry.register(metrics.Counter(
+    "gateway_cache_misses_total", "Cache lookups that found nothing", ("cache",),
+    collect=lambda: {("search",): search_cache.misses, ("stale",): stale_responses.misses},
+))
+metrics.registry.register(metrics.Gauge(
+    "gateway_circuit_open", "1 while the endpoint's circuit is open or half-open", ("endpoint",),
+    collect=lambda: {
+        (group,): int(state["state"] != resilience.CircuitBreaker.CLOSED)
+        for group, state in resilience.snapshot().items()
+    },
+))
+metrics.registry.register(metrics.Gauge(
+    "gateway_cms_replica_outstanding", "CMS calls in progress per replica", ("replica",),
+    collect=lambda: {(url,): state["outstanding"] for url, state in balancer.snapshot().items()},
+))
+metrics.registry.register(metrics.Gauge(
+    "gateway_db_pool_connections", "Database connections in this worker's pool", ("state",),
+    collect=lambda: {(state,): count for state, count in database.pool_status().items()},
+))
+
+# Configure Socket.IO: topic rooms, batched delivery, shared across workers (see realtime)
+socket_manager = SocketManager(
+    app=app,
+    # Mounted apps see the full path, so the Engine.IO path includes the /ws mount
+    socketio_path="ws/socket.io",
+    cors_allowed_origins=allowed_origins,
+    client_manager=realtime.client_manager(),
+)
+hub = realtime.Hub(app.sio)
+app.state.hub = hub
 
-@socket_manager.on('message')
-async def handle_message(sid: str, message: Dict[str, Any]):
-    await socket_manager.emit('message', message)
+metrics.registry.register(metrics.Gauge(
+    "gateway_socketio_clients", "Socket.IO connections to this worker",
+    collect=lambda: {(): hub.clients},
+))
+metrics.registry.register(metrics.Counter(
+    "gateway_socketio_messages_total", "Messages published to Socket.IO topics by this worker",
+    collect=lambda: {(): hub.published},
+))
+metrics.registry.register(metrics.Counter(
+    "gateway_socketio_batches_total", "Batched Socket.IO emits sent by this worker",
+    collect=lambda: {(): hub.batches},
+))
 
 
 
@@ -70,6 +126,22 @@ app.include_router(news.router, prefix="/api", tags=["News"])  # Make sure news
 app.include_router(conditions.router, prefix="/api", tags=["Conditions"])
 app.include_router(symptoms.router, prefix="/api", tags=["Symptoms"])
 app.include_router(drugs.router, prefix="/api", tags=["Drugs"])
+app.include_router(batch.router, prefix="/api", tags=["Batch"])
+app.include_router(consultations.router, prefix="/api", tags=["Consultations"])
+app.include_router(events.router, tags=["Events"])
+
+@app.on_event("startup")
+async def start_event_loop_lag_probe():
+    app.state.lag_probe = asyncio.create_task(metrics.watch_event_loop_lag())
+    app.state.socket_batches = asyncio.create_task(hub.run())
+
+
+@app.on_event("shutdown")
+async def shutdown_cms_client():
+    app.state.lag_probe.cancel()
+    app.state.socket_batches.cancel()
+    await close_client()
+    await database.close_engine()
 
 # Exception handler for unhandled errors
 @app.exception_handler(Exception)
@@ -88,10 +160,22 @@ async def health_check():
     """
     Health check endpoint for the API
     """
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "circuits": resilience.snapshot(),
+        "latency": latency.snapshot(),
+        "replicas": balancer.snapshot(),
+    }
+
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+async def metrics_endpoint():
+    """
+    Operational metrics in the Prometheus text exposition format
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 @app.get("/api/search", tags=["Search"])
-async def search(q: str = ""):
+async def search(q: str = "", lang: str = "en"):
     """
     Search articles, conditions, and drugs
     """
@@ -102,18 +186,27 @@ async def search(q: str = ""):
             "drugs": [],
             "news": []  # Add news to search results
         }
+
+    lang = normalize_locale(lang)
+    cached = search_cache.get(lang, q)
+    if cached is not None:
+        return cached
     
     # Call individual search endpoints
-    articles_results = await articles.search_articles(q)
-    conditions_results = await conditions.search_conditions(q)
-    news_results = await news.search_news(q)  # Add news search
+    articles_results, articles_complete = await articles.search_articles(q, lang)
+    conditions_results, conditions_complete = await conditions.search_conditions(q, lang)
+    news_results, news_complete = await news.search_news(q, lang)  # Add news search
     
-    return {
+    results = {
         "articles": articles_results,
         "conditions": conditions_results,
         "drugs": [],  # Keep as empty array until implemented
         "news": news_results
     }
+    # Don't keep mock or empty stand-ins around once the CMS recovers
+    if articles_complete and conditions_complete and news_complete:
+        search_cache.set(lang, q, results)
+    return results
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,219 @@
+"""
+In-process metrics for the gateway, served at /metrics in the Prometheus
+text exposition format.
+
+Metrics are plain dicts of label values to numbers, updated inline on the
+request path - an increment or a bucket lookup, no locks, since the gateway
+runs on a single event loop. Values that other modules already keep (cache
+hit counters, breaker state, replica load) are read only when /metrics is
+scraped.
+
+    gateway_http_requests_total              route, method, status
+    gateway_http_request_duration_seconds    route, method
+    gateway_http_requests_in_flight
+    gateway_cms_request_duration_seconds     endpoint
+    gateway_cms_responses_total              endpoint, status
+    gateway_cache_hits_total                 cache
+    gateway_cache_misses_total               cache
+    gateway_mock_fallbacks_total             route, reason
+    gateway_circuit_open                     endpoint (1 while open or half-open)
+    gateway_cms_replica_outstanding          replica
+    gateway_event_loop_lag_seconds
+"""
+import asyncio
+import bisect
+import logging
+import os
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EVENT_LOOP_LAG_INTERVAL = float(os.getenv("EVENT_LOOP_LAG_INTERVAL", 0.5))
+
+# Seconds; covers cache hits through requests that hit CMS_TIMEOUT
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _series(name: str, labelnames: Iterable[str], labels: Tuple, extra: str = "") -> str:
+    pairs = [f'{key}="{_escape(value)}"' for key, value in zip(labelnames, labels)]
+    if extra:
+        pairs.append(extra)
+    return f"{name}{{{','.join(pairs)}}}" if pairs else name
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _label_order(item):
+    return tuple(str(value) for value in item[0])
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), collect: Optional[Callable] = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.collect = collect  # returns {labels tuple: value} at scrape time
+        self._values: Dict[Tuple, float] = {}
+
+    def samples(self) -> Dict[Tuple, float]:
+        return self.collect() if self.collect is not None else self._values
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in sorted(self.samples().items(), key=_label_order):
+            lines.append(f"{_series(self.name, self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, *labels) -> None:
+        self._values[labels] = value
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple, list] = {}  # labels -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value: float, *labels) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for labels, series in sorted(self._series.items(), key=_label_order):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{_series(self.name + '_bucket', self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{_series(self.name + '_sum', self.labelnames, labels)} {_number(series[-1])}")
+            lines.append(f"{_series(self.name + '_count', self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception as exc:
+                logger.error(f"Could not collect metric {metric.name}: {exc}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "gateway_http_requests_total", "Requests handled by the gateway", ("route", "method", "status"),
+))
+http_duration = registry.register(Histogram(
+    "gateway_http_request_duration_seconds", "Time to handle a request", ("route", "method"),
+))
+http_in_flight = registry.register(Gauge(
+    "gateway_http_requests_in_flight", "Requests being handled right now",
+))
+cms_duration = registry.register(Histogram(
+    "gateway_cms_request_duration_seconds", "Time for a CMS call to complete", ("endpoint",),
+))
+cms_responses = registry.register(Counter(
+    "gateway_cms_responses_total", "CMS call outcomes by HTTP status, 'error' or 'rejected'", ("endpoint", "status"),
+))
+mock_fallbacks = registry.register(Counter(
+    "gateway_mock_fallbacks_total", "Responses built from mock data instead of the CMS", ("route", "reason"),
+))
+event_loop_lag = registry.register(Gauge(
+    "gateway_event_loop_lag_seconds", "How late the last event loop lag probe woke up",
+))
+
+
+def mock_fallback(route: str, reason: str = "unavailable") -> None:
+    """Count a response served from mock data; reason is 'unavailable' or 'error'"""
+    mock_fallbacks.inc(route, reason)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request by its route template, so
+    /api/conditions/{slug} is one series however many slugs there are.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_in_flight.dec()
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            http_duration.observe(time.perf_counter() - started, path, method)
+            http_requests.inc(path, method, status[0])
+
+
+async def watch_event_loop_lag(interval: float = EVENT_LOOP_LAG_INTERVAL) -> None:
+    """Sleep for `interval` in a loop and record how late each wake-up is"""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        event_loop_lag.set(max(0.0, loop.time() - expected))
+
+
+def render() -> str:
+    return registry.render()
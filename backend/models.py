@@ -1,6 +1,6 @@
 from enum import Enum
 from pydantic import BaseModel, Field, HttpUrl
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 class Gender(str, Enum):
@@ -113,6 +113,44 @@ class SymptomResponse(BaseModel):
     conditions: List[PossibleCondition]
     disclaimer: str = "This assessment is for informational purposes only and does not constitute medical advice. Please consult with a healthcare professional for proper diagnosis and treatment."
 
+# Batch lookup models
+class BatchItem(BaseModel):
+    type: str = Field(..., description="article, news, condition, drug or remedy")
+    slug: str
+    lang: str = "en"
+    fields: Optional[List[str]] = None
+
+class BatchRequest(BaseModel):
+    items: List[BatchItem] = Field(..., max_length=100)
+
+class BatchMissing(BaseModel):
+    type: str
+    slug: str
+
+class BatchResponse(BaseModel):
+    results: Dict[str, Dict[str, Dict[str, Any]]]
+    missing: List[BatchMissing]
+
 class WellBeingResponse(BaseModel):
     featured: List[ArticlePreview]
-    articles: List[ArticlePreview]
\ No newline at end of file
+    articles: List[ArticlePreview]
+
+# Video consultation models
+class ConsultationRequest(BaseModel):
+    name: str = Field(..., min_length=1, max_length=200)
+    email: str = Field(..., max_length=254, pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+    date: datetime
+    time: str = Field(..., min_length=1, max_length=20)
+    reason: str = Field(..., min_length=1, max_length=5000)
+
+class Consultation(ConsultationRequest):
+    id: int
+    payment_status: str
+    consultation_link: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+class ViewCount(BaseModel):
+    slug: str
+    view_count: int
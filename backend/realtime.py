@@ -0,0 +1,194 @@
+"""
+Socket.IO rooms for live updates.
+
+Clients subscribe to topics and only receive messages for those topics:
+
+    emit("subscribe", {"topic": "article:<slug>"})       # also category:<slug>,
+    emit("unsubscribe", {"topic": "article:<slug>"})     # latest:news, latest:articles
+    emit("message", {"topic": "article:<slug>", "data": {...}})
+
+Any client may join any topic, so topics carry public content only; nothing
+tied to a person (such as a consultation) belongs here.
+
+Each topic is a Socket.IO room, so a message costs one send per subscriber
+of its topic rather than one per connected client. Messages are not emitted
+one by one: they collect per topic for up to SOCKETIO_BATCH_INTERVAL_MS (or
+SOCKETIO_BATCH_SIZE messages) and go out as a single event,
+
+    on("messages", {"topic": "article:<slug>", "messages": [...]})
+
+which also means one message-queue publish per topic and interval when
+several gateway workers share rooms. The CMS's publish events arrive the
+same way (see routers.events): clients in latest:news get each new or
+updated news card, and an "unpublished" delta when one is withdrawn.
+
+Workers share rooms through the pub/sub manager named by
+SOCKETIO_MESSAGE_QUEUE:
+
+    (unset)            this process only
+    redis://host:6379  Redis pub/sub (needs the redis package)
+    amqp://host        RabbitMQ (needs aio_pika)
+    memory://          in-process bus shared by every server in the process,
+                       a stand-in for Redis in tests
+"""
+import asyncio
+import logging
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional, Set
+
+import socketio
+from socketio.async_pubsub_manager import AsyncPubSubManager
+
+from serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+SOCKETIO_MESSAGE_QUEUE = os.getenv("SOCKETIO_MESSAGE_QUEUE", "")
+SOCKETIO_CHANNEL = os.getenv("SOCKETIO_CHANNEL", "healthinfo-socketio")
+SOCKETIO_BATCH_INTERVAL_MS = float(os.getenv("SOCKETIO_BATCH_INTERVAL_MS", 50))
+SOCKETIO_BATCH_SIZE = int(os.getenv("SOCKETIO_BATCH_SIZE", 100))
+SOCKETIO_MAX_TOPICS_PER_CLIENT = int(os.getenv("SOCKETIO_MAX_TOPICS_PER_CLIENT", 50))
+SOCKETIO_MAX_MESSAGE_BYTES = int(os.getenv("SOCKETIO_MAX_MESSAGE_BYTES", 16 * 1024))
+
+# Topics only the gateway publishes to
+READ_ONLY_TOPICS = ("latest:",)
+
+TOPIC_RE = re.compile(r"^(article|category|latest):[^\s:/]{1,200}$")
+
+
+class LocalPubSubManager(AsyncPubSubManager):
+    """Pub/sub over an in-process bus: servers in one process behave like workers sharing Redis"""
+
+    name = "memory"
+    _buses: Dict[str, Set[asyncio.Queue]] = {}
+
+    async def _publish(self, data):
+        for queue in self._buses.get(self.channel, ()):
+            queue.put_nowait(data)
+
+    async def _listen(self):
+        queue: asyncio.Queue = asyncio.Queue()
+        self._buses.setdefault(self.channel, set()).add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._buses[self.channel].discard(queue)
+
+
+def client_manager(url: str = SOCKETIO_MESSAGE_QUEUE) -> Optional[socketio.AsyncManager]:
+    """The Socket.IO client manager for a SOCKETIO_MESSAGE_QUEUE URL; None for the default in-process one"""
+    if not url:
+        return None
+    if url.startswith("memory://"):
+        return LocalPubSubManager(channel=SOCKETIO_CHANNEL)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return socketio.AsyncRedisManager(url, channel=SOCKETIO_CHANNEL)
+    if url.startswith(("amqp://", "amqps://")):
+        return socketio.AsyncAioPikaManager(url, channel=SOCKETIO_CHANNEL)
+    raise ValueError(f"Unsupported SOCKETIO_MESSAGE_QUEUE: {url}")
+
+
+class Hub:
+    """Topic subscriptions and batched delivery for one Socket.IO server"""
+
+    def __init__(self, sio: socketio.AsyncServer,
+                 interval_ms: float = SOCKETIO_BATCH_INTERVAL_MS, batch_size: int = SOCKETIO_BATCH_SIZE):
+        self.sio = sio
+        self.interval = interval_ms / 1000
+        self.batch_size = batch_size
+        self.pending: Dict[str, List[Any]] = {}
+        # sid -> topics; sio.rooms() scans every room, which is one per client
+        self.subscriptions: Dict[str, Set[str]] = {}
+        self.published = 0
+        self.batches = 0
+        self._full = asyncio.Event()
+
+        sio.on("connect", self.connect)
+        sio.on("disconnect", self.disconnect)
+        sio.on("subscribe", self.subscribe)
+        sio.on("unsubscribe", self.unsubscribe)
+        sio.on("message", self.message)
+
+    @property
+    def clients(self) -> int:
+        return len(self.subscriptions)
+
+    async def connect(self, sid, environ, auth=None):
+        self.subscriptions[sid] = set()
+
+    async def disconnect(self, sid, *args):
+        self.subscriptions.pop(sid, None)
+
+    async def subscribe(self, sid, data):
+        topic = _topic(data)
+        if topic is None:
+            return {"ok": False, "error": "invalid topic"}
+        topics = self.subscriptions.setdefault(sid, set())
+        if topic not in topics and len(topics) >= SOCKETIO_MAX_TOPICS_PER_CLIENT:
+            return {"ok": False, "error": f"at most {SOCKETIO_MAX_TOPICS_PER_CLIENT} topics per connection"}
+        await self.sio.enter_room(sid, topic)
+        topics.add(topic)
+        return {"ok": True}
+
+    async def unsubscribe(self, sid, data):
+        topic = _topic(data)
+        if topic is None:
+            return {"ok": False, "error": "invalid topic"}
+        await self.sio.leave_room(sid, topic)
+        self.subscriptions.get(sid, set()).discard(topic)
+        return {"ok": True}
+
+    async def message(self, sid, data):
+        """Relay a client's message to its topic's subscribers; the sender must be subscribed"""
+        topic = _topic(data)
+        if topic is None or topic not in self.subscriptions.get(sid, ()):
+            return {"ok": False, "error": "subscribe to the topic first"}
+        if topic.startswith(READ_ONLY_TOPICS):
+            return {"ok": False, "error": "read-only topic"}
+        if len(dumps(data)) > SOCKETIO_MAX_MESSAGE_BYTES:
+            return {"ok": False, "error": "message too large"}
+        self.publish(topic, data.get("data"), source="client")
+        return {"ok": True}
+
+    def publish(self, topic: str, message: Any, source: str = "server"):
+        """
+        Queue a message for a topic's subscribers on every worker; sent with
+        the next batch. `source` tells clients whether another client sent it.
+        """
+        batch = self.pending.setdefault(topic, [])
+        batch.append({"data": message, "source": source, "ts": time.time()})
+        self.published += 1
+        if len(batch) >= self.batch_size:
+            self._full.set()
+
+    async def flush(self):
+        pending, self.pending = self.pending, {}
+        for topic, messages in pending.items():
+            await self.sio.emit("messages", {"topic": topic, "messages": messages}, room=topic)
+        self.batches += len(pending)
+
+    async def run(self):
+        """Send batches every interval, or as soon as one is full, until cancelled"""
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._full.clear()
+                try:
+                    await self.flush()
+                except Exception:
+                    logger.exception("Sending Socket.IO batches failed")
+        finally:
+            await self.flush()
+
+
+def _topic(data) -> Optional[str]:
+    topic = data.get("topic") if isinstance(data, dict) else None
+    if isinstance(topic, str) and TOPIC_RE.match(topic):
+        return topic
+    return None
@@ -0,0 +1,258 @@
+"""
+Circuit breakers and bulkheads for calls to the CMS.
+
+Calls are grouped by endpoint family, the first segment of the CMS path
+(conditions, articles, pages, ...). Each group gets
+
+- a circuit breaker. It opens when at least CIRCUIT_ERROR_RATE of the calls
+  in the last CIRCUIT_WINDOW seconds failed (once there were
+  CIRCUIT_MIN_CALLS of them), rejects calls for CIRCUIT_OPEN_SECONDS, then
+  lets CIRCUIT_HALF_OPEN_CALLS probe calls through. A successful probe
+  closes it again, a failed one reopens it.
+- a bulkhead: a semaphore limiting the group's concurrent calls, so one
+  stalled family cannot hold every pooled connection. A call that cannot
+  get a slot within BULKHEAD_WAIT seconds is rejected.
+
+Connection errors, timeouts and 5xx responses count as failures; 4xx
+responses mean the CMS is answering and count as successes. Rejected calls
+raise CircuitOpen or BulkheadFull, which cms_client turns into a stale
+response or a fast 503.
+"""
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_ERROR_RATE = float(os.getenv("CIRCUIT_ERROR_RATE", 0.5))
+CIRCUIT_MIN_CALLS = int(os.getenv("CIRCUIT_MIN_CALLS", 10))
+CIRCUIT_WINDOW = float(os.getenv("CIRCUIT_WINDOW", 30))
+CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", 15))
+CIRCUIT_HALF_OPEN_CALLS = int(os.getenv("CIRCUIT_HALF_OPEN_CALLS", 1))
+
+BULKHEAD_LIMIT = int(os.getenv("BULKHEAD_LIMIT", 20))
+BULKHEAD_WAIT = float(os.getenv("BULKHEAD_WAIT", 0.5))
+# Per-group overrides, e.g. "pages=10,search=30"
+BULKHEAD_LIMITS = {
+    name.strip(): int(limit)
+    for name, _, limit in (
+        item.partition("=") for item in os.getenv("BULKHEAD_LIMITS", "").split(",") if "=" in item
+    )
+}
+
+# Path prefixes that say nothing about the endpoint family
+_GROUP_PREFIXES = ("api", "v2")
+
+
+class Rejected(Exception):
+    """A call was refused before reaching the CMS"""
+
+    def __init__(self, group: str, retry_after: Optional[float] = None):
+        super().__init__(group)
+        self.group = group
+        self.retry_after = retry_after
+
+
+class CircuitOpen(Rejected):
+    pass
+
+
+class BulkheadFull(Rejected):
+    pass
+
+
+def route_group(endpoint: str) -> str:
+    """'conditions/asthma' -> 'conditions'; 'v2/pages/?type=...' -> 'pages'"""
+    segments = [part for part in endpoint.split("?", 1)[0].split("/") if part]
+    while len(segments) > 1 and segments[0] in _GROUP_PREFIXES:
+        segments.pop(0)
+    return segments[0] if segments else ""
+
+
+def is_failure(exc: BaseException) -> bool:
+    """Whether an exception from the HTTP call says the CMS is unhealthy"""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, httpx.RequestError)
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open breaker over a rolling, per-second bucketed
+    window of call outcomes.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        error_rate: float = CIRCUIT_ERROR_RATE,
+        min_calls: int = CIRCUIT_MIN_CALLS,
+        window: float = CIRCUIT_WINDOW,
+        open_seconds: float = CIRCUIT_OPEN_SECONDS,
+        half_open_calls: int = CIRCUIT_HALF_OPEN_CALLS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.error_rate = error_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.clock = clock
+        self._buckets: deque = deque()  # [second, calls, failures]
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self.clock() - self._opened_at >= self.open_seconds:
+            self._state = self.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def retry_after(self) -> float:
+        return max(0.0, self.open_seconds - (self.clock() - self._opened_at))
+
+    def _counts(self):
+        cutoff = int(self.clock() - self.window)
+        while self._buckets and self._buckets[0][0] <= cutoff:
+            self._buckets.popleft()
+        calls = sum(bucket[1] for bucket in self._buckets)
+        failures = sum(bucket[2] for bucket in self._buckets)
+        return calls, failures
+
+    def _add(self, failed: bool) -> None:
+        second = int(self.clock())
+        if not self._buckets or self._buckets[-1][0] != second:
+            self._buckets.append([second, 0, 0])
+        self._buckets[-1][1] += 1
+        self._buckets[-1][2] += int(failed)
+
+    def _open(self) -> None:
+        if self._state != self.OPEN:
+            logger.warning(f"Circuit for CMS {self.name} opened")
+        self._state = self.OPEN
+        self._opened_at = self.clock()
+        self._buckets.clear()
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and self._probes < self.half_open_calls:
+            self._probes += 1
+            return True
+        return False
+
+    def release(self) -> None:
+        """Give back a probe slot for a call that ended without an outcome"""
+        if self._state == self.HALF_OPEN and self._probes:
+            self._probes -= 1
+
+    def record_success(self) -> None:
+        # Calls that started before the circuit opened do not count
+        if self._state == self.OPEN:
+            return
+        if self._state == self.HALF_OPEN:
+            logger.info(f"Circuit for CMS {self.name} closed")
+            self._state = self.CLOSED
+            self._buckets.clear()
+        self._add(False)
+
+    def record_failure(self) -> None:
+        if self._state == self.OPEN:
+            return
+        if self._state == self.HALF_OPEN:
+            self._open()
+            return
+        self._add(True)
+        calls, failures = self._counts()
+        if calls >= self.min_calls and failures / calls >= self.error_rate:
+            self._open()
+
+    def snapshot(self) -> dict:
+        calls, failures = self._counts()
+        return {"state": self.state, "calls": calls, "failures": failures}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_bulkheads: Dict[str, asyncio.Semaphore] = {}
+_bulkheads_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_breaker(group: str) -> CircuitBreaker:
+    breaker = _breakers.get(group)
+    if breaker is None:
+        breaker = _breakers[group] = CircuitBreaker(group)
+    return breaker
+
+
+def get_bulkhead(group: str) -> asyncio.Semaphore:
+    """Return the group's semaphore, creating the set anew in each event loop"""
+    global _bulkheads_loop
+    loop = asyncio.get_running_loop()
+    if _bulkheads_loop is not loop:
+        _bulkheads.clear()
+        _bulkheads_loop = loop
+    bulkhead = _bulkheads.get(group)
+    if bulkhead is None:
+        bulkhead = _bulkheads[group] = asyncio.Semaphore(BULKHEAD_LIMITS.get(group, BULKHEAD_LIMIT))
+    return bulkhead
+
+
+@asynccontextmanager
+async def guard(group: str):
+    """
+    Run one CMS call under the group's breaker and bulkhead.
+
+    Raises CircuitOpen or BulkheadFull instead of entering the block when
+    the call should not be made.
+    """
+    breaker = get_breaker(group)
+    if not breaker.allow():
+        raise CircuitOpen(group, breaker.retry_after())
+
+    bulkhead = get_bulkhead(group)
+    try:
+        # Unlike wait_for, a timeout here cancels acquire() itself, which hands
+        # back a permit it was granted at the same moment instead of leaking it
+        async with asyncio.timeout(BULKHEAD_WAIT):
+            await bulkhead.acquire()
+    except TimeoutError:
+        breaker.release()
+        raise BulkheadFull(group)
+    except BaseException:
+        # The request was cancelled while waiting for a slot
+        breaker.release()
+        raise
+
+    try:
+        yield
+    except BaseException as exc:
+        if is_failure(exc):
+            breaker.record_failure()
+        elif isinstance(exc, httpx.HTTPStatusError):
+            breaker.record_success()
+        else:
+            breaker.release()
+        raise
+    else:
+        breaker.record_success()
+    finally:
+        bulkhead.release()
+
+
+def snapshot() -> dict:
+    """Breaker state per group, for the health endpoint"""
+    return {group: breaker.snapshot() for group, breaker in sorted(_breakers.items())}
@@ -1,43 +1,20 @@
-from fastapi import APIRouter, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from sqlalchemy import func, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-import httpx
 import os
 import logging
 from datetime import datetime
 
-from models import ArticlePreview, Article, ErrorResponse
+from database import get_db
+import db_models
+from models import ArticlePreview, Article, ErrorResponse, ViewCount
+from cms_client import fetch_from_cms, passthrough, validated_passthrough
+from metrics import mock_fallback
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Set the CMS API URL from environment variable with a fallback
-CMS_API_URL = os.getenv("CMS_API_URL", "http://localhost:8001/api")
-
-# Utility function to make requests to the CMS API
-async def fetch_from_cms(endpoint: str, params=None):
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{CMS_API_URL}/{endpoint}", params=params, timeout=10.0)
-            response.raise_for_status()
-            return response.json()
-        except httpx.RequestError as exc:
-            logger.error(f"Error fetching {endpoint}: {exc}")
-            raise HTTPException(
-                status_code=503,
-                detail=f"Service unavailable: Unable to connect to CMS API."
-            )
-        except httpx.HTTPStatusError as exc:
-            logger.error(f"Error response {exc.response.status_code} from CMS: {exc}")
-            status_code = exc.response.status_code
-            try:
-                detail = exc.response.json()
-            except:
-                detail = str(exc)
-            raise HTTPException(status_code=status_code, detail=detail)
-        except Exception as exc:
-            logger.error(f"Unexpected error fetching {endpoint}: {exc}")
-            raise HTTPException(status_code=500, detail=str(exc))
-
 # Mock data for development (will be replaced with actual CMS API calls)
 mock_articles = [
     ArticlePreview(
@@ -91,36 +68,40 @@ async def get_top_stories():
         if exc.status_code == 503:
             # If CMS is unavailable, use mock data for now
             logger.warning("CMS unavailable, returning mock top stories")
+            mock_fallback("get_top_stories", "unavailable")
             return mock_articles
         raise
     except Exception as exc:
         # For development, return mock data
         if os.getenv("ENV", "development") == "development":
             logger.info("Using mock data for top stories")
+            mock_fallback("get_top_stories", "error")
             return mock_articles
 
         logger.error(f"Error fetching top stories: {exc}")
         return []
 
 @router.get("/articles/health-topics", response_model=List[ArticlePreview])
-async def get_health_topics():
+async def get_health_topics(lang: str = Query("en", description="Content language, e.g. en or hi")):
     """
     Retrieve articles categorized as health topics
     """
     try:
         # Try to fetch from CMS API
-        articles = await fetch_from_cms("articles/health-topics")
+        articles = await fetch_from_cms("articles/health-topics", lang=lang)
         return articles
     except HTTPException as exc:
         if exc.status_code == 503:
             # If CMS is unavailable, use mock data for now
             logger.warning("CMS unavailable, returning mock health topics")
+            mock_fallback("get_health_topics", "unavailable")
             return mock_articles[:2]
         raise
     except Exception as exc:
         # For development, return mock data
         if os.getenv("ENV", "development") == "development":
             logger.info("Using mock data for health topics")
+            mock_fallback("get_health_topics", "error")
             return mock_articles[:2]
 
         logger.error(f"Error fetching health topics: {exc}")
@@ -133,38 +114,43 @@ async def get_article_paths():
     """
     try:
         # Try to fetch from CMS API
-        paths = await fetch_from_cms("articles/paths")
-        return paths
+        # Slugs need no transformation, so skip decoding and re-encoding
+        return await passthrough("articles/paths")
     except HTTPException as exc:
         if exc.status_code == 503:
             # If CMS is unavailable, log warning and return a few paths
             logger.warning("CMS unavailable, returning limited article paths")
+            mock_fallback("get_article_paths", "unavailable")
             return ["reduce-bloating", "health-benefits-pistachios", "alcohol-affects-skin"]
         raise
     except Exception as exc:
         # For development, return mock paths
         if os.getenv("ENV", "development") == "development":
             logger.info("Using mock data for article paths")
+            mock_fallback("get_article_paths", "error")
             return [article.slug for article in mock_articles]
 
         logger.error(f"Error fetching article paths: {exc}")
         return []
 
 @router.get("/articles/{slug}", response_model=Article)
-async def get_article(slug: str = Path(..., description="The slug of the article to retrieve")):
+async def get_article(
+    slug: str = Path(..., description="The slug of the article to retrieve"),
+    lang: str = Query("en", description="Content language, e.g. en or hi"),
+):
     """
     Get a single article by its slug
     """
     try:
         # Try to fetch from CMS API
-        article = await fetch_from_cms(f"articles/{slug}")
-        return article
+        return await validated_passthrough(f"articles/{slug}", Article, lang=lang, affinity=slug)
     except HTTPException as exc:
         if exc.status_code == 404:
             raise HTTPException(status_code=404, detail=f"Article with slug '{slug}' not found")
         elif exc.status_code == 503:
             # If CMS is unavailable, check if we have this article in our mock data
             logger.warning(f"CMS unavailable, trying to serve mock article {slug}")
+            mock_fallback("get_article", "unavailable")
             for article in mock_articles:
                 if article.slug == slug:
                     # Convert to a full Article with content
@@ -193,6 +179,7 @@ async def get_article(slug: str = Path(..., description="The slug of the article
         # For development, return mock data
         if os.getenv("ENV", "development") == "development":
             logger.info(f"Using mock data for article {slug}")
+            mock_fallback("get_article", "error")
             for article in mock_articles:
                 if article.slug == slug:
                     # Convert to a full Article with content
@@ -220,13 +207,16 @@ async def get_article(slug: str = Path(..., description="The slug of the article
         raise HTTPException(status_code=500, detail=f"Failed to retrieve article: {str(exc)}")
 
 @router.get("/articles/{slug}/related", response_model=List[ArticlePreview])
-async def get_related_articles(slug: str = Path(..., description="The slug of the article")):
+async def get_related_articles(
+    slug: str = Path(..., description="The slug of the article"),
+    lang: str = Query("en", description="Content language, e.g. en or hi"),
+):
     """
     Get articles related to the specified article
     """
     try:
         # Try to fetch from CMS API
-        articles = await fetch_from_cms(f"articles/{slug}/related")
+        articles = await fetch_from_cms(f"articles/{slug}/related", lang=lang, affinity=slug)
         return articles
     except HTTPException as exc:
         if exc.status_code == 404:
@@ -235,6 +225,7 @@ async def get_related_articles(slug: str = Path(..., description="The slug of th
         if exc.status_code == 503:
             # If CMS is unavailable, use mock data
             logger.warning("CMS unavailable, returning mock related articles")
+            mock_fallback("get_related_articles", "unavailable")
             # Exclude the current article
             return [article for article in mock_articles if article.slug != slug][:3]
         raise
@@ -242,12 +233,32 @@ async def get_related_articles(slug: str = Path(..., description="The slug of th
         # For development, return mock data
         if os.getenv("ENV", "development") == "development":
             logger.info(f"Using mock data for related articles to {slug}")
+            mock_fallback("get_related_articles", "error")
             # Exclude the current article
             return [article for article in mock_articles if article.slug != slug][:3]
 
         logger.error(f"Error fetching related articles for {slug}: {exc}")
         return []
 
+@router.post("/articles/{slug}/views", response_model=ViewCount)
+async def count_article_view(
+    slug: str = Path(..., description="The slug of the article"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Count a view of an article; one atomic UPDATE, so concurrent views are never lost
+    """
+    view_count = await db.scalar(
+        update(db_models.Article)
+        .where(db_models.Article.slug == slug)
+        .values(view_count=func.coalesce(db_models.Article.view_count, 0) + 1)
+        .returning(db_models.Article.view_count)
+    )
+    if view_count is None:
+        raise HTTPException(status_code=404, detail=f"Article with slug '{slug}' not found")
+    await db.commit()
+    return ViewCount(slug=slug, view_count=view_count)
+
 @router.get("/well-being", response_model=dict)
 async def get_well_being_articles():
     """
@@ -255,12 +266,12 @@ async def get_well_being_articles():
     """
     try:
         # Try to fetch from CMS API
-        data = await fetch_from_cms("well-being")
-        return data
+        return await passthrough("well-being")
     except HTTPException as exc:
         if exc.status_code == 503:
             # If CMS is unavailable, use mock data for now
             logger.warning("CMS unavailable, returning mock well-being data")
+            mock_fallback("get_well_being_articles", "unavailable")
             return {
                 "featured": mock_articles[:3],
                 "articles": mock_articles
@@ -270,6 +281,7 @@ async def get_well_being_articles():
         # For development, return mock data
         if os.getenv("ENV", "development") == "development":
             logger.info("Using mock data for well-being section")
+            mock_fallback("get_well_being_articles", "error")
             return {
                 "featured": mock_articles[:3],
                 "articles": mock_articles
@@ -278,33 +290,36 @@ async def get_well_being_articles():
         logger.error(f"Error fetching well-being articles: {exc}")
         return {"featured": [], "articles": []}
 
-async def search_articles(query: str):
+async def search_articles(query: str, lang: Optional[str] = None):
     """
-    Search articles by query string
+    Search articles by query string. Returns (results, complete); complete is False when
+    mock or empty results stand in for a failed CMS call
     """
     try:
         # Try to fetch from CMS API
-        articles = await fetch_from_cms("articles/search", {"q": query})
-        return articles
+        articles = await fetch_from_cms("articles/search", {"q": query}, lang)
+        return articles, True
     except HTTPException as exc:
         if exc.status_code == 503:
             # If CMS is unavailable, use mock search results
             logger.warning("CMS unavailable, returning mock search results")
+            mock_fallback("search_articles", "unavailable")
             return [
                 article for article in mock_articles 
                 if query.lower() in article.title.lower() or 
                    (article.summary and query.lower() in article.summary.lower())
-            ]
+            ], False
         raise
     except Exception as exc:
         # For development, return filtered mock data
         if os.getenv("ENV", "development") == "development":
             logger.info(f"Using mock data for article search: {query}")
+            mock_fallback("search_articles", "error")
             return [
                 article for article in mock_articles 
                 if query.lower() in article.title.lower() or 
                    (article.summary and query.lower() in article.summary.lower())
-            ]
+            ], False
 
         logger.error(f"Error searching articles: {exc}")
-        return []
\ No newline at end of file
+        return [], False
\ No newline at end of file
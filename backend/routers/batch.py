@@ -0,0 +1,33 @@
+from fastapi import APIRouter, HTTPException
+import logging
+
+from models import BatchRequest, BatchResponse
+from cms_client import request_raw_from_cms
+from fastapi.responses import Response
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.post("/batch", response_model=BatchResponse)
+async def get_batch(batch: BatchRequest):
+    """
+    Resolve many {type, slug, lang, fields} items in one call.
+
+    Results are grouped by type and keyed by slug; slugs that do not match a
+    live page are listed under `missing`, and a slug requested twice with a
+    different lang or fields is rejected with a 400. The CMS response is
+    forwarded as-is.
+    """
+    try:
+        content = await request_raw_from_cms(
+            "POST", "batch", json={"items": [item.model_dump(exclude_none=True) for item in batch.items]}
+        )
+        return Response(content=content, media_type="application/json")
+    except HTTPException as exc:
+        if exc.status_code == 503:
+            logger.warning("CMS unavailable, returning every batch item as missing")
+            return BatchResponse(
+                results={},
+                missing=[{"type": item.type, "slug": item.slug} for item in batch.items],
+            )
+        raise
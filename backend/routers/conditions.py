@@ -1,43 +1,16 @@
 from fastapi import APIRouter, HTTPException, Query, Path
 from typing import List, Optional
-import httpx
 import os
 import logging
 from datetime import datetime
 
 from models import ConditionPreview, Condition, ErrorResponse
+from cms_client import fetch_from_cms, passthrough, validated_passthrough
+from metrics import mock_fallback
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Set the CMS API URL from environment variable with a fallback
-CMS_API_URL = os.getenv("CMS_API_URL", "http://localhost:8001/api")
-
-# Utility function to make requests to the CMS API
-async def fetch_from_cms(endpoint: str, params=None):
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{CMS_API_URL}/{endpoint}", params=params, timeout=10.0)
-            response.raise_for_status()
-            return response.json()
-        except httpx.RequestError as exc:
-            logger.error(f"Error fetching {endpoint}: {exc}")
-            raise HTTPException(
-                status_code=503,
-                detail=f"Service unavailable: Unable to connect to CMS API."
-            )
-        except httpx.HTTPStatusError as exc:
-            logger.error(f"Error response {exc.response.status_code} from CMS: {exc}")
-            status_code = exc.response.status_code
-            try:
-                detail = exc.response.json()
-            except:
-                detail = str(exc)
-            raise HTTPException(status_code=status_code, detail=detail)
-        except Exception as exc:
-            logger.error(f"Unexpected error fetching {endpoint}: {exc}")
-            raise HTTPException(status_code=500, detail=str(exc))
-
 # Mock data for development (will be replaced with actual CMS API calls)
 mock_conditions = [
     ConditionPreview(
@@ -79,12 +52,14 @@ async def get_conditions_index():
         if exc.status_code == 503:
             # If CMS is unavailable, use mock data
             logger.warning("CMS unavailable, returning mock conditions index")
+            mock_fallback("get_conditions_index", "unavailable")
             return mock_conditions
         raise
     except Exception as exc:
         # For development, return mock data
         if os.getenv("ENV", "development") == "development":
             logger.info("Using mock data for conditions index")
+            mock_fallback("get_conditions_index", "error")
             return mock_conditions
         
         logger.error(f"Error fetching conditions index: {exc}")
@@ -97,38 +72,43 @@ async def get_condition_paths():
     """
     try:
         # Try to fetch from CMS API
-        paths = await fetch_from_cms("conditions/paths")
-        return paths
+        # Slugs need no transformation, so skip decoding and re-encoding
+        return await passthrough("conditions/paths")
     except HTTPException as exc:
         if exc.status_code == 503:
             # If CMS is unavailable, log warning and return a few paths
             logger.warning("CMS unavailable, returning limited condition paths")
+            mock_fallback("get_condition_paths", "unavailable")
             return ["type-2-diabetes", "hypertension", "asthma", "migraine"]
         raise
     except Exception as exc:
         # For development, return mock paths
         if os.getenv("ENV", "development") == "development":
             logger.info("Using mock data for condition paths")
+            mock_fallback("get_condition_paths", "error")
             return [condition.slug for condition in mock_conditions]
         
         logger.error(f"Error fetching condition paths: {exc}")
         return []
 
 @router.get("/conditions/{slug}", response_model=Condition)
-async def get_condition(slug: str = Path(..., description="The slug of the condition to retrieve")):
+async def get_condition(
+    slug: str = Path(..., description="The slug of the condition to retrieve"),
+    lang: str = Query("en", description="Content language, e.g. en or hi"),
+):
     """
     Get a single condition by its slug
     """
     try:
         # Try to fetch from CMS API
-        condition = await fetch_from_cms(f"conditions/{slug}")
-        return condition
+        return await validated_passthrough(f"conditions/{slug}", Condition, lang=lang, affinity=slug)
     except HTTPException as exc:
         if exc.status_code == 404:
             raise HTTPException(status_code=404, detail=f"Condition with slug '{slug}' not found")
         elif exc.status_code == 503:
             # If CMS is unavailable, check for mock data
             logger.warning(f"CMS unavailable, trying to serve mock condition {slug}")
+            mock_fallback("get_condition", "unavailable")
             for condition in mock_conditions:
                 if condition.slug == slug:
                     # Convert to a full Condition with content
@@ -157,6 +137,7 @@ async def get_condition(slug: str = Path(..., description="The slug of the condi
         # For development, return mock data
         if os.getenv("ENV", "development") == "development":
             logger.info(f"Using mock data for condition {slug}")
+            mock_fallback("get_condition", "error")
             for condition in mock_conditions:
                 if condition.slug == slug:
                     # Convert to a full Condition with content
@@ -184,33 +165,36 @@ async def get_condition(slug: str = Path(..., description="The slug of the condi
         logger.error(f"Error fetching condition {slug}: {exc}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve condition: {str(exc)}")
 
-async def search_conditions(query: str):
+async def search_conditions(query: str, lang: Optional[str] = None):
     """
-    Search conditions by query string
+    Search conditions by query string. Returns (results, complete); complete is False when
+    mock or empty results stand in for a failed CMS call
     """
     try:
         # Try to fetch from CMS API
-        conditions = await fetch_from_cms("conditions/search", {"q": query})
-        return conditions
+        conditions = await fetch_from_cms("conditions/search", {"q": query}, lang)
+        return conditions, True
     except HTTPException as exc:
         if exc.status_code == 503:
             # If CMS is unavailable, use mock data
             logger.warning("CMS unavailable, returning mock search results")
+            mock_fallback("search_conditions", "unavailable")
             return [
                 condition for condition in mock_conditions
                 if query.lower() in condition.name.lower() or 
                   (condition.subtitle and query.lower() in condition.subtitle.lower())
-            ]
+            ], False
         raise
     except Exception as exc:
         # For development, return filtered mock data
         if os.getenv("ENV", "development") == "development":
             logger.info(f"Using mock data for condition search: {query}")
+            mock_fallback("search_conditions", "error")
             return [
                 condition for condition in mock_conditions
                 if query.lower() in condition.name.lower() or 
                   (condition.subtitle and query.lower() in condition.subtitle.lower())
-            ]
+            ], False
         
         logger.error(f"Error searching conditions: {exc}")
-        return []
\ No newline at end of file
+        return [], False
\ No newline at end of file
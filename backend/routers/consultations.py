@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+from database import get_db
+from db_models import VideoConsultation
+from models import Consultation, ConsultationRequest
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.post("/consultations", response_model=Consultation, status_code=201)
+async def create_consultation(request: ConsultationRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Book a video consultation; it stays pending until paid
+    """
+    consultation = VideoConsultation(**request.model_dump(), payment_status="pending")
+    db.add(consultation)
+    await db.commit()
+    # created_at is set by the database
+    await db.refresh(consultation)
+    return consultation
+
+
+@router.get("/consultations/{consultation_id}", response_model=Consultation)
+async def get_consultation(consultation_id: int, email: str = Query(..., max_length=254), db: AsyncSession = Depends(get_db)):
+    """
+    Retrieve a booking; the email it was made with is required so ids cannot be enumerated
+    """
+    consultation = await db.scalar(select(VideoConsultation).where(VideoConsultation.id == consultation_id))
+    if consultation is None or consultation.email.lower() != email.lower():
+        raise HTTPException(status_code=404, detail="Consultation not found")
+    return consultation
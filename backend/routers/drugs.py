@@ -1,11 +1,10 @@
 
 from fastapi import APIRouter, HTTPException, Query, Path
 from typing import List, Optional
-import httpx
-import os
 import logging
 from datetime import datetime
 from models import DrugPath
+from cms_client import fetch_from_cms, validated_passthrough
 
 
 from models import DrugPreview, Drug, ErrorResponse
@@ -13,34 +12,6 @@ from models import DrugPreview, Drug, ErrorResponse
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Set the CMS API URL from environment variable with a fallback
-CMS_API_URL = os.getenv("CMS_API_URL", "http://localhost:8001/api")
-
-# Utility function to make requests to the CMS API
-async def fetch_from_cms(endpoint: str, params=None):
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{CMS_API_URL}/{endpoint}", params=params, timeout=10.0)
-            response.raise_for_status()
-            return response.json()
-        except httpx.RequestError as exc:
-            logger.error(f"Error fetching {endpoint}: {exc}")
-            raise HTTPException(
-                status_code=503,
-                detail=f"Service unavailable: Unable to connect to CMS API."
-            )
-        except httpx.HTTPStatusError as exc:
-            logger.error(f"Error response {exc.response.status_code} from CMS: {exc}")
-            status_code = exc.response.status_code
-            try:
-                detail = exc.response.json()
-            except:
-                detail = str(exc)
-            raise HTTPException(status_code=status_code, detail=detail)
-        except Exception as exc:
-            logger.error(f"Unexpected error fetching {endpoint}: {exc}")
-            raise HTTPException(status_code=500, detail=str(exc))
-
 @router.get("/api/drugs/index", response_model=List[DrugPreview])
 async def get_drugs_index():
     """
@@ -110,13 +81,15 @@ async def get_drug_paths():
 
 
 @router.get("/drugs/{slug}", response_model=Drug)
-async def get_drug(slug: str = Path(..., description="The slug of the drug to retrieve")):
+async def get_drug(
+    slug: str = Path(..., description="The slug of the drug to retrieve"),
+    lang: str = Query("en", description="Content language, e.g. en or hi"),
+):
     """
     Get a single drug by its slug
     """
     try:
-        drug = await fetch_from_cms(f"drugs/{slug}")
-        return drug
+        return await validated_passthrough(f"drugs/{slug}", Drug, lang=lang, affinity=slug)
     except HTTPException as exc:
         if exc.status_code == 404:
             raise HTTPException(status_code=404, detail=f"Drug with slug '{slug}' not found")
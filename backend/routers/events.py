@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Header, HTTPException, Request
+from typing import Optional
+import hmac
+import logging
+import os
+
+from cache import search_cache
+from serialization import loads
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Shared with the CMS (LIVE_EVENTS_TOKEN there); without one, only local callers are accepted
+LIVE_EVENTS_TOKEN = os.getenv("LIVE_EVENTS_TOKEN", "")
+LOCAL_HOSTS = ("127.0.0.1", "::1", "localhost")
+
+# Event type -> the listing topic its cards appear in
+LISTING_TOPICS = {"news": "latest:news", "article": "latest:articles"}
+
+
+def topics_for(event: dict) -> list:
+    """Rooms an event is pushed to: its listing, its category and the page itself"""
+    topics = [LISTING_TOPICS[event["type"]]]
+    category = event.get("category")
+    if category and category.get("slug"):
+        topics.append(f"category:{category['slug']}")
+    if event["type"] == "article":
+        topics.append(f"article:{event['slug']}")
+    return topics
+
+
+@router.post("/internal/events", status_code=202, include_in_schema=False)
+async def receive_events(request: Request, x_events_token: Optional[str] = Header(None)):
+    """
+    Publish events from the CMS, pushed to live clients as compact deltas
+    """
+    if LIVE_EVENTS_TOKEN:
+        if not x_events_token or not hmac.compare_digest(x_events_token, LIVE_EVENTS_TOKEN):
+            raise HTTPException(status_code=403, detail="Invalid events token")
+    elif request.client is None or request.client.host not in LOCAL_HOSTS:
+        raise HTTPException(status_code=403, detail="Set LIVE_EVENTS_TOKEN to accept events from other hosts")
+
+    try:
+        events = loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON")
+    if not isinstance(events, list):
+        raise HTTPException(status_code=400, detail="Expected a list of events")
+
+    hub = request.app.state.hub
+    accepted = 0
+    for event in events:
+        if (
+            not isinstance(event, dict)
+            or event.get("type") not in LISTING_TOPICS
+            or not event.get("slug")
+            or not isinstance(event.get("category") or {}, dict)
+        ):
+            logger.warning(f"Ignoring malformed publish event: {event!r:.200}")
+            continue
+        for topic in topics_for(event):
+            hub.publish(topic, event)
+        accepted += 1
+    if accepted:
+        # Cached search results may be missing the published pages
+        search_cache.clear()
+    return {"accepted": accepted}
@@ -1,43 +1,16 @@
 from fastapi import APIRouter, HTTPException, Query, Path
 from typing import List, Optional
-import httpx
 import os
 import logging
 from datetime import datetime
 
 from models import ArticlePreview, Article, ErrorResponse
+from cms_client import fetch_from_cms, passthrough, validated_passthrough
+from metrics import mock_fallback
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Set the CMS API URL from environment variable with a fallback
-CMS_API_URL = os.getenv("CMS_API_URL", "http://localhost:8001/api")
-
-# Utility function to make requests to the CMS API
-async def fetch_from_cms(endpoint: str, params=None):
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{CMS_API_URL}/{endpoint}", params=params, timeout=10.0)
-            response.raise_for_status()
-            return response.json()
-        except httpx.RequestError as exc:
-            logger.error(f"Error fetching {endpoint}: {exc}")
-            raise HTTPException(
-                status_code=503,
-                detail=f"Service unavailable: Unable to connect to CMS API."
-            )
-        except httpx.HTTPStatusError as exc:
-            logger.error(f"Error response {exc.response.status_code} from CMS: {exc}")
-            status_code = exc.response.status_code
-            try:
-                detail = exc.response.json()
-            except:
-                detail = str(exc)
-            raise HTTPException(status_code=status_code, detail=detail)
-        except Exception as exc:
-            logger.error(f"Unexpected error fetching {endpoint}: {exc}")
-            raise HTTPException(status_code=500, detail=str(exc))
-
 # Mock news data for development
 mock_news = [
     ArticlePreview(
@@ -91,12 +64,14 @@ async def get_latest_news():
         if exc.status_code == 503:
             # If CMS is unavailable, use mock data for now
             logger.warning("CMS unavailable, returning mock latest news")
+            mock_fallback("get_latest_news", "unavailable")
             return mock_news
         raise
     except Exception as exc:
         # For development, return mock data
         if os.getenv("ENV", "development") == "development":
             logger.info("Using mock data for latest news")
+            mock_fallback("get_latest_news", "error")
             return mock_news
 
         logger.error(f"Error fetching latest news: {exc}")
@@ -109,18 +84,20 @@ async def get_news_paths():
     """
     try:
         # Try to fetch from CMS API
-        paths = await fetch_from_cms("news/paths")
-        return paths
+        # Slugs need no transformation, so skip decoding and re-encoding
+        return await passthrough("news/paths")
     except HTTPException as exc:
         if exc.status_code == 503:
             # If CMS is unavailable, log warning and return a few paths
             logger.warning("CMS unavailable, returning limited news paths")
+            mock_fallback("get_news_paths", "unavailable")
             return [news.slug for news in mock_news]
         raise
     except Exception as exc:
         # For development, return mock paths
         if os.getenv("ENV", "development") == "development":
             logger.info("Using mock data for news paths")
+            mock_fallback("get_news_paths", "error")
             return [news.slug for news in mock_news]
 
         logger.error(f"Error fetching news paths: {exc}")
@@ -137,14 +114,14 @@ async def get_news_article(slug: str = Path(..., description="The slug of the ne
         decoded_slug = unquote(slug)
         
         # Try to fetch from CMS API
-        article = await fetch_from_cms(f"news/{decoded_slug}")
-        return article
+        return await validated_passthrough(f"news/{decoded_slug}", Article, affinity=decoded_slug)
     except HTTPException as exc:
         if exc.status_code == 404:
             raise HTTPException(status_code=404, detail=f"News article with slug '{slug}' not found")
         elif exc.status_code == 503:
             # If CMS is unavailable, check if we have this article in our mock data
             logger.warning(f"CMS unavailable, trying to serve mock news article {slug}")
+            mock_fallback("get_news_article", "unavailable")
             for news in mock_news:
                 if news.slug == slug:
                     # Convert to a full Article with content
@@ -173,6 +150,7 @@ async def get_news_article(slug: str = Path(..., description="The slug of the ne
         # For development, return mock data
         if os.getenv("ENV", "development") == "development":
             logger.info(f"Using mock data for news article {slug}")
+            mock_fallback("get_news_article", "error")
             for news in mock_news:
                 if news.slug == slug:
                     # Convert to a full Article with content
@@ -205,7 +183,7 @@ async def get_related_news(slug: str = Path(..., description="The slug of the ar
     """
     try:
         # Try to fetch from CMS API
-        news = await fetch_from_cms(f"news/{slug}/related")
+        news = await fetch_from_cms(f"news/{slug}/related", affinity=slug)
         return news
     except HTTPException as exc:
         if exc.status_code == 404:
@@ -214,6 +192,7 @@ async def get_related_news(slug: str = Path(..., description="The slug of the ar
         if exc.status_code == 503:
             # If CMS is unavailable, use mock data
             logger.warning("CMS unavailable, returning mock related articles")
+            mock_fallback("get_related_news", "unavailable")
             # Exclude the current article
             return [news.slug for news in mock_news if news.slug != slug][:3]
         raise
@@ -221,39 +200,43 @@ async def get_related_news(slug: str = Path(..., description="The slug of the ar
         # For development, return mock data
         if os.getenv("ENV", "development") == "development":
             logger.info(f"Using mock data for related articles to {slug}")
+            mock_fallback("get_related_news", "error")
             # Exclude the current article
             return [news.slug for news in mock_news if news.slug != slug][:3]
 
         logger.error(f"Error fetching related articles for {slug}: {exc}")
         return []
 
-async def search_news(query: str):
+async def search_news(query: str, lang: Optional[str] = None):
     """
-    Search news articles by query string
+    Search news articles by query string. Returns (results, complete); complete is False when
+    mock or empty results stand in for a failed CMS call
     """
     try:
         # Try to fetch from CMS API
-        news = await fetch_from_cms("news/search", {"q": query})
-        return news
+        news = await fetch_from_cms("news/search", {"q": query}, lang)
+        return news, True
     except HTTPException as exc:
         if exc.status_code == 503:
             # If CMS is unavailable, use mock search results
             logger.warning("CMS unavailable, returning mock news search results")
+            mock_fallback("search_news", "unavailable")
             return [
                 news for news in mock_news 
                 if query.lower() in news.title.lower() or 
                    (news.summary and query.lower() in news.summary.lower())
-            ]
+            ], False
         raise
     except Exception as exc:
         # For development, return filtered mock data
         if os.getenv("ENV", "development") == "development":
             logger.info(f"Using mock data for news search: {query}")
+            mock_fallback("search_news", "error")
             return [
                 news for news in mock_news 
                 if query.lower() in news.title.lower() or 
                    (news.summary and query.lower() in news.summary.lower())
-            ]
+            ], False
 
         logger.error(f"Error searching news: {exc}")
-        return []
+        return [], False
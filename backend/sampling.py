@@ -0,0 +1,27 @@
+"""
+Sentry sampling for the gateway: its route rates on top of the shared
+sampler (shared/sampling.py, which documents how sampling works).
+"""
+import os
+import sys
+from pathlib import Path
+
+# The sampler is shared with the CMS from the repository root
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from shared.sampling import Sampler, env_defaults  # noqa: E402
+
+ROUTES = {
+    "/api/health": 0.0,
+    "/metrics": 0.0,
+    "/docs*": 0.0,
+    "/openapi.json": 0.0,
+    "/api/*/paths": 0.01,
+    "/api/drugs/paths": 0.01,
+}
+
+sampler = Sampler(
+    env_defaults(ROUTES),
+    config_file=os.getenv("SAMPLING_CONFIG_FILE"),
+    reload_seconds=float(os.getenv("SAMPLING_RELOAD_SECONDS", 5)),
+)
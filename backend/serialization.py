@@ -0,0 +1,32 @@
+"""
+JSON encoding for the gateway.
+
+orjson is used when it is installed; otherwise everything falls back to the
+standard library so the gateway still runs without it.
+"""
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    from fastapi.responses import ORJSONResponse as DefaultJSONResponse
+
+    def loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def dumps(data: Any) -> bytes:
+        return orjson.dumps(data)
+else:
+    DefaultJSONResponse = JSONResponse
+
+    def loads(data: bytes) -> Any:
+        return json.loads(data)
+
+    def dumps(data: Any) -> bytes:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
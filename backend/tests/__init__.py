@@ -0,0 +1 @@
+"""Gateway tests. Run from backend/: python -m unittest discover tests"""
@@ -0,0 +1,48 @@
+import unittest
+from unittest import mock
+
+from cache import LFUCache, SearchCache
+
+
+class LFUCacheTests(unittest.TestCase):
+    def test_evicts_least_frequently_used(self):
+        cache = LFUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_evicts_oldest_among_equally_used(self):
+        cache = LFUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), 2)
+
+    def test_entries_expire_after_ttl(self):
+        cache = LFUCache(max_entries=2, ttl=60)
+        with mock.patch("cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with mock.patch("cache.time.monotonic", return_value=161.0):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+
+class SearchCacheTests(unittest.TestCase):
+    def test_keys_on_normalized_query_per_locale(self):
+        cache = SearchCache(max_entries=10)
+        cache.set("en", "  Back   PAIN ", ["result"])
+        self.assertEqual(cache.get("en", "back pain"), ["result"])
+        self.assertIsNone(cache.get("hi", "back pain"))
+
+    def test_clear_empties_every_locale(self):
+        cache = SearchCache(max_entries=10)
+        cache.set("en", "flu", ["en"])
+        cache.set("hi", "flu", ["hi"])
+        cache.clear()
+        self.assertIsNone(cache.get("en", "flu"))
+        self.assertIsNone(cache.get("hi", "flu"))
@@ -0,0 +1,58 @@
+import json
+import unittest
+from unittest import mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from cache import search_cache
+from routers import events
+
+
+class FakeHub:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, topic, event):
+        self.published.append((topic, event["slug"]))
+
+
+class ReceiveEventsTests(unittest.TestCase):
+    def setUp(self):
+        app = FastAPI()
+        app.include_router(events.router)
+        app.state.hub = self.hub = FakeHub()
+        self.client = TestClient(app)
+        patcher = mock.patch.object(events, "LIVE_EVENTS_TOKEN", "secret")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(search_cache.clear)
+
+    def post(self, payload):
+        return self.client.post(
+            "/internal/events", content=json.dumps(payload), headers={"X-Events-Token": "secret"},
+        )
+
+    def test_event_is_published_to_its_topics(self):
+        response = self.post([{"type": "article", "slug": "flu", "category": {"slug": "infections"}}])
+        self.assertEqual(response.json(), {"accepted": 1})
+        self.assertEqual(
+            self.hub.published,
+            [("latest:articles", "flu"), ("category:infections", "flu"), ("article:flu", "flu")],
+        )
+
+    def test_malformed_category_is_skipped(self):
+        response = self.post([
+            {"type": "news", "slug": "bad", "category": "infections"},
+            {"type": "news", "slug": "good", "category": None},
+        ])
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json(), {"accepted": 1})
+        self.assertEqual(self.hub.published, [("latest:news", "good")])
+
+    def test_accepted_events_clear_the_search_cache(self):
+        search_cache.set("en", "flu", ["stale"])
+        self.post([{"type": "unknown", "slug": "x"}])
+        self.assertEqual(search_cache.get("en", "flu"), ["stale"])
+        self.post([{"type": "news", "slug": "flu"}])
+        self.assertIsNone(search_cache.get("en", "flu"))
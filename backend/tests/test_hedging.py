@@ -0,0 +1,70 @@
+import asyncio
+import unittest
+from unittest import mock
+
+import httpx
+
+import cms_client
+from balancer import Balancer
+
+PRIMARY = "http://cms-a/api"
+SECONDARY = "http://cms-b/api"
+
+
+class FakeClient:
+    """Answers each replica after its own delay, recording which were called and cancelled"""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.called = []
+        self.cancelled = []
+
+    async def request(self, method, url, **kwargs):
+        upstream = next(upstream for upstream in self.delays if url.startswith(upstream + "/"))
+        self.called.append(upstream)
+        try:
+            await asyncio.sleep(self.delays[upstream])
+        except asyncio.CancelledError:
+            self.cancelled.append(upstream)
+            raise
+        return httpx.Response(200, content=upstream.encode(), request=httpx.Request(method, url))
+
+
+class HedgingTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        balancer = Balancer([PRIMARY, SECONDARY], strategy="least_outstanding")
+        # Route every call to PRIMARY first
+        balancer.choose = mock.Mock(side_effect=lambda key=None, exclude=(): next(
+            (upstream for upstream in balancer.upstreams if upstream not in exclude), None
+        ))
+        patches = [
+            mock.patch.object(cms_client, "balancer", balancer),
+            mock.patch.object(cms_client, "CMS_HEDGING", True),
+            # p95 and p99 of the group's latency histogram
+            mock.patch.object(cms_client, "observed", side_effect=lambda group, q: 0.02 if q == 95 else 0.5),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    async def send(self, delays):
+        client = FakeClient(delays)
+        with mock.patch.object(cms_client, "get_client", return_value=client):
+            response = await cms_client._send_hedged("articles", "GET", "articles/flu", None, None, None)
+            await asyncio.sleep(0)
+        return response, client
+
+    async def test_slow_primary_is_hedged_and_loser_cancelled(self):
+        response, client = await self.send({PRIMARY: 1.0, SECONDARY: 0.01})
+        self.assertEqual(response.content, SECONDARY.encode())
+        self.assertEqual(client.called, [PRIMARY, SECONDARY])
+        self.assertEqual(client.cancelled, [PRIMARY])
+
+    async def test_fast_primary_is_not_hedged(self):
+        response, client = await self.send({PRIMARY: 0.001, SECONDARY: 0.001})
+        self.assertEqual(response.content, PRIMARY.encode())
+        self.assertEqual(client.called, [PRIMARY])
+
+    async def test_posts_are_never_hedged(self):
+        self.assertIsNone(cms_client.hedge_delay("articles", "POST", 0.5))
+        self.assertEqual(cms_client.hedge_delay("articles", "GET", 0.5), 0.02)
@@ -0,0 +1,72 @@
+import unittest
+
+from resilience import CircuitBreaker, route_group
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(
+            "articles", error_rate=0.5, min_calls=4, window=30, open_seconds=15, half_open_calls=1, clock=self.clock,
+        )
+
+    def fail(self, times: int) -> None:
+        for _ in range(times):
+            self.assertTrue(self.breaker.allow())
+            self.breaker.record_failure()
+
+    def test_stays_closed_below_min_calls(self):
+        self.fail(3)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_opens_at_error_rate_and_rejects_calls(self):
+        self.breaker.record_success()
+        self.breaker.record_success()
+        self.fail(2)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual(self.breaker.retry_after(), 15)
+
+    def test_old_failures_leave_the_window(self):
+        self.fail(3)
+        self.clock.now += 31
+        self.fail(1)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_probe_closes_on_success(self):
+        self.fail(4)
+        self.clock.now += 15
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_probe_reopens_on_failure(self):
+        self.fail(4)
+        self.clock.now += 15
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+    def test_released_probe_can_be_retried(self):
+        self.fail(4)
+        self.clock.now += 15
+        self.assertTrue(self.breaker.allow())
+        self.breaker.release()
+        self.assertTrue(self.breaker.allow())
+
+
+class RouteGroupTests(unittest.TestCase):
+    def test_groups_by_first_meaningful_segment(self):
+        self.assertEqual(route_group("conditions/asthma"), "conditions")
+        self.assertEqual(route_group("v2/pages/?type=news.NewsPage"), "pages")
+        self.assertEqual(route_group("api/search?q=flu"), "search")
@@ -0,0 +1,92 @@
+"""
+Compare JSON serialization cost on the largest API responses.
+
+Fetches the current responses of the heaviest CMS endpoints through Django's
+test client, then times, per payload:
+
+  cms: stdlib    json.dumps with DjangoJSONEncoder (what JsonResponse does)
+  cms: orjson    api.renderers.dumps
+  gw:  stdlib    json.loads + json.dumps (httpx .json() and JSONResponse)
+  gw:  orjson    orjson.loads + orjson.dumps
+  gw:  raw       passing the CMS bytes through untouched
+
+Run from the repository root against a populated database:
+
+    python benchmarks/json_serialization.py [--number 200]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'cms'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'healthinfo.settings.dev')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.serializers.json import DjangoJSONEncoder  # noqa: E402
+from django.test import Client  # noqa: E402
+
+from api.renderers import dumps, orjson  # noqa: E402
+from articles.models import ArticlePage  # noqa: E402
+from conditions.models import ConditionPage  # noqa: E402
+from news.models import NewsPage  # noqa: E402
+
+
+def endpoints():
+    urls = ['/api/articles/top-stories/', '/api/news/latest/', '/api/well-being']
+    for model, prefix in ((ArticlePage, 'articles'), (NewsPage, 'news'), (ConditionPage, 'conditions')):
+        slug = model.objects.live().values_list('slug', flat=True).first()
+        if slug:
+            urls.append(f'/api/{prefix}/{slug}' + ('' if prefix == 'news' else '/'))
+    return urls
+
+
+def collect():
+    client = Client()
+    payloads = {}
+    for url in endpoints():
+        response = client.get(url, HTTP_HOST='localhost')
+        if response.status_code == 200:
+            payloads[url] = response.content
+    return payloads
+
+
+def rate(func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=3)) / number
+    return 1 / seconds if seconds else float('inf')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--number', type=int, default=200, help='Iterations per measurement')
+    args = parser.parse_args()
+
+    if orjson is None:
+        sys.exit('orjson is not installed; nothing to compare against')
+
+    payloads = collect()
+    if not payloads:
+        sys.exit('No endpoint returned 200; populate the database first')
+
+    columns = ('cms: stdlib', 'cms: orjson', 'gw: stdlib', 'gw: orjson', 'gw: raw')
+    print(f"{'endpoint':<60} {'KB':>7} " + ' '.join(f'{c:>12}' for c in columns))
+    for url, body in payloads.items():
+        data = json.loads(body)
+        rates = (
+            rate(lambda: json.dumps(data, cls=DjangoJSONEncoder).encode('utf-8'), args.number),
+            rate(lambda: dumps(data), args.number),
+            rate(lambda: json.dumps(json.loads(body)).encode('utf-8'), args.number),
+            rate(lambda: orjson.dumps(orjson.loads(body)), args.number),
+            rate(lambda: bytes(body), args.number),
+        )
+        print(f'{url[:60]:<60} {len(body) / 1024:>7.1f} ' + ' '.join(f'{r:>10.0f}/s' for r in rates))
+
+
+if __name__ == '__main__':
+    main()
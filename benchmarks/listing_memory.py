@@ -0,0 +1,88 @@
+"""
+Compare what listing querysets load against plain `objects.live()`.
+
+For every content type, runs the query behind the listing endpoints two
+ways and reports, scaled to 1,000 rows:
+
+  db KB       bytes of column values returned by the database
+  py KB       Python memory allocated while building the page instances
+  queries     queries issued while iterating (deferred-field lookups show up here)
+
+  full        Model.objects.live()
+  listing     api.listing.listing_queryset(Model)
+
+Run from the repository root against a populated database:
+
+    python benchmarks/listing_memory.py
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'cms'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'healthinfo.settings.dev')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from api.listing import listing_queryset  # noqa: E402
+from articles.models import ArticlePage  # noqa: E402
+from conditions.models import ConditionPage  # noqa: E402
+from drugs.models import DrugPage  # noqa: E402
+from news.models import NewsPage  # noqa: E402
+from remedies.models import RemedyPage  # noqa: E402
+
+MODELS = (ArticlePage, NewsPage, ConditionPage, DrugPage, RemedyPage)
+
+
+def db_bytes(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return sum(len(str(value)) for row in cursor.fetchall() for value in row if value is not None)
+
+
+def python_bytes(queryset):
+    tracemalloc.start()
+    with CaptureQueriesContext(connection) as queries:
+        pages = list(queryset)
+        for page in pages:
+            # What a card serializer touches
+            page.title, page.slug
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.parse_args()
+
+    print(f"{'model':<14} {'rows':>6} {'full db KB':>11} {'listing db KB':>14} "
+          f"{'full py KB':>11} {'listing py KB':>14} {'queries':>9}")
+    for model in MODELS:
+        rows = model.objects.live().count()
+        if not rows:
+            print(f'{model.__name__:<14} {0:>6}  (no live pages)')
+            continue
+        scale = 1000 / rows
+        full, listing = model.objects.live(), listing_queryset(model)
+        full_py, full_queries = python_bytes(full.all())
+        listing_py, listing_queries = python_bytes(listing.all())
+        print(
+            f'{model.__name__:<14} {rows:>6} '
+            f'{db_bytes(full) * scale / 1024:>11.1f} {db_bytes(listing) * scale / 1024:>14.1f} '
+            f'{full_py * scale / 1024:>11.1f} {listing_py * scale / 1024:>14.1f} '
+            f'{full_queries:>4}/{listing_queries:<4}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,323 @@
+"""
+Drive a realistic traffic mix at the API and compare it with a baseline.
+
+Starts the CMS (manage.py runserver) and the gateway (uvicorn) on local
+ports, discovers page slugs from the CMS /paths endpoints, then keeps
+--concurrency clients busy for --duration seconds after a --warmup, each
+picking a request from the mix below. Popular pages get most of the
+traffic: slugs are drawn with Zipf-like weights, as real page views are.
+
+    weight  request
+        20  GET /api/articles/{slug}
+        15  GET /api/news/{slug}
+        15  GET /api/conditions/{slug}
+        10  GET /api/drugs/{slug}
+         8  GET /api/news/latest
+         8  GET /api/articles/top-stories
+         5  GET /api/articles/{slug}/related
+         5  GET /api/news/{slug}/related
+         4  GET /api/articles/health-topics
+         4  GET /api/conditions/index
+         4  GET /api/search?q={term}
+
+Reports throughput, error counts (any response other than 2xx, or no
+response) and latency percentiles per endpoint and overall, and writes them
+as JSON to --output. With --save-baseline the run is also stored as
+benchmarks/baselines/<name>.json; later runs with the same --baseline name
+fail (exit status 1) when an endpoint's p95 grows or throughput drops by
+more than --tolerance. Baselines are only comparable
+on the same machine, corpus and settings, which are recorded alongside.
+
+Seed a corpus first, e.g. 10k pages per type:
+
+    cd cms && python manage.py seed_content --count 10000
+
+then from the repository root:
+
+    python benchmarks/load_test.py --save-baseline
+    python benchmarks/load_test.py                       # compare with it
+
+--gateway-url points at an already running gateway instead of starting
+one (and the CMS); --target cms sends the mix straight to the CMS.
+"""
+import argparse
+import asyncio
+import bisect
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINES = ROOT / 'benchmarks' / 'baselines'
+
+MIX = (
+    (20, '/api/articles/{slug}', 'articles'),
+    (15, '/api/news/{slug}', 'news'),
+    (15, '/api/conditions/{slug}', 'conditions'),
+    (10, '/api/drugs/{slug}', 'drugs'),
+    (8, '/api/news/latest', None),
+    (8, '/api/articles/top-stories', None),
+    (5, '/api/articles/{slug}/related', 'articles'),
+    (5, '/api/news/{slug}/related', 'news'),
+    (4, '/api/articles/health-topics', None),
+    (4, '/api/conditions/index', None),
+    (4, '/api/search?q={term}', None),
+)
+
+SEARCH_TERMS = (
+    'diabetes', 'heart', 'sleep', 'blood pressure', 'vitamin', 'anxiety', 'asthma',
+    'cholesterol', 'thyroid', 'pain', 'skin', 'fever', 'allergy', 'insulin', 'stress',
+)
+
+# Zipf exponent for slug popularity; ~1 matches typical content sites
+ZIPF_S = 1.0
+
+
+class Popularity:
+    """Draws items with probability proportional to 1 / rank ** ZIPF_S"""
+
+    def __init__(self, items, rng):
+        self.items = list(items)
+        rng.shuffle(self.items)
+        self.cumulative = []
+        total = 0.0
+        for rank in range(1, len(self.items) + 1):
+            total += 1 / rank ** ZIPF_S
+            self.cumulative.append(total)
+
+    def pick(self, rng):
+        return self.items[bisect.bisect(self.cumulative, rng.random() * self.cumulative[-1])]
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, errors, seconds):
+    values = sorted(latencies)
+    return {
+        'requests': len(values),
+        'errors': errors,
+        'rps': round(len(values) / seconds, 1),
+        **{f'p{q}_ms': round(percentile(values, q) * 1000, 2) if values else None for q in (50, 90, 95, 99)},
+        'max_ms': round(values[-1] * 1000, 2) if values else None,
+    }
+
+
+def start(command, cwd, env, url, timeout=60):
+    """Start a server and wait until it answers at url"""
+    process = subprocess.Popen(
+        command, cwd=cwd, env={**os.environ, **env},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{' '.join(command)} exited with status {process.returncode}")
+        try:
+            httpx.get(url, timeout=2)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError(f'{url} did not come up within {timeout}s')
+
+
+async def discover(client, base_url):
+    """Slugs per content type, from the /paths endpoints; types without any are left out of the mix"""
+    slugs = {}
+    for kind in ('articles', 'news', 'conditions', 'drugs'):
+        response = await client.get(f'{base_url}/api/{kind}/paths')
+        if response.status_code != 200:
+            print(f'Warning: /api/{kind}/paths returned {response.status_code}; skipping {kind} pages')
+            continue
+        slugs[kind] = [item if isinstance(item, str) else item.get('slug') for item in response.json()]
+    return slugs
+
+
+async def run(base_url, paths_url, args):
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=args.timeout, follow_redirects=True) as client:
+        slugs = await discover(client, paths_url)
+        popular = {kind: Popularity(items, rng) for kind, items in slugs.items() if items}
+        mix = [entry for entry in MIX if entry[2] is None or entry[2] in popular]
+        cumulative = []
+        total = 0
+        for weight, _template, _kind in mix:
+            total += weight
+            cumulative.append(total)
+
+        latencies = {template: [] for _weight, template, _kind in mix}
+        errors = {template: 0 for _weight, template, _kind in mix}
+        started = time.monotonic()
+        measure_from = started + args.warmup
+        stop_at = measure_from + args.duration
+
+        async def client_loop(worker):
+            worker_rng = random.Random(f'{args.seed}-{worker}')
+            while True:
+                now = time.monotonic()
+                if now >= stop_at:
+                    return
+                _weight, template, kind = mix[bisect.bisect(cumulative, worker_rng.random() * total)]
+                path = template
+                if kind:
+                    path = path.replace('{slug}', popular[kind].pick(worker_rng))
+                path = path.replace('{term}', worker_rng.choice(SEARCH_TERMS))
+                sent = time.perf_counter()
+                try:
+                    response = await client.get(base_url + path)
+                    failed = not response.is_success
+                except httpx.HTTPError:
+                    failed = True
+                elapsed = time.perf_counter() - sent
+                if now >= measure_from:
+                    latencies[template].append(elapsed)
+                    errors[template] += failed
+
+        await asyncio.gather(*(client_loop(worker) for worker in range(args.concurrency)))
+
+    seconds = args.duration
+    endpoints = {
+        template: summarize(latencies[template], errors[template], seconds)
+        for template in latencies if latencies[template]
+    }
+    overall = summarize(
+        [value for values in latencies.values() for value in values], sum(errors.values()), seconds,
+    )
+    return {
+        'overall': overall,
+        'endpoints': endpoints,
+        'corpus': {kind: len(items) for kind, items in slugs.items()},
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(result, baseline, tolerance):
+    """Regressions of result against baseline, as printable lines"""
+    regressions = []
+    for template, stats in result['endpoints'].items():
+        before = baseline['endpoints'].get(template)
+        if not before or not before.get('p95_ms'):
+            continue
+        # Ignore sub-millisecond noise on very fast endpoints
+        if stats['p95_ms'] > before['p95_ms'] * (1 + tolerance) + 1:
+            regressions.append(f"{template}: p95 {before['p95_ms']}ms -> {stats['p95_ms']}ms")
+    before_rps, rps = baseline['overall']['rps'], result['overall']['rps']
+    if rps < before_rps * (1 - tolerance):
+        regressions.append(f'throughput {before_rps} -> {rps} req/s')
+    if result['overall']['errors'] > baseline['overall']['errors']:
+        regressions.append(f"errors {baseline['overall']['errors']} -> {result['overall']['errors']}")
+    return regressions
+
+
+def print_report(result):
+    print(f"{'endpoint':<32} {'reqs':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    rows = sorted(result['endpoints'].items()) + [('overall', result['overall'])]
+    for template, stats in rows:
+        print(
+            f"{template:<32} {stats['requests']:>7} {stats['errors']:>5} {stats['rps']:>8} "
+            + ' '.join(f'{stats[key]:>8}' for key in ('p50_ms', 'p90_ms', 'p95_ms', 'p99_ms', 'max_ms'))
+        )
+    print(f"corpus: {result['corpus']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--target', choices=('gateway', 'cms'), default='gateway', help='Where to send the mix')
+    parser.add_argument('--gateway-url', help='Use a running gateway instead of starting one')
+    parser.add_argument('--cms-url', help='Use a running CMS instead of starting one')
+    parser.add_argument('--cms-port', type=int, default=8101)
+    parser.add_argument('--gateway-port', type=int, default=8100)
+    parser.add_argument('--duration', type=float, default=30, help='Measured seconds')
+    parser.add_argument('--warmup', type=float, default=5, help='Seconds of traffic before measuring')
+    parser.add_argument('--concurrency', type=int, default=16, help='Concurrent clients')
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--baseline', default='default', help='Baseline name under benchmarks/baselines')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed relative regression')
+    args = parser.parse_args()
+
+    processes = []
+    try:
+        cms_url = args.cms_url
+        if not cms_url and not (args.target == 'gateway' and args.gateway_url):
+            cms_url = f'http://127.0.0.1:{args.cms_port}'
+            processes.append(start(
+                [sys.executable, 'manage.py', 'runserver', f'127.0.0.1:{args.cms_port}', '--noreload'],
+                ROOT / 'cms', {}, f'{cms_url}/api/news/paths',
+            ))
+        base_url = cms_url
+        if args.target == 'gateway':
+            base_url = args.gateway_url
+            if not base_url:
+                base_url = f'http://127.0.0.1:{args.gateway_port}'
+                processes.append(start(
+                    [sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(args.gateway_port), '--log-level', 'warning'],
+                    ROOT / 'backend', {'CMS_API_URL': f'{cms_url}/api'}, f'{base_url}/api/health',
+                ))
+        # Slugs come from the CMS when it is known, as it is the source of truth
+        result = asyncio.run(run(base_url.rstrip('/'), (cms_url or base_url).rstrip('/'), args))
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait(timeout=10)
+
+    result['run'] = {
+        'target': args.target,
+        'commit': git_commit(),
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'duration': args.duration,
+        'concurrency': args.concurrency,
+        'seed': args.seed,
+        'machine': f'{platform.node()} {platform.machine()} {os.cpu_count()} cpus',
+        'python': platform.python_version(),
+    }
+    print_report(result)
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2) + '\n')
+
+    baseline_path = BASELINES / f'{args.baseline}.json'
+    if args.save_baseline:
+        BASELINES.mkdir(exist_ok=True)
+        baseline_path.write_text(json.dumps(result, indent=2) + '\n')
+        print(f'Saved baseline {baseline_path}')
+        return
+    if not baseline_path.exists():
+        print(f'No baseline at {baseline_path}; run with --save-baseline to create one')
+        return
+    baseline = json.loads(baseline_path.read_text())
+    for key in ('target', 'concurrency', 'machine'):
+        if baseline['run'].get(key) != result['run'][key]:
+            print(f"Warning: baseline {key} was {baseline['run'].get(key)!r}, this run {result['run'][key]!r}")
+    regressions = compare(result, baseline, args.tolerance)
+    if regressions:
+        print(f"Regressions against {baseline_path} (commit {baseline['run'].get('commit')}):")
+        for line in regressions:
+            print(f'  {line}')
+        sys.exit(1)
+    print(f"No regressions against {baseline_path} (commit {baseline['run'].get('commit')})")
+
+
+if __name__ == '__main__':
+    main()
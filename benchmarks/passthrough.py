@@ -0,0 +1,108 @@
+"""
+Measure gateway CPU per detail response with and without re-validation.
+
+Times, in process CPU seconds, the work the gateway does between receiving
+the CMS body and producing its own response body for a condition and an
+article detail payload:
+
+  model        decode, validate into the response_model, serialize again
+               (what FastAPI does when a route returns the decoded dict)
+  sampled      validated_passthrough at RESPONSE_VALIDATION_SAMPLE_RATE
+  passthrough  forward the bytes, never validate
+
+Payloads are synthetic but sized like real detail pages (several HTML
+sections of a few KB each). Run from the repository root:
+
+    python benchmarks/passthrough.py [--number 2000] [--section-kb 4]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+os.environ['ENV'] = 'production'
+
+from fastapi.responses import Response  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+import cms_client  # noqa: E402
+from models import Article, Condition  # noqa: E402
+from serialization import DefaultJSONResponse, dumps, loads  # noqa: E402
+
+
+def html(kb):
+    paragraph = '<p>Lorem ipsum dolor sit amet, <a href="/conditions/asthma/">consectetur</a> adipiscing elit.</p>'
+    return paragraph * max(1, kb * 1024 // len(paragraph))
+
+
+def payloads(section_kb):
+    condition = {
+        'id': 1, 'name': 'Asthma', 'slug': 'asthma', 'subtitle': 'Airways narrow and swell',
+        'overview': html(section_kb), 'symptoms': html(section_kb), 'causes': html(section_kb),
+        'diagnosis': html(section_kb), 'treatments': html(section_kb), 'prevention': html(section_kb),
+        'complications': html(section_kb), 'risk_factors': html(section_kb),
+        'image': 'https://example.com/media/images/asthma.fill-800x500.jpg',
+        'related_conditions': [{'name': f'Condition {i}', 'slug': f'condition-{i}'} for i in range(6)],
+    }
+    article = {
+        'id': 2, 'title': 'Managing asthma', 'slug': 'managing-asthma', 'summary': 'Summary',
+        'subtitle': 'Subtitle', 'image': 'https://example.com/media/images/article.jpg',
+        'content': html(section_kb * 6),
+        'author': {'name': 'Health Expert', 'credentials': 'MD', 'bio': 'Bio'},
+        'published_date': '2025-01-01T00:00:00Z', 'tags': ['asthma', 'lungs'],
+        'category': {'name': 'Respiratory', 'slug': 'respiratory'},
+    }
+    return {'condition': (Condition, dumps(condition)), 'article': (Article, dumps(article))}
+
+
+async def model_path(model, field, body):
+    content = await serialize_response(field=field, response_content=loads(body))
+    return DefaultJSONResponse(content).body
+
+
+async def sampled_path(model, field, body):
+    if cms_client.should_validate():
+        model.model_validate_json(body)
+    return Response(content=body, media_type='application/json').body
+
+
+async def passthrough_path(model, field, body):
+    return Response(content=body, media_type='application/json').body
+
+
+async def measure(func, model, body, number):
+    field = create_model_field(name='Response', type_=model, mode='serialization')
+    await func(model, field, body)
+    started = time.process_time()
+    for _ in range(number):
+        await func(model, field, body)
+    return (time.process_time() - started) / number
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--number', type=int, default=2000, help='Responses per measurement')
+    parser.add_argument('--section-kb', type=int, default=4, help='Size of each HTML section')
+    args = parser.parse_args()
+
+    random.seed(0)
+    print(f"sample rate {cms_client.RESPONSE_VALIDATION_SAMPLE_RATE}")
+    print(f"{'payload':<10} {'KB':>6} {'model':>12} {'sampled':>12} {'passthrough':>12} {'saved':>12}")
+    for name, (model, body) in payloads(args.section_kb).items():
+        model_cpu = await measure(model_path, model, body, args.number)
+        sampled_cpu = await measure(sampled_path, model, body, args.number)
+        raw_cpu = await measure(passthrough_path, model, body, args.number)
+        print(
+            f'{name:<10} {len(body) / 1024:>6.1f} '
+            f'{model_cpu * 1e6:>10.1f}us {sampled_cpu * 1e6:>10.1f}us {raw_cpu * 1e6:>10.1f}us '
+            f'{(model_cpu - sampled_cpu) * 1e6:>10.1f}us'
+        )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,267 @@
+"""
+Load-test the gateway's Socket.IO rooms with many simulated sockets.
+
+Starts the gateway (uvicorn, --workers processes) unless --url is given,
+opens --clients WebSocket connections speaking the Engine.IO/Socket.IO wire
+protocol directly (far lighter than full Socket.IO clients, so 10k fit in
+one process), and subscribes each to one article topic and one category
+topic, both drawn with Zipf-like weights. --publishers of the sockets then
+send --rate messages per second in total to topics of their own for
+--duration seconds.
+
+Reports connection time and failures, messages sent, deliveries against
+the number expected from the subscriptions, batches received and delivery
+latency percentiles (publish to receipt, including batching delay).
+
+    python benchmarks/socket_load_test.py --clients 10000
+
+Several workers only share rooms through a message queue, e.g.
+
+    SOCKETIO_MESSAGE_QUEUE=redis://localhost:6379 python benchmarks/socket_load_test.py --workers 4
+
+Client and server share the machine, so the client's own event loop is part
+of the measured latency; compare runs made on the same machine.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import aiohttp
+
+from load_test import ROOT, Popularity, git_commit, percentile, start
+
+ARTICLE_TOPICS = 500
+CATEGORY_TOPICS = 20
+
+
+def raise_file_limit():
+    """Each socket is a file descriptor; lift the soft limit to the hard one (inherited by the server)"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return hard
+
+
+class Stats:
+    def __init__(self):
+        self.connected = 0
+        self.connect_failures = 0
+        self.disconnects = 0
+        self.sent = 0
+        self.expected = 0
+        self.delivered = 0
+        self.batches = 0
+        self.latencies = []
+
+
+class SimulatedSocket:
+    """One Socket.IO client on the default namespace over a raw WebSocket"""
+
+    def __init__(self, session, url, topics, stats, measure_from):
+        self.session = session
+        self.url = url
+        self.topics = topics
+        self.stats = stats
+        self.measure_from = measure_from
+        self.ws = None
+        self.ready = asyncio.Event()
+        self.acks = 0
+        self.closing = False
+
+    async def connect(self):
+        self.ws = await self.session.ws_connect(self.url, max_msg_size=0)
+        opening = await self.ws.receive_str()
+        if not opening.startswith('0'):
+            raise RuntimeError(f'unexpected Engine.IO open packet {opening[:40]!r}')
+        await self.ws.send_str('40')
+        for topic in self.topics:
+            await self.emit('subscribe', {'topic': topic})
+
+    async def emit(self, event, data):
+        # 42<ack id>[event, data]; acks come back as 43<ack id>[...]
+        self.acks += 1
+        await self.ws.send_str(f'42{self.acks}' + json.dumps([event, data], separators=(',', ':')))
+
+    async def listen(self):
+        subscribed = 0
+        async for frame in self.ws:
+            if frame.type != aiohttp.WSMsgType.TEXT:
+                break
+            packet = frame.data
+            # Engine.IO ping; WebSocket-level pings are answered by aiohttp
+            if packet == '2':
+                await self.ws.send_str('3')
+            elif packet.startswith('43'):
+                subscribed += 1
+                if subscribed == len(self.topics):
+                    self.ready.set()
+            elif packet.startswith('42'):
+                event, data = json.loads(packet[2:])
+                if event != 'messages':
+                    continue
+                now = time.time()
+                self.stats.batches += 1
+                for message in data['messages']:
+                    sent = message['data']['sent']
+                    if sent >= self.measure_from:
+                        self.stats.delivered += 1
+                        self.stats.latencies.append(now - sent)
+        if not self.closing:
+            self.stats.disconnects += 1
+        self.ready.set()
+
+
+async def run(url, args):
+    rng = random.Random(args.seed)
+    articles = Popularity([f'article:bench-{number}' for number in range(ARTICLE_TOPICS)], rng)
+    categories = Popularity([f'category:bench-{number}' for number in range(CATEGORY_TOPICS)], rng)
+    subscribers = {}
+    plans = []
+    for _client in range(args.clients):
+        topics = [articles.pick(rng), categories.pick(rng)]
+        for topic in topics:
+            subscribers[topic] = subscribers.get(topic, 0) + 1
+        plans.append(topics)
+
+    stats = Stats()
+    ws_url = url.replace('http', 'ws', 1) + '/ws/socket.io/?EIO=4&transport=websocket'
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=None)) as session:
+        # Measurement starts after every socket is connected and subscribed
+        measure_from = float('inf')
+        sockets = [SimulatedSocket(session, ws_url, topics, stats, measure_from) for topics in plans]
+        gate = asyncio.Semaphore(args.connect_concurrency)
+        listeners = []
+
+        async def open_socket(socket):
+            async with gate:
+                try:
+                    await socket.connect()
+                except (aiohttp.ClientError, RuntimeError, asyncio.TimeoutError):
+                    stats.connect_failures += 1
+                    socket.ready.set()
+                    return
+                stats.connected += 1
+                listeners.append(asyncio.create_task(socket.listen()))
+                await socket.ready.wait()
+
+        connect_started = time.monotonic()
+        await asyncio.gather(*(open_socket(socket) for socket in sockets))
+        connect_seconds = time.monotonic() - connect_started
+        print(f'{stats.connected} sockets connected and subscribed in {connect_seconds:.1f}s '
+              f'({stats.connect_failures} failed)')
+
+        measure_from = time.time()
+        for socket in sockets:
+            socket.measure_from = measure_from
+        publishers = [socket for socket in sockets if socket.ws is not None and not socket.ws.closed][:args.publishers]
+        interval = len(publishers) / args.rate if publishers else 0
+
+        async def publish_loop(index, socket):
+            publisher_rng = random.Random(f'{args.seed}-publisher-{index}')
+            next_send = time.monotonic() + publisher_rng.random() * interval
+            stop_at = time.monotonic() + args.duration
+            sequence = 0
+            while next_send < stop_at:
+                await asyncio.sleep(max(0, next_send - time.monotonic()))
+                topic = publisher_rng.choice(socket.topics)
+                sequence += 1
+                try:
+                    await socket.emit('message', {'topic': topic, 'data': {'sent': time.time(), 'seq': sequence}})
+                except aiohttp.ClientError:
+                    return
+                stats.sent += 1
+                stats.expected += subscribers[topic]
+                next_send += interval
+
+        await asyncio.gather(*(publish_loop(index, socket) for index, socket in enumerate(publishers)))
+        # Let the last batches arrive
+        await asyncio.sleep(args.drain)
+        for socket in sockets:
+            socket.closing = True
+        for socket in sockets:
+            if socket.ws is not None:
+                await socket.ws.close()
+        for listener in listeners:
+            listener.cancel()
+
+    latencies = sorted(stats.latencies)
+    return {
+        'clients': args.clients,
+        'connected': stats.connected,
+        'connect_failures': stats.connect_failures,
+        'connect_seconds': round(connect_seconds, 2),
+        'dropped_connections': stats.disconnects,
+        'messages_sent': stats.sent,
+        'deliveries_expected': stats.expected,
+        'deliveries': stats.delivered,
+        'delivery_ratio': round(stats.delivered / stats.expected, 4) if stats.expected else None,
+        'deliveries_per_second': round(stats.delivered / args.duration, 1),
+        'batches_received': stats.batches,
+        **{f'p{q}_ms': round(percentile(latencies, q) * 1000, 2) if latencies else None for q in (50, 90, 95, 99)},
+        'max_ms': round(latencies[-1] * 1000, 2) if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--url', help='Use a running gateway instead of starting one')
+    parser.add_argument('--port', type=int, default=8102)
+    parser.add_argument('--workers', type=int, default=1, help='uvicorn workers for the started gateway')
+    parser.add_argument('--clients', type=int, default=10000, help='Simulated sockets')
+    parser.add_argument('--publishers', type=int, default=20, help='Sockets that also send messages')
+    parser.add_argument('--rate', type=float, default=200, help='Messages per second across all publishers')
+    parser.add_argument('--duration', type=float, default=20, help='Seconds of publishing')
+    parser.add_argument('--drain', type=float, default=2, help='Seconds to wait for the last deliveries')
+    parser.add_argument('--connect-concurrency', type=int, default=200, help='Handshakes in flight while connecting')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    args = parser.parse_args()
+
+    limit = raise_file_limit()
+    if args.clients + 100 > limit:
+        sys.exit(f'--clients {args.clients} needs more file descriptors than the limit of {limit}')
+    if args.workers > 1 and not args.url and not os.getenv('SOCKETIO_MESSAGE_QUEUE'):
+        print('Warning: without SOCKETIO_MESSAGE_QUEUE, workers do not share rooms and deliveries will be missing')
+
+    process = None
+    url = args.url
+    try:
+        if not url:
+            url = f'http://127.0.0.1:{args.port}'
+            process = start(
+                [sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(args.port),
+                 '--workers', str(args.workers), '--log-level', 'warning'],
+                ROOT / 'backend', {}, f'{url}/api/health',
+            )
+        result = asyncio.run(run(url.rstrip('/'), args))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+    result['run'] = {
+        'commit': git_commit(),
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'workers': args.workers,
+        'message_queue': os.getenv('SOCKETIO_MESSAGE_QUEUE', ''),
+        'rate': args.rate,
+        'duration': args.duration,
+        'seed': args.seed,
+    }
+    for key, value in result.items():
+        if key != 'run':
+            print(f'{key:<24} {value}')
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+"""
+Batch lookup of pages by slug.
+
+Cards for related items, top stories and sidebars used to take one request
+per slug. `resolve_batch` takes a list of {type, slug, lang, fields} items
+and resolves them with one listing query per content type (see
+api.listing) with images and their renditions prefetched in bulk. Stored
+RichText HTML (see api.richtext) is loaded in a single query when any
+item asks for a RichText field.
+"""
+from collections import namedtuple
+
+from django.conf import settings
+from django.db.models import Q
+
+from articles.models import ArticlePage
+from conditions.models import ConditionPage
+from drugs.models import DrugPage
+from news.models import NewsPage
+from remedies.models import RemedyPage
+
+from .listing import listing_queryset
+from .locale import normalize_locale, translated
+from .richtext import rendered_html_many, served_richtext_fields
+
+CARD_RENDITION = 'fill-800x500'
+
+BatchType = namedtuple('BatchType', ['model', 'serialize', 'slug_fields'])
+
+
+def _image(page):
+    return page.image.get_rendition(CARD_RENDITION).url if page.image else None
+
+
+def _category(category):
+    return {'name': category.name, 'slug': category.slug} if category else None
+
+
+def article_item(page, lang):
+    return {
+        'id': page.id,
+        'title': translated(page, 'title', lang),
+        'slug': page.slug,
+        'subtitle': translated(page, 'subtitle', lang),
+        'summary': translated(page, 'summary', lang),
+        'image': _image(page),
+        'category': _category(page.category),
+        'published_date': page.first_published_at,
+    }
+
+
+def news_item(page, lang):
+    return {
+        'id': page.id,
+        'title': page.title,
+        'slug': page.slug,
+        'subtitle': page.subtitle,
+        'summary': page.summary or page.subtitle,
+        'image': _image(page),
+        'category': _category(page.category),
+        'published_date': page.first_published_at,
+    }
+
+
+def condition_item(page, lang):
+    return {
+        'id': page.id,
+        'name': page.title,
+        'slug': page.slug,
+        'subtitle': translated(page, 'subtitle', lang),
+        'also_known_as': translated(page, 'also_known_as', lang),
+        'image': _image(page),
+    }
+
+
+def drug_item(page, lang):
+    return {
+        'id': page.id,
+        'title': page.title,
+        'slug': page.slug,
+        'generic_name': page.generic_name,
+        'brand_names': page.brand_names,
+        'drug_class': page.drug_class,
+        'image': _image(page),
+    }
+
+
+def remedy_item(page, lang):
+    return {
+        'id': page.id,
+        'title': page.title,
+        'slug': page.slug,
+        'subtitle': page.subtitle,
+        'image': _image(page),
+    }
+
+
+BATCH_TYPES = {
+    'article': BatchType(ArticlePage, article_item, ('slug', 'slug_hi')),
+    'news': BatchType(NewsPage, news_item, ('slug',)),
+    'condition': BatchType(ConditionPage, condition_item, ('slug',)),
+    'drug': BatchType(DrugPage, drug_item, ('slug',)),
+    'remedy': BatchType(RemedyPage, remedy_item, ('slug',)),
+}
+
+
+def parse_items(items):
+    """Validate raw request items; raises ValueError with a message for the client"""
+    if not isinstance(items, list):
+        raise ValueError("'items' must be a list")
+    max_items = getattr(settings, 'API_BATCH_MAX_ITEMS', 100)
+    if len(items) > max_items:
+        raise ValueError(f"At most {max_items} items can be requested at once")
+
+    parsed = []
+    requested = {}
+    for item in items:
+        if not isinstance(item, dict) or not item.get('type') or not item.get('slug'):
+            raise ValueError("Each item needs a 'type' and a 'slug'")
+        if item['type'] not in BATCH_TYPES:
+            raise ValueError(f"Unknown type '{item['type']}', expected one of {', '.join(BATCH_TYPES)}")
+        fields = item.get('fields')
+        if fields is not None and not isinstance(fields, list):
+            raise ValueError("'fields' must be a list of field names")
+        parsed_item = (item['type'], str(item['slug']), normalize_locale(item.get('lang')), fields)
+        # Results are keyed by type and slug, so one of two differing requests would be lost
+        if requested.setdefault(parsed_item[:2], parsed_item) != parsed_item:
+            raise ValueError(
+                f"'{item['type']}' '{item['slug']}' is requested more than once with a different lang or fields"
+            )
+        parsed.append(parsed_item)
+    return parsed
+
+
+def _fetch(batch_type, slugs):
+    """Load all live pages of one type matching any of the slugs, keyed by every slug they answer to"""
+    lookup = Q()
+    for field in batch_type.slug_fields:
+        lookup |= Q(**{f'{field}__in': slugs})
+
+    pages = listing_queryset(batch_type.model, CARD_RENDITION).filter(lookup)
+
+    by_slug = {}
+    for page in pages:
+        for field in batch_type.slug_fields:
+            value = getattr(page, field)
+            if value:
+                by_slug.setdefault(value, page)
+    return by_slug
+
+
+def resolve_batch(items):
+    """
+    Resolve parsed items into {'results': {type: {slug: data}}, 'missing': [...]}.
+
+    `fields` limits an item to the named keys (id and slug are always
+    included); RichText fields of the page may be requested by name too.
+    """
+    slugs_by_type = {}
+    for type_name, slug, _lang, _fields in items:
+        slugs_by_type.setdefault(type_name, set()).add(slug)
+
+    pages = {
+        type_name: _fetch(BATCH_TYPES[type_name], slugs)
+        for type_name, slugs in slugs_by_type.items()
+    }
+
+    wants_html = {}
+    for type_name, slug, lang, fields in items:
+        page = pages[type_name].get(slug)
+        if page is not None and fields and set(fields) & set(served_richtext_fields(type(page))):
+            wants_html.setdefault(lang, set()).add(page)
+    html = {lang: rendered_html_many(wanted, lang) for lang, wanted in wants_html.items()}
+
+    results = {}
+    missing = []
+    for type_name, slug, lang, fields in items:
+        page = pages[type_name].get(slug)
+        if page is None:
+            missing.append({'type': type_name, 'slug': slug})
+            continue
+
+        data = BATCH_TYPES[type_name].serialize(page, lang)
+        if fields:
+            page_html = html.get(lang, {}).get(page.pk, {})
+            for name in fields:
+                if name not in data and name in page_html:
+                    data[name] = page_html[name]
+            keep = set(fields) | {'id', 'slug'}
+            data = {key: value for key, value in data.items() if key in keep}
+        results.setdefault(type_name, {})[slug] = data
+
+    return {'results': results, 'missing': missing}
@@ -0,0 +1,125 @@
+"""
+Bulk page writes for seeding and imports.
+
+Creating pages with add_child() and save_revision().publish() costs several
+queries, a search-index write and the publish signal handlers per page.
+These helpers do the same bookkeeping for a batch of pages at once:
+
+    with transaction.atomic():
+        add_children(parent, pages)      # treebeard paths, two bulk inserts
+        publish_revisions(pages)         # optional: one revision per page
+    index_pages(DrugPage, pages)         # one bulk search-index update
+    discard_stored(page_ids)             # drop stale stored payloads
+
+No page_published signals are sent, so callers purge whatever caches the
+signal handlers would have (see search.signals) themselves, once.
+"""
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+from wagtail.models import Page, Revision
+from wagtail.search.backends import get_search_backends
+
+from .models import DetailPayload, RenderedPage
+
+# Page columns a publish changes
+PUBLISH_FIELDS = [
+    'live', 'has_unpublished_changes', 'first_published_at', 'last_published_at',
+    'latest_revision', 'latest_revision_created_at', 'live_revision',
+]
+
+
+def add_children(parent, pages):
+    """
+    Insert unsaved pages as the last children of parent, live and in order.
+
+    Paths for the whole batch are allocated from the parent's last child,
+    so call this inside a transaction; the parent row is locked for it.
+    Callers set title, slug and the model's own fields; tree fields,
+    url_path, draft_title, content_type and locale are filled in here.
+    Pages must all be of one model.
+    """
+    if not pages:
+        return pages
+    model = type(pages[0])
+    parent = Page.objects.select_for_update().get(pk=parent.pk)
+    last_child = parent.get_last_child()
+    position = last_child._get_lastpos_in_path() if last_child else 0
+    content_type = ContentType.objects.get_for_model(model)
+
+    for offset, page in enumerate(pages, start=1):
+        page.path = Page._get_path(parent.path, parent.depth + 1, position + offset)
+        page.depth = parent.depth + 1
+        page.numchild = 0
+        page.url_path = f'{parent.url_path}{page.slug}/'
+        page.draft_title = page.title
+        page.content_type = content_type
+        page.locale_id = parent.locale_id
+        page.live = True
+        page.has_unpublished_changes = False
+
+    # Multi-table inheritance rules out bulk_create on the page model, so
+    # insert the wagtailcore_page rows, then the model's own table
+    base_fields = [field for field in Page._meta.concrete_fields if not field.primary_key]
+    bases = Page.objects.bulk_create(
+        [Page(**{field.attname: getattr(page, field.attname) for field in base_fields}) for page in pages]
+    )
+    for page, base in zip(pages, bases):
+        page.id = page.page_ptr_id = base.pk
+    local_fields = model._meta.local_concrete_fields
+    step = connection.ops.bulk_batch_size(local_fields, pages)
+    for start in range(0, len(pages), step):
+        model._base_manager._insert(pages[start:start + step], fields=local_fields, raw=True)
+
+    Page.objects.filter(pk=parent.pk).update(numchild=F('numchild') + len(pages))
+    return pages
+
+
+def publish_revisions(pages, user=None):
+    """
+    Record the pages' current content as a published revision each, as
+    save_revision().publish() would, with one bulk insert for the revisions.
+    """
+    if not pages:
+        return
+    now = timezone.now()
+    base_content_type = ContentType.objects.get_for_model(Page)
+    revisions = Revision.objects.bulk_create([
+        Revision(
+            content_type_id=page.content_type_id,
+            base_content_type=base_content_type,
+            object_id=str(page.pk),
+            created_at=now,
+            user=user,
+            content=page.serializable_data(),
+            object_str=str(page),
+        )
+        for page in pages
+    ])
+    for page, revision in zip(pages, revisions):
+        page.live = True
+        page.has_unpublished_changes = False
+        page.first_published_at = page.first_published_at or now
+        page.last_published_at = now
+        page.latest_revision = page.live_revision = revision
+        page.latest_revision_created_at = now
+        # Row by row: bulk_update's CASE expressions cost more than the updates
+        Page.objects.filter(pk=page.pk).update(**{field: getattr(page, field) for field in PUBLISH_FIELDS})
+
+
+def index_pages(model, pages, batch_size=1000):
+    """Add or update pages in every auto-updated search backend, in batches"""
+    pages = list(pages)
+    for backend in get_search_backends(with_auto_update=True):
+        for start in range(0, len(pages), batch_size):
+            backend.add_bulk(model, pages[start:start + batch_size])
+
+
+def discard_stored(page_ids):
+    """Delete stored renderings and payloads, so they are rebuilt from the pages as they are now"""
+    page_ids = list(page_ids)
+    for start in range(0, len(page_ids), 5000):
+        chunk = page_ids[start:start + 5000]
+        RenderedPage.objects.filter(page_id__in=chunk).delete()
+        DetailPayload.objects.filter(page_id__in=chunk).delete()
@@ -0,0 +1,47 @@
+"""
+Sparse fieldsets for the custom API views.
+
+`?fields=title,image` limits a response to the named keys (`id` and `slug`
+are always included). Views describe which large columns each output key
+reads, so the columns behind keys that were not asked for - RichText
+bodies, summaries - are deferred and never loaded from the database.
+"""
+ALWAYS_INCLUDED = ('id', 'slug')
+
+
+def requested_fields(request):
+    """Parse ?fields= into a set of keys, or None when every key is wanted"""
+    raw = request.GET.get('fields', '')
+    names = {name.strip() for name in raw.split(',') if name.strip()}
+    if not names:
+        return None
+    return names | set(ALWAYS_INCLUDED)
+
+
+def wants(fields, name):
+    return fields is None or name in fields
+
+
+def sparse(data, fields):
+    """Drop the keys of a serialized item that were not requested"""
+    if fields is None:
+        return data
+    return {key: value for key, value in data.items() if key in fields}
+
+
+def defer_unrequested(queryset, fields, sources):
+    """
+    Defer the columns only needed by keys that were not requested.
+
+    `sources` maps output keys to the model columns they read, e.g.
+    {'body': ('body', 'body_hi')}. Only large columns need to be listed.
+    """
+    if fields is None:
+        return queryset
+    needed = {column for name in fields for column in sources.get(name, ())}
+    deferred = {
+        column
+        for name, columns in sources.items() if name not in fields
+        for column in columns
+    } - needed
+    return queryset.defer(*deferred) if deferred else queryset
@@ -0,0 +1,167 @@
+"""
+Per-request query instrumentation for the API.
+
+`QueryInstrumentationMiddleware` counts the queries a request runs and the
+time spent in the database, and adds a Server-Timing header breaking the
+request down into db, serialize (OrjsonResponse encoding) and total time:
+
+    Server-Timing: db;dur=12.4;desc="9 queries", serialize;dur=0.8, total;dur=31.0
+
+Requests over any of the SLOW_REQUEST_* thresholds are logged as a warning
+with the SQL run most often - repeated fingerprints are what an N+1 looks
+like - and the slowest individual queries.
+
+Settings:
+
+    QUERY_INSTRUMENTATION_ENABLED      off by default
+    QUERY_INSTRUMENTATION_SAMPLE_RATE  share of requests instrumented (0-1)
+    QUERY_INSTRUMENTATION_PATHS        path prefixes covered, ['/api/']
+    SLOW_REQUEST_QUERIES               flag requests running more queries
+    SLOW_REQUEST_DB_MS                 ... or spending longer in the database
+    SLOW_REQUEST_MS                    ... or taking longer overall
+    SLOW_QUERY_MS                      single queries worth listing
+
+Requests that are not sampled cost one random() call. Sampled requests
+keep a count per distinct SQL string (Django passes SQL with placeholders,
+so these are few); normalising them into fingerprints only happens for
+flagged requests.
+"""
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+TOP_FINGERPRINTS = 5
+
+_current = ContextVar('query_instrumentation', default=None)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*%s(?:\s*,\s*%s)+\s*\)')
+_SPACE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """SQL with literals and IN-list lengths normalised away"""
+    sql = _STRING.sub('%s', sql)
+    sql = _NUMBER.sub('%s', sql)
+    sql = _PLACEHOLDER_LIST.sub('(...)', sql)
+    return _SPACE.sub(' ', sql.replace('%s', '?')).strip()
+
+
+class RequestTimings:
+    """What one sampled request did in the database and the serializer"""
+
+    def __init__(self, slow_query_ms=100):
+        self.slow_query_ms = slow_query_ms
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.statements = Counter()
+        self.slow_queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        """Database execute wrapper (see connection.execute_wrapper)"""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.queries += 1
+            self.db_seconds += elapsed
+            self.statements[sql] += 1
+            if elapsed * 1000 >= self.slow_query_ms:
+                self.slow_queries.append((elapsed, sql))
+
+    def top_fingerprints(self, limit=TOP_FINGERPRINTS):
+        counts = Counter()
+        for sql, count in self.statements.items():
+            counts[fingerprint(sql)] += count
+        return counts.most_common(limit)
+
+    def server_timing(self, total_seconds):
+        return (
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries", '
+            f'serialize;dur={self.serialize_seconds * 1000:.1f}, '
+            f'total;dur={total_seconds * 1000:.1f}'
+        )
+
+
+@contextmanager
+def serializing():
+    """Count the enclosed block as serialization time for the current request"""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.serialize_seconds += time.perf_counter() - started
+
+
+class QueryInstrumentationMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'QUERY_INSTRUMENTATION_ENABLED', False)
+        self.sample_rate = getattr(settings, 'QUERY_INSTRUMENTATION_SAMPLE_RATE', 1.0)
+        self.paths = tuple(getattr(settings, 'QUERY_INSTRUMENTATION_PATHS', ['/api/']))
+        self.slow_queries = getattr(settings, 'SLOW_REQUEST_QUERIES', 50)
+        self.slow_db_ms = getattr(settings, 'SLOW_REQUEST_DB_MS', 200)
+        self.slow_ms = getattr(settings, 'SLOW_REQUEST_MS', 1000)
+        self.slow_query_ms = getattr(settings, 'SLOW_QUERY_MS', 100)
+
+    def _sampled(self, request):
+        if not self.enabled or not request.path.startswith(self.paths):
+            return False
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if not self._sampled(request):
+            return self.get_response(request)
+
+        timings = RequestTimings(self.slow_query_ms)
+        token = _current.set(timings)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - started
+
+        response['Server-Timing'] = timings.server_timing(total)
+        if self._is_slow(timings, total):
+            self._report(request, response, timings, total)
+        return response
+
+    def _is_slow(self, timings, total):
+        return (
+            timings.queries > self.slow_queries
+            or timings.db_seconds * 1000 > self.slow_db_ms
+            or total * 1000 > self.slow_ms
+        )
+
+    def _report(self, request, response, timings, total):
+        lines = [
+            f"Slow request {request.method} {request.path} -> {response.status_code}: "
+            f"{timings.queries} queries, {timings.db_seconds * 1000:.1f}ms db, "
+            f"{timings.serialize_seconds * 1000:.1f}ms serialize, {total * 1000:.1f}ms total"
+        ]
+        for sql, count in timings.top_fingerprints():
+            if count > 1:
+                lines.append(f"  {count}x {sql[:500]}")
+        for elapsed, sql in sorted(timings.slow_queries, reverse=True)[:TOP_FINGERPRINTS]:
+            lines.append(f"  slow {elapsed * 1000:.1f}ms {fingerprint(sql)[:500]}")
+        logger.warning('\n'.join(lines))
@@ -0,0 +1,52 @@
+"""
+Listing querysets for index pages and cards.
+
+Listing endpoints only print a title, slug and a few card fields, but a
+plain `Model.objects.live()` loads every RichText section (and its Hindi
+copy) of every row. `listing_queryset` loads the page columns cards need
+plus the model's `listing_fields`, nothing else. Card images and their
+renditions are prefetched in bulk.
+
+benchmarks/listing_memory.py measures the difference.
+"""
+from django.db.models import Prefetch
+from wagtail.images import get_image_model
+
+# wagtailcore_page columns used by cards, URLs and the live() filter
+PAGE_LISTING_FIELDS = [
+    'title',
+    'slug',
+    'url_path',
+    'first_published_at',
+    'last_published_at',
+    'live_revision_id',
+]
+
+
+def listing_only(model):
+    return [*PAGE_LISTING_FIELDS, *getattr(model, 'listing_fields', [])]
+
+
+def with_card_images(queryset, *filter_specs):
+    """Prefetch page images together with the given renditions"""
+    images = get_image_model().objects.prefetch_renditions(*filter_specs)
+    return queryset.prefetch_related(Prefetch('image', queryset=images))
+
+
+def listing_queryset(model, rendition=None):
+    """
+    Live pages of `model` with only the listing columns loaded.
+
+    Related card fields in `listing_fields` (e.g. a category) are joined;
+    when `rendition` is given, images are prefetched with that rendition.
+    """
+    related = [
+        name for name in getattr(model, 'listing_fields', [])
+        if name != 'image' and getattr(model._meta.get_field(name), 'many_to_one', False)
+    ]
+    queryset = model.objects.live().only(*listing_only(model))
+    if related:
+        queryset = queryset.select_related(*related)
+    if rendition:
+        queryset = with_card_images(queryset, rendition)
+    return queryset
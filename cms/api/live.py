@@ -0,0 +1,131 @@
+"""
+Publish events for the gateway's live channel.
+
+When a NewsPage or ArticlePage is published or unpublished, a compact delta
+(id, slug, type and the card fields the listings return) is POSTed to the
+gateway's internal events endpoint (LIVE_EVENTS_URL), which pushes it to
+the Socket.IO rooms clients subscribe to instead of polling news/latest.
+
+Events are queued once the publish transaction commits and sent by a
+background thread, so publishing never waits on the gateway. A batch the
+gateway does not accept is retried a few times and then dropped: clients
+still load the listings when they navigate.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from urllib.parse import urljoin
+
+import requests
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+SEND_ATTEMPTS = 3
+
+
+def card(page, page_type):
+    """The delta for a published page: the fields its listing cards show"""
+    delta = {
+        'event': 'published',
+        'type': page_type,
+        'id': page.id,
+        'slug': page.slug,
+        'title': page.title,
+        'summary': page.summary,
+        'image': urljoin(settings.BASE_URL, page.image.get_rendition('fill-800x500').url) if page.image else None,
+        'category': {
+            'name': page.category.name,
+            'slug': page.category.slug,
+        } if page.category else None,
+        'publish_date': page.first_published_at.isoformat() if page.first_published_at else None,
+    }
+    if page_type == 'news':
+        delta['subtitle'] = page.subtitle
+        delta['featured'] = page.featured
+    return delta
+
+
+class LiveEvents:
+    def __init__(self):
+        self._queue = deque()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._session = requests.Session()
+
+    @property
+    def enabled(self):
+        return bool(getattr(settings, 'LIVE_EVENTS_URL', ''))
+
+    def page_changed(self, page, page_type, event):
+        """Queue an event for a page once the current transaction commits"""
+        if not self.enabled:
+            return
+        transaction.on_commit(lambda: self._push((page.pk, page_type, event, page.slug)))
+
+    def _push(self, item):
+        self._queue.append(item)
+        if self._thread is None:
+            self._start()
+        self._wakeup.set()
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='live-events', daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        items = []
+        while self._queue:
+            items.append(self._queue.popleft())
+        if not items:
+            return
+        close_old_connections()
+        try:
+            events = [self._delta(*item) for item in items]
+        finally:
+            close_old_connections()
+        self._send(events)
+
+    def _delta(self, page_id, page_type, event, slug):
+        from articles.models import ArticlePage
+        from news.models import NewsPage
+
+        if event == 'published':
+            model = NewsPage if page_type == 'news' else ArticlePage
+            page = model.objects.live().select_related('image', 'category').filter(pk=page_id).first()
+            if page is not None:
+                return card(page, page_type)
+        # Unpublished, or unpublished again before the event was sent
+        return {'event': 'unpublished', 'type': page_type, 'id': page_id, 'slug': slug}
+
+    def _send(self, events):
+        headers = {'X-Events-Token': settings.LIVE_EVENTS_TOKEN} if settings.LIVE_EVENTS_TOKEN else {}
+        for attempt in range(1, SEND_ATTEMPTS + 1):
+            try:
+                response = self._session.post(
+                    settings.LIVE_EVENTS_URL, json=events, headers=headers, timeout=settings.LIVE_EVENTS_TIMEOUT,
+                )
+                if response.status_code < 300:
+                    return
+                error = f'status {response.status_code}'
+            except requests.RequestException as e:
+                error = str(e)
+            if attempt < SEND_ATTEMPTS:
+                time.sleep(0.2 * 2 ** attempt)
+        logger.warning(f'Dropped {len(events)} live events: the gateway did not accept them ({error})')
+
+
+live_events = LiveEvents()
@@ -0,0 +1,52 @@
+"""
+Locales served by the API.
+
+Content models keep translations next to the English field as
+`<field>_<locale>` (e.g. `summary_hi`). A translation that is empty falls
+back to the English value. Views read the locale once with
+`request_locale` and everything downstream - stored HTML, detail payloads,
+caches - is keyed on that normalized code.
+"""
+from django.conf import settings
+
+DEFAULT_LOCALE = 'en'
+
+
+def locales():
+    return [code for code, _name in settings.LANGUAGES]
+
+
+def normalize_locale(lang):
+    """Map 'hi', 'HI' or 'hi-IN' to 'hi'; anything unsupported to the default"""
+    code = str(lang or '').strip().lower().replace('_', '-').split('-')[0]
+    return code if code in locales() else DEFAULT_LOCALE
+
+
+def request_locale(request):
+    return normalize_locale(request.GET.get('lang'))
+
+
+def translated(obj, name, lang):
+    """Value of `name` in `lang`, or the English value when the translation is empty"""
+    if lang != DEFAULT_LOCALE:
+        value = getattr(obj, f'{name}_{lang}', None)
+        if value:
+            return value
+    return getattr(obj, name)
+
+
+def resolve(values, lang):
+    """
+    Collapse {name: value, name_hi: value, ...} into {name: value in lang}.
+
+    Translation keys are dropped, so the result has the same keys for every
+    locale.
+    """
+    suffixes = tuple(f'_{code}' for code in locales() if code != DEFAULT_LOCALE)
+    resolved = {}
+    for name, value in values.items():
+        if name.endswith(suffixes) and name.rsplit('_', 1)[0] in values:
+            continue
+        translation = values.get(f'{name}_{lang}') if lang != DEFAULT_LOCALE else None
+        resolved[name] = translation or value
+    return resolved
@@ -0,0 +1,259 @@
+import io
+import random
+from datetime import datetime, timedelta, timezone
+
+from django.core.files.images import ImageFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+from taggit.managers import TaggableManager
+from taggit.models import Tag
+from wagtail.fields import RichTextField
+from wagtail.images import get_image_model
+from wagtail.models import Page
+
+from api.bulk import add_children, index_pages
+from articles.models import ArticleIndexPage, ArticlePage
+from conditions.models import ConditionIndexPage, ConditionPage
+from drugs.models import DrugIndexPage, DrugPage
+from news.models import NewsIndexPage, NewsPage
+from remedies.models import RemedyIndexPage, RemedyPage
+from social_media.models import SocialMediaIndexPage, SocialMediaPost, VideoIndexPage, VideoPage
+
+# Page type -> (page model, index page model)
+CONTENT_TYPES = {
+    'news': (NewsPage, NewsIndexPage),
+    'articles': (ArticlePage, ArticleIndexPage),
+    'conditions': (ConditionPage, ConditionIndexPage),
+    'drugs': (DrugPage, DrugIndexPage),
+    'remedies': (RemedyPage, RemedyIndexPage),
+    'videos': (VideoPage, VideoIndexPage),
+    'social': (SocialMediaPost, SocialMediaIndexPage),
+}
+
+WORDS = (
+    'health heart sleep blood pressure diet fitness stress immune vitamin therapy chronic '
+    'pain skin liver kidney lung brain memory mood anxiety diabetes insulin cholesterol '
+    'infection fever allergy asthma joint bone muscle hormone thyroid digestion gut '
+    'screening prevention recovery treatment symptom dose risk study trial research'
+).split()
+
+HINDI_WORDS = 'स्वास्थ्य हृदय नींद रक्त आहार तनाव दवा उपचार लक्षण जोखिम रोग शरीर विटामिन दर्द त्वचा'.split()
+
+# Publish dates count back from here, so a seed always gives the same corpus
+BASE_DATE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+# Related objects shared by the generated pages
+POOL_SIZE = 12
+IMAGE_POOL_SIZE = 24
+TAGS_PER_PAGE = 3
+
+
+class Text:
+    """Deterministic filler text"""
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def words(self, low, high, vocabulary=WORDS):
+        return ' '.join(self.rng.choices(vocabulary, k=self.rng.randint(low, high)))
+
+    def html(self, low, high, hindi=False):
+        vocabulary = HINDI_WORDS if hindi else WORDS
+        return ''.join(
+            f'<h2>{self.words(2, 5, vocabulary).title()}</h2><p>{self.words(40, 120, vocabulary)}.</p>'
+            for _ in range(self.rng.randint(low, high))
+        )
+
+
+class Command(BaseCommand):
+    help = 'Bulk-create a synthetic, deterministic content corpus for benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, required=True, help='Pages per type, e.g. 10000 or 100000')
+        parser.add_argument(
+            '--types', default=','.join(CONTENT_TYPES),
+            help=f"Comma-separated page types (default: all of {', '.join(CONTENT_TYPES)})",
+        )
+        parser.add_argument('--seed', type=int, default=42, help='The same seed and count give the same corpus')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Pages inserted per transaction')
+        parser.add_argument('--no-index', action='store_true', help='Skip adding the pages to the search index')
+
+    def handle(self, *args, **options):
+        types = [name.strip() for name in options['types'].split(',') if name.strip()]
+        unknown = set(types) - set(CONTENT_TYPES)
+        if unknown:
+            raise CommandError(f"Unknown page types: {', '.join(sorted(unknown))}")
+
+        self.seed = options['seed']
+        self.images = self._image_pool()
+        for name in types:
+            self.seed_type(name, options['count'], options['batch_size'], not options['no_index'])
+        self.stdout.write(self.style.SUCCESS('Successfully seeded content'))
+
+    def seed_type(self, name, count, batch_size, index):
+        """
+        Top up `name` to `count` pages slugged bench-<name>-<n>, numbered
+        from however many exist, so pages made by hand are never counted.
+        Each page's content comes from a Random seeded with (seed, type, n),
+        so it does not depend on batch sizes or on how many runs built the
+        corpus.
+        """
+        model, index_model = CONTENT_TYPES[name]
+        parent = self._index_page(name, index_model)
+        existing = model.objects.child_of(parent).filter(slug__startswith=f'bench-{name}-').count()
+        if existing >= count:
+            self.stdout.write(f'{name}: {existing} pages already')
+            return
+
+        pools = self._related_pools(model)
+        started = datetime.now()
+        for start in range(existing, count, batch_size):
+            numbers = range(start, min(start + batch_size, count))
+            with transaction.atomic():
+                pages = self._insert_pages(name, model, parent, numbers, pools)
+            if index:
+                index_pages(model, pages)
+            self.stdout.write(f'{name}: {numbers[-1] + 1}/{count} ({(datetime.now() - started).total_seconds():.0f}s)')
+
+    def _index_page(self, name, index_model):
+        parent = index_model.objects.first()
+        if parent is None:
+            parent = index_model(title=f'All {name.title()}', slug=f'all-{name}')
+            Page.objects.get(depth=2, slug='home').add_child(instance=parent)
+        return parent
+
+    def _insert_pages(self, name, model, parent, numbers, pools):
+        pages, relations = [], []
+        for number in numbers:
+            rng = random.Random(f'{self.seed}-{model.__name__}-{number}')
+            page = self._build_page(model, rng, number, pools)
+            page.slug = f'bench-{name}-{number}'
+            pages.append(page)
+            relations.append(self._build_relations(model, rng, pools))
+        add_children(parent, pages)
+        self._insert_relations(model, pages, relations)
+        return pages
+
+    def _build_page(self, model, rng, number, pools):
+        text = Text(rng)
+        published = BASE_DATE - timedelta(minutes=number * 7 + rng.randint(0, 6))
+        page = model(
+            title=f'{text.words(3, 7).capitalize()} {number}',
+            seo_title='',
+            search_description=text.words(10, 20),
+            first_published_at=published,
+            last_published_at=published,
+        )
+        for field in model._meta.local_concrete_fields:
+            if field.primary_key:
+                continue
+            setattr(page, field.attname, self._value(field, rng, text, number, published, pools))
+        return page
+
+    def _value(self, field, rng, text, number, published, pools):
+        name = field.name
+        hindi = name.endswith('_hi')
+        if field.is_relation:
+            pool = pools.get(name)
+            return rng.choice(pool) if pool else None
+        if name == 'generic_name':
+            # Unique, as imports deduplicate drugs on it
+            return f'{text.words(1, 2)}-{number}'
+        if 'embed' in name or name == 'slug_hi' or isinstance(field, models.SlugField):
+            return ''
+        if name == 'duration':
+            return f'{rng.randint(1, 59)}:{rng.randint(0, 59):02d}'
+        if isinstance(field, RichTextField):
+            return text.html(1, 3, hindi) if field.blank else text.html(2, 6, hindi)
+        if isinstance(field, models.URLField):
+            return f'https://example.com/{text.words(1, 1)}/{number}'
+        if isinstance(field, models.TextField):
+            return text.words(20, 40, HINDI_WORDS if hindi else WORDS)
+        if isinstance(field, models.CharField):
+            value = text.words(1, 8, HINDI_WORDS if hindi else WORDS)
+            return value[:field.max_length]
+        if isinstance(field, models.BooleanField):
+            return rng.random() < 0.05
+        if isinstance(field, models.DateTimeField):
+            return published
+        if isinstance(field, models.IntegerField):
+            return rng.randint(2, 15) if name == 'reading_time' else rng.randint(0, 50000)
+        return field.get_default()
+
+    def _related_pools(self, model):
+        """Primary keys to draw foreign keys, many-to-many rows and tags from"""
+        pools = {}
+        for field in model._meta.local_concrete_fields:
+            if not field.is_relation or field.primary_key:
+                continue
+            if field.related_model is get_image_model():
+                pools[field.name] = self.images
+            else:
+                pools[field.name] = self._pool(field.related_model)
+        for field in model._meta.local_many_to_many:
+            if isinstance(field, TaggableManager):
+                pools[field.name] = [
+                    Tag.objects.get_or_create(slug=f'bench-{word}', defaults={'name': word})[0].pk
+                    for word in WORDS[:POOL_SIZE * 2]
+                ]
+            else:
+                pools[field.name] = self._pool(field.related_model)
+        return pools
+
+    def _pool(self, related_model):
+        field_names = {field.name for field in related_model._meta.concrete_fields}
+        label = related_model._meta.model_name
+        pool = []
+        for number in range(POOL_SIZE):
+            name = f'{label.title()} {number}'
+            if 'slug' in field_names:
+                obj, _created = related_model.objects.get_or_create(slug=f'bench-{label}-{number}', defaults={'name': name})
+            elif 'name' in field_names:
+                obj, _created = related_model.objects.get_or_create(name=name)
+            else:
+                return []
+            pool.append(obj.pk)
+        return pool
+
+    def _image_pool(self):
+        from PIL import Image as PILImage
+
+        Image = get_image_model()
+        pool = []
+        for number in range(IMAGE_POOL_SIZE):
+            title = f'bench-image-{number}'
+            image = Image.objects.filter(title=title).first()
+            if image is None:
+                rng = random.Random(f'{self.seed}-image-{number}')
+                buffer = io.BytesIO()
+                color = tuple(rng.randint(0, 255) for _ in range(3))
+                PILImage.new('RGB', (800, 450), color).save(buffer, 'JPEG')
+                image = Image.objects.create(title=title, file=ImageFile(buffer, name=f'{title}.jpg'))
+            pool.append(image.pk)
+        return pool
+
+    def _build_relations(self, model, rng, pools):
+        """Many-to-many and tag choices for one page, made before its id is known"""
+        chosen = {}
+        for field in model._meta.local_many_to_many:
+            pool = pools.get(field.name)
+            if pool:
+                size = TAGS_PER_PAGE if isinstance(field, TaggableManager) else rng.randint(1, 2)
+                chosen[field.name] = rng.sample(pool, min(size, len(pool)))
+        return chosen
+
+    def _insert_relations(self, model, pages, relations):
+        for field in model._meta.local_many_to_many:
+            through = field.remote_field.through
+            if isinstance(field, TaggableManager):
+                rows = [
+                    through(content_object_id=page.pk, tag_id=tag)
+                    for page, chosen in zip(pages, relations) for tag in chosen.get(field.name, ())
+                ]
+            else:
+                source, target = f'{field.m2m_field_name()}_id', f'{field.m2m_reverse_field_name()}_id'
+                rows = [
+                    through(**{source: page.pk, target: pk})
+                    for page, chosen in zip(pages, relations) for pk in chosen.get(field.name, ())
+                ]
+            through.objects.bulk_create(rows, batch_size=5000)
@@ -0,0 +1,44 @@
+from django.db import models
+
+
+class RenderedPage(models.Model):
+    """
+    HTML for a page's RichText fields with internal links and embeds
+    expanded, rendered once for the published revision.
+    """
+    page = models.OneToOneField(
+        'wagtailcore.Page',
+        on_delete=models.CASCADE,
+        related_name='+',
+        primary_key=True,
+    )
+    revision_id = models.IntegerField(null=True, blank=True)
+    fields = models.JSONField(default=dict)
+    rendered_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Rendered Page"
+
+
+class DetailPayload(models.Model):
+    """
+    A detail endpoint's JSON body for one page and locale, serialized and
+    compressed once per published revision.
+    """
+    page = models.ForeignKey(
+        'wagtailcore.Page',
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    locale = models.CharField(max_length=10)
+    revision_id = models.IntegerField(null=True, blank=True)
+    body = models.BinaryField()
+    gzip = models.BinaryField()
+    brotli = models.BinaryField(null=True, blank=True)
+    built_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Detail Payload"
+        constraints = [
+            models.UniqueConstraint(fields=['page', 'locale'], name='unique_detail_payload_locale'),
+        ]
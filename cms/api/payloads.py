@@ -0,0 +1,206 @@
+"""
+Precompressed detail payloads.
+
+Condition and drug detail responses are large (several expanded RichText
+sections each) but only change when the page is published. Their JSON is
+built, serialized and compressed once per revision and locale (see
+api.signals), stored in DetailPayload, and served as-is with the encoding
+the client accepts.
+
+Each locale gets its own payload, with empty translations already replaced
+by the English text; a locale whose payload comes out identical to the
+English one reuses the English bytes instead of being compressed again.
+
+Payloads also carry related data: related conditions, drug categories and
+image renditions. When one of those changes, the payloads that show it are
+dropped (see api.signals) and rebuilt on their next request.
+"""
+import gzip
+
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from conditions.models import ConditionPage
+from drugs.models import DrugPage
+
+from .locale import DEFAULT_LOCALE, locales, translated
+from .models import DetailPayload
+from .renderers import dumps
+from .richtext import rendered_html
+
+
+def condition_payload(condition, lang):
+    html = rendered_html(condition, lang)
+    return {
+        'id': condition.id,
+        'name': condition.title,
+        'slug': condition.slug,
+        'subtitle': translated(condition, 'subtitle', lang),
+        'overview': html['overview'],
+        'symptoms': html['symptoms'],
+        'causes': html['causes'],
+        'diagnosis': html['diagnosis'],
+        'treatments': html['treatments'],
+        'prevention': html['prevention'],
+        'complications': html['complications'],
+        'also_known_as': translated(condition, 'also_known_as', lang),
+        'specialties': condition.specialties,
+        'prevalence': condition.prevalence,
+        'risk_factors': html['risk_factors'],
+        'image': condition.image.get_rendition('fill-800x500').url if condition.image else None,
+        'related_conditions': [
+            {
+                'name': rc.related_condition.title,
+                'slug': rc.related_condition.slug,
+            }
+            for rc in condition.related_conditions.all()
+        ],
+    }
+
+
+def drug_payload(drug, lang):
+    html = rendered_html(drug, lang)
+    return {
+        'id': drug.id,
+        'title': drug.title,
+        'slug': drug.slug,
+        'generic_name': drug.generic_name,
+        'brand_names': drug.brand_names,
+        'drug_class': drug.drug_class,
+        'overview': html['overview'],
+        'uses': html['uses'],
+        'dosage': html['dosage'],
+        'side_effects': html['side_effects'],
+        'warnings': html['warnings'],
+        'interactions': html['interactions'],
+        'storage': html['storage'],
+        'pregnancy_category': drug.pregnancy_category,
+        'image': drug.image.get_rendition('fill-800x500').url if drug.image else None,
+        'categories': [{'name': cat.name, 'slug': cat.slug} for cat in drug.categories.all()],
+    }
+
+
+PAYLOAD_BUILDERS = {
+    ConditionPage: condition_payload,
+    DrugPage: drug_payload,
+}
+
+
+def encode_payload(data):
+    """Serialize a payload and return (body, gzip, brotli or None)"""
+    body = dumps(data)
+    # Compression happens once per publish, so use the highest levels
+    return (
+        body,
+        gzip.compress(body, compresslevel=9, mtime=0),
+        brotli.compress(body, quality=11) if brotli is not None else None,
+    )
+
+
+def _save(page_id, lang, revision_id, encoded):
+    body, gzipped, brotlied = encoded
+    DetailPayload.objects.update_or_create(
+        page_id=page_id,
+        locale=lang,
+        defaults={'revision_id': revision_id, 'body': body, 'gzip': gzipped, 'brotli': brotlied},
+    )
+
+
+def store_payloads(page, revision_id=None):
+    """Build and store the payload of a specific page for every locale"""
+    builder = PAYLOAD_BUILDERS.get(type(page))
+    if builder is None:
+        return
+    default = builder(page, DEFAULT_LOCALE)
+    default_encoded = encode_payload(default)
+    for lang in locales():
+        if lang == DEFAULT_LOCALE:
+            encoded = default_encoded
+        else:
+            data = builder(page, lang)
+            encoded = default_encoded if data == default else encode_payload(data)
+        _save(page.pk, lang, revision_id, encoded)
+
+
+def purge_payloads(page_ids):
+    """Drop the stored payloads of these pages, to be rebuilt when next requested"""
+    page_ids = list(page_ids)
+    if page_ids:
+        DetailPayload.objects.filter(page_id__in=page_ids).delete()
+
+
+def get_payload(model, page_id, revision_id, lang):
+    """
+    Return (body, gzip, brotli) for a live page, building and storing it if
+    the stored copy is missing or belongs to an older revision. Pages
+    without a live revision are built on every call.
+    """
+    if revision_id is not None:
+        stored = (
+            DetailPayload.objects
+            .filter(page_id=page_id, locale=lang, revision_id=revision_id)
+            .values_list('body', 'gzip', 'brotli')
+            .first()
+        )
+        if stored is not None:
+            return tuple(bytes(part) if part is not None else None for part in stored)
+
+    page = model.objects.get(pk=page_id)
+    encoded = encode_payload(PAYLOAD_BUILDERS[model](page, lang))
+    if revision_id is not None:
+        try:
+            # In a savepoint, so losing the race leaves an outer transaction usable
+            with transaction.atomic():
+                _save(page_id, lang, revision_id, encoded)
+        except IntegrityError:
+            # Concurrent first reads: another request stored this payload first
+            pass
+    return encoded
+
+
+def accepted_encodings(request):
+    """Parse Accept-Encoding into {coding: q}"""
+    accepted = {}
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def payload_response(request, payload, status=200, lang=None):
+    """Serve a stored payload in the best encoding the client accepts"""
+    body, gzipped, brotlied = payload
+    accepted = accepted_encodings(request)
+    wildcard = accepted.get('*', 0)
+
+    encoding = None
+    if brotlied is not None and accepted.get('br', wildcard) > 0:
+        encoding, content = 'br', brotlied
+    elif accepted.get('gzip', wildcard) > 0:
+        encoding, content = 'gzip', gzipped
+    else:
+        content = body
+
+    response = HttpResponse(content, content_type='application/json', status=status)
+    if lang:
+        response['Content-Language'] = lang
+    if encoding:
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
@@ -0,0 +1,55 @@
+"""
+JSON rendering for the custom API views.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Either way the output matches what Django's JsonResponse
+produces for the same data: datetimes, dates, times, decimals and lazy
+translation strings go through DjangoJSONEncoder.
+"""
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+from .instrumentation import serializing
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_encoder = DjangoJSONEncoder()
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def dumps(data):
+        """Serialize data to UTF-8 JSON bytes"""
+        return orjson.dumps(data, default=_encoder.default, option=_OPTIONS)
+
+    loads = orjson.loads
+else:
+    def dumps(data):
+        """Serialize data to UTF-8 JSON bytes"""
+        return json.dumps(data, cls=DjangoJSONEncoder).encode('utf-8')
+
+    loads = json.loads
+
+
+class OrjsonResponse(HttpResponse):
+    """
+    Drop-in replacement for JsonResponse backed by `dumps`.
+
+    As with JsonResponse, only dicts are accepted unless `safe` is False.
+    """
+
+    def __init__(self, data, safe=True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError(
+                'In order to allow non-dict objects to be serialized set the '
+                'safe parameter to False.'
+            )
+        kwargs.setdefault('content_type', 'application/json')
+        with serializing():
+            content = dumps(data)
+        super().__init__(content=content, **kwargs)
@@ -0,0 +1,125 @@
+"""
+Rendered RichText for API responses.
+
+RichText is stored in Wagtail's database format, where internal links and
+embeds are placeholders. Expanding them means parsing the HTML and looking
+up the linked objects, so it happens once when a page is published (see
+api.signals) and the result is stored per revision in RenderedPage. Views
+read the stored HTML with a single query.
+
+The stored HTML is resolved per locale at render time: {locale: {field:
+HTML}}, where an empty Hindi section already holds the English HTML, so
+views index straight into the locale they serve.
+"""
+from functools import lru_cache
+
+from django.db import IntegrityError, transaction
+from wagtail.fields import RichTextField
+from wagtail.rich_text import expand_db_html
+
+from .locale import DEFAULT_LOCALE, locales, resolve
+from .models import RenderedPage
+
+
+@lru_cache(maxsize=None)
+def richtext_fields(model):
+    """Names of the RichText fields declared on a page model"""
+    return tuple(
+        field.name for field in model._meta.get_fields()
+        if isinstance(field, RichTextField)
+    )
+
+
+@lru_cache(maxsize=None)
+def served_richtext_fields(model):
+    """RichText field names as served, without their translations"""
+    return tuple(resolve(dict.fromkeys(richtext_fields(model), ''), DEFAULT_LOCALE))
+
+
+def render_page(page):
+    """Expand every RichText field of a specific page instance, per locale"""
+    names = richtext_fields(type(page))
+    # Listing querysets defer these columns; load them in one query, not one each
+    deferred = page.get_deferred_fields() & set(names)
+    if deferred:
+        page.refresh_from_db(fields=list(deferred))
+    expanded = {name: expand_db_html(getattr(page, name) or '') for name in names}
+    return {lang: resolve(expanded, lang) for lang in locales()}
+
+
+def _complete(fields, model):
+    """Whether a stored copy has every locale and every field of the model"""
+    served = set(served_richtext_fields(model))
+    return all(fields.get(lang, {}).keys() >= served for lang in locales())
+
+
+def _save(page_id, revision_id, fields):
+    RenderedPage.objects.update_or_create(
+        page_id=page_id,
+        defaults={'revision_id': revision_id, 'fields': fields},
+    )
+
+
+def store_rendered(page, revision_id=None):
+    """Render a page and save the HTML against the given revision"""
+    fields = render_page(page)
+    _save(page.pk, revision_id, fields)
+    return fields
+
+
+def rendered_html(page, lang=DEFAULT_LOCALE):
+    """
+    Return {field name: expanded HTML in `lang`} for a page's live revision.
+
+    Falls back to rendering (and storing) when nothing has been stored yet,
+    or the stored copy belongs to an older revision or predates a field.
+    Pages that were never published through a revision (e.g. created by a
+    script) are rendered on every call, since there is nothing to key the
+    stored copy on.
+    """
+    revision_id = page.live_revision_id
+    if revision_id is None:
+        return render_page(page)[lang]
+    stored = RenderedPage.objects.filter(page_id=page.pk).values_list('revision_id', 'fields').first()
+    if stored is not None and stored[0] == revision_id and _complete(stored[1], type(page)):
+        return stored[1][lang]
+
+    fields = render_page(page)
+    try:
+        # In a savepoint, so losing the race leaves an outer transaction usable
+        with transaction.atomic():
+            _save(page.pk, revision_id, fields)
+    except IntegrityError:
+        # Concurrent first reads: another request stored this revision's HTML first
+        pass
+    return fields[lang]
+
+
+def rendered_html_many(pages, lang=DEFAULT_LOCALE):
+    """
+    rendered_html for several pages, reading the stored copies in one query.
+    Returns {page id: {field name: HTML in `lang`}}.
+    """
+    pages = list(pages)
+    if not pages:
+        return {}
+    stored = {
+        page_id: (revision_id, fields)
+        for page_id, revision_id, fields in RenderedPage.objects
+        .filter(page_id__in=[page.pk for page in pages])
+        .values_list('page_id', 'revision_id', 'fields')
+    }
+
+    result = {}
+    for page in pages:
+        revision_id, fields = stored.get(page.pk, (None, None))
+        if (
+            page.live_revision_id is None
+            or revision_id != page.live_revision_id
+            or not _complete(fields, type(page))
+        ):
+            result[page.pk] = rendered_html(page, lang)
+        else:
+            result[page.pk] = fields[lang]
+    return result
+
@@ -0,0 +1,75 @@
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.dispatch import receiver
+
+from wagtail.images import get_image_model
+from wagtail.signals import page_published, page_unpublished
+
+from articles.models import ArticlePage
+from conditions.models import ConditionPage, RelatedConditionsOrderable
+from drugs.models import DrugCategory, DrugPage
+from news.models import NewsPage
+
+from .live import live_events
+from .payloads import PAYLOAD_BUILDERS, purge_payloads, store_payloads
+from .richtext import store_rendered
+
+# Page models with live publish events -> their type in the events
+LIVE_TYPES = {NewsPage: 'news', ArticlePage: 'article'}
+
+
+@receiver(page_published)
+def render_published_page(sender, instance, revision=None, **kwargs):
+    """Expand the page's RichText and build its detail payloads once, at publish time"""
+    page = instance.specific
+    revision_id = revision.pk if revision else page.live_revision_id
+    store_rendered(page, revision_id)
+    store_payloads(page, revision_id)
+
+
+@receiver(page_published, sender=ConditionPage)
+@receiver(page_unpublished, sender=ConditionPage)
+@receiver(pre_delete, sender=ConditionPage)
+def purge_linking_conditions(sender, instance, **kwargs):
+    """Condition payloads list their related conditions' titles and slugs"""
+    purge_payloads(
+        RelatedConditionsOrderable.objects.filter(related_condition=instance).values_list('page_id', flat=True)
+    )
+
+
+@receiver(post_save, sender=DrugCategory)
+@receiver(pre_delete, sender=DrugCategory)
+def purge_category_drugs(sender, instance, **kwargs):
+    purge_payloads(DrugPage.objects.filter(categories=instance).values_list('pk', flat=True))
+
+
+@receiver(m2m_changed, sender=DrugPage.categories.through)
+def purge_recategorized_drugs(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        purge_payloads([instance.pk])
+    elif action == 'pre_clear':
+        purge_payloads(instance.drugs.values_list('pk', flat=True))
+    else:
+        purge_payloads(pk_set)
+
+
+@receiver(post_save, sender=get_image_model())
+@receiver(pre_delete, sender=get_image_model())
+def purge_image_pages(sender, instance, **kwargs):
+    """Payloads hold the URL of the image's rendition, which changes with the image"""
+    for model in PAYLOAD_BUILDERS:
+        purge_payloads(model.objects.filter(image=instance).values_list('pk', flat=True))
+
+
+@receiver(page_published, sender=NewsPage)
+@receiver(page_published, sender=ArticlePage)
+def push_published_card(sender, instance, **kwargs):
+    """Tell live clients about the new or updated card"""
+    live_events.page_changed(instance, LIVE_TYPES[sender], 'published')
+
+
+@receiver(page_unpublished, sender=NewsPage)
+@receiver(page_unpublished, sender=ArticlePage)
+def push_unpublished_card(sender, instance, **kwargs):
+    live_events.page_changed(instance, LIVE_TYPES[sender], 'unpublished')
@@ -0,0 +1,45 @@
+"""Background tasks for the subscription endpoints (run by `manage.py run_tasks`)"""
+from smtplib import SMTPRecipientsRefused
+
+import requests
+from django.core.mail import EmailMessage, get_connection
+
+from notifications.dispatch import SubscriptionGone, prune, push
+from tasks.queue import PermanentError, task
+
+
+@task('send_email', batch=True)
+def send_email(payloads):
+    """Send a batch of emails over one mail server connection"""
+    results = []
+    with get_connection() as connection:
+        for payload in payloads:
+            message = EmailMessage(payload['subject'], payload['body'], payload.get('from_email'), payload['to'])
+            try:
+                connection.send_messages([message])
+            except SMTPRecipientsRefused as e:
+                results.append(PermanentError(f'recipients refused: {e.recipients}'))
+            except Exception as e:
+                results.append(e)
+            else:
+                results.append(None)
+    return results
+
+
+@task('web_push', batch=True)
+def web_push(payloads):
+    """Send a batch of push notifications, reusing one HTTP session; expired subscriptions are deleted"""
+    results, gone = [], []
+    with requests.Session() as session:
+        for payload in payloads:
+            try:
+                push(payload['subscription'], payload['data'], session)
+            except SubscriptionGone as e:
+                gone.append(payload['subscription']['endpoint'])
+                results.append(PermanentError(f'subscription is gone: {e}'))
+            except Exception as e:
+                results.append(e)
+            else:
+                results.append(None)
+    prune(gone)
+    return results
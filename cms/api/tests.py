@@ -0,0 +1,17 @@
+from django.test import SimpleTestCase
+
+from .batch import parse_items
+
+
+class ParseBatchItemsTests(SimpleTestCase):
+    def test_repeated_identical_items_are_accepted(self):
+        items = [{'type': 'article', 'slug': 'flu'}, {'type': 'article', 'slug': 'flu', 'lang': 'en'}]
+        self.assertEqual(len(parse_items(items)), 2)
+
+    def test_same_slug_in_two_languages_is_rejected(self):
+        with self.assertRaisesMessage(ValueError, 'different lang or fields'):
+            parse_items([{'type': 'article', 'slug': 'flu'}, {'type': 'article', 'slug': 'flu', 'lang': 'hi'}])
+
+    def test_same_slug_of_different_types_is_accepted(self):
+        items = [{'type': 'article', 'slug': 'flu'}, {'type': 'condition', 'slug': 'flu', 'lang': 'hi'}]
+        self.assertEqual(len(parse_items(items)), 2)
@@ -32,6 +32,9 @@ urlpatterns = [
 
     # Well-being
     path('well-being', views.well_being, name='well_being'),
+    # Batch lookup of cards/details by slug
+    path('batch', views.batch, name='batch'),
+    path('batch/', views.batch, name='batch_slash'),
     #Symptom Checker
     path('symptom-checker/', views.symptom_checker, name='symptom_checker'),
     path('notifications/subscribe', views.notification_subscribe, name='notification_subscribe'),
@@ -1,7 +1,8 @@
 import json
-from django.http import JsonResponse
+import time
+from .renderers import OrjsonResponse, loads
 from django.views.decorators.csrf import csrf_exempt
-from django.db.models import Q
+from django.db.models import F, Q
 import logging
 
 from wagtail.models import Page
@@ -10,11 +11,23 @@ from articles.models import ArticlePage, ArticleCategory
 from conditions.models import ConditionPage, ConditionCategory
 from drugs.models import DrugPage
 from news.models import NewsPage
+from search.analytics import search_log
+from .batch import parse_items, resolve_batch
+from .fields import defer_unrequested, requested_fields, sparse, wants
+from .listing import listing_queryset
+from .locale import request_locale, translated
+from .payloads import get_payload, payload_response
+from .richtext import rendered_html, rendered_html_many
 from django.core.paginator import Paginator
 
 
 logger = logging.getLogger(__name__)
 
+# Large columns read by each output key, for ?fields= (see api.fields)
+ARTICLE_CARD_SOURCES = {'summary': ('summary', 'summary_hi'), 'body': ('body', 'body_hi')}
+ARTICLE_DETAIL_SOURCES = {'summary': ('summary', 'summary_hi')}
+NEWS_DETAIL_SOURCES = {'summary': ('summary',)}
+
 
 @csrf_exempt
 def symptom_checker(request):
@@ -35,70 +48,62 @@ def symptom_checker(request):
                 }
             ]
 
-            return JsonResponse({
+            return OrjsonResponse({
                 "conditions": conditions,
                 "disclaimer": "This is for informational purposes only."
             })
         except json.JSONDecodeError as e:
-            return JsonResponse({"error": "Invalid JSON data"}, status=400)
+            return OrjsonResponse({"error": "Invalid JSON data"}, status=400)
         except Exception as e:
-            return JsonResponse({"error": str(e)}, status=500)
-    return JsonResponse({"error": "Method not allowed"}, status=405)
+            return OrjsonResponse({"error": str(e)}, status=500)
+    return OrjsonResponse({"error": "Method not allowed"}, status=405)
+
+
+@csrf_exempt
+def batch(request):
+    """Resolve many {type, slug, lang, fields} items in one request, keyed by slug"""
+    if request.method != 'POST':
+        return OrjsonResponse({"error": "Method not allowed"}, status=405)
+    try:
+        data = json.loads(request.body)
+        items = parse_items(data.get('items') if isinstance(data, dict) else data)
+    except json.JSONDecodeError:
+        return OrjsonResponse({"error": "Invalid JSON data"}, status=400)
+    except ValueError as e:
+        return OrjsonResponse({"error": str(e)}, status=400)
+
+    try:
+        return OrjsonResponse(resolve_batch(items))
+    except Exception as e:
+        logger.error(f"Error resolving batch of {len(items)} items: {e}")
+        return OrjsonResponse({"error": str(e)}, status=500)
 
 def articles_index(request):
-    return JsonResponse({"message": "Articles index working", "routes": [
+    return OrjsonResponse({"message": "Articles index working", "routes": [
         "/api/articles/top-stories/",
         "/api/articles/paths/",
         "/api/articles/<slug>/"
     ]})
 
 
-def articles_top_stories(request):
-    """Get top stories (featured articles)"""
-    try:
-        articles = ArticlePage.objects.live().filter(featured=True).order_by('-first_published_at')[:5]
-
-        response = []
-        for article in articles:
-            article_data = {
-                'id': article.id,
-                'title': article.title,
-                'slug': article.slug,
-                'summary': article.summary,
-                'body': article.body,
-                'image': request.build_absolute_uri(article.image.get_rendition('fill-800x500').url) if article.image else None,
-                'author': {
-                    'name': article.author.name if hasattr(article, 'author') and hasattr(article.author, 'name') else (article.author if isinstance(getattr(article, 'author', ''), str) else 'Health Expert'),
-                    'slug': article.author.slug if hasattr(article, 'author') and hasattr(article.author, 'slug') else '',
-                    'image': article.author.image.get_rendition('fill-100x100').url if hasattr(article, 'author') and hasattr(article.author, 'image') and article.author.image else ''
-                },
-                'category': {
-                    'name': article.category.name,
-                    'slug': article.category.slug,
-                } if article.category else None,
-                'created_at': article.first_published_at,
-                'tags': [tag.name for tag in article.tags.all()],
-            }
-            response.append(article_data)
-
-        return JsonResponse(response, safe=False)
-    except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
 def news_paths(request):
     """Get all news slugs for static path generation"""
     try:
         news = NewsPage.objects.live().values_list('slug', flat=True)
-        return JsonResponse(list(news), safe=False)
+        return OrjsonResponse(list(news), safe=False)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return OrjsonResponse({'error': str(e)}, status=500)
 
 def articles_health_topics(request):
     """Get health topics articles"""
+    fields = requested_fields(request)
     categories = ArticleCategory.objects.all()
     response = []
 
     for category in categories:
-        articles = category.articles.live().order_by('-first_published_at')[:3]
+        articles = defer_unrequested(
+            category.articles.live().defer('body', 'body_hi'), fields, ARTICLE_CARD_SOURCES
+        ).order_by('-first_published_at')[:3]
         if articles:
             category_data = {
                 'name': category.name,
@@ -107,19 +112,20 @@ def articles_health_topics(request):
             }
 
             for article in articles:
-                article_data = {
+                article_data = sparse({
                     'id': article.id,
                     'title': article.title,
                     'slug': article.slug,
-                    'summary': article.summary,
-                    'image': article.image.get_rendition('fill-800x500').url if article.image else None,
+                    # Deferred unless requested, when reading it would cost a query per row
+                    'summary': article.summary if wants(fields, 'summary') else '',
+                    'image': article.image.get_rendition('fill-800x500').url if wants(fields, 'image') and article.image else None,
                     'created_at': article.first_published_at,
-                }
+                }, fields)
                 category_data['articles'].append(article_data)
 
             response.append(category_data)
 
-    return JsonResponse(response, safe=False)
+    return OrjsonResponse(response, safe=False)
 
 
 def articles_paths(request):
@@ -127,10 +133,10 @@ def articles_paths(request):
     try:
         from articles.models import ArticlePage
         articles = ArticlePage.objects.live().values_list('slug', flat=True)
-        return JsonResponse(list(articles), safe=False)
+        return OrjsonResponse(list(articles), safe=False)
     except Exception as e:
         logger.error(f"Error fetching article paths: {str(e)}")
-        return JsonResponse([], safe=False)
+        return OrjsonResponse([], safe=False)
 
 
 from urllib.parse import unquote
@@ -139,29 +145,35 @@ def article_detail(request, slug):
     """Get a single article by its slug"""
     try:
         decoded_slug = unquote(slug.strip('/'))
-        lang = request.GET.get('lang', 'en')
+        lang = request_locale(request)
+        fields = requested_fields(request)
+
+        # The body is served from the stored rendering, so its raw columns are never needed
+        articles = defer_unrequested(
+            ArticlePage.objects.live().defer('body', 'body_hi'), fields, ARTICLE_DETAIL_SOURCES
+        )
 
         # Try to find the article using the appropriate slug field based on language
         if lang == 'hi':
-            article = ArticlePage.objects.live().filter(
+            article = articles.filter(
                 Q(slug_hi=decoded_slug) | Q(slug=decoded_slug)
             ).first()
         else:
-            article = ArticlePage.objects.live().filter(
+            article = articles.filter(
                 Q(slug=decoded_slug) | Q(slug_hi=decoded_slug)
             ).first()
 
         if not article:
-            return JsonResponse({'message': 'Article not found'}, status=404)
+            return OrjsonResponse({'message': 'Article not found'}, status=404)
 
-        article_data = {
+        article_data = sparse({
             'id': article.id,
-            'title': article.title_hi if lang == 'hi' and hasattr(article, 'title_hi') and article.title_hi else article.title,
-            'slug': article.slug_hi if lang == 'hi' and hasattr(article, 'slug_hi') and article.slug_hi else article.slug,
-            'subtitle': article.subtitle_hi if lang == 'hi' and hasattr(article, 'subtitle_hi') and article.subtitle_hi else article.subtitle,
-            'summary': article.summary_hi if lang == 'hi' and hasattr(article, 'summary_hi') and article.summary_hi else article.summary,
-            'body': article.body_hi if lang == 'hi' and hasattr(article, 'body_hi') and article.body_hi else article.body,
-            'image': article.image.get_rendition('fill-800x500').url if article.image else None,
+            'title': translated(article, 'title', lang),
+            'slug': translated(article, 'slug', lang),
+            'subtitle': translated(article, 'subtitle', lang),
+            'summary': translated(article, 'summary', lang) if wants(fields, 'summary') else '',
+            'body': rendered_html(article, lang)['body'] if wants(fields, 'body') else '',
+            'image': article.image.get_rendition('fill-800x500').url if wants(fields, 'image') and article.image else None,
             'author': {
                 'name': article.author.name if hasattr(article, 'author') and hasattr(article.author, 'name') else (article.author if isinstance(getattr(article, 'author', ''), str) else 'Health Expert'),
                 'credentials': article.author.credentials if hasattr(article, 'author') and hasattr(article.author, 'credentials') else '',
@@ -172,18 +184,17 @@ def article_detail(request, slug):
                 'name': article.category.name,
                 'slug': article.category.slug,
             } if article.category else None,
-            'tags': [tag.name for tag in article.tags.all()],
+            'tags': [tag.name for tag in article.tags.all()] if wants(fields, 'tags') else [],
             'published_date': article.first_published_at,
             'updated_date': article.last_published_at if article.first_published_at != article.last_published_at else None,
-        }
+        }, fields)
 
         # Update view count
-        article.view_count += 1
-        article.save()
+        ArticlePage.objects.filter(pk=article.pk).update(view_count=F('view_count') + 1)
 
-        return JsonResponse(article_data)
+        return OrjsonResponse(article_data)
     except ArticlePage.DoesNotExist:
-        return JsonResponse({'message': 'Article not found'}, status=404)
+        return OrjsonResponse({'message': 'Article not found'}, status=404)
 
 
 def article_related(request, slug):
@@ -208,14 +219,14 @@ def article_related(request, slug):
             }
             response.append(article_data)
 
-        return JsonResponse(response, safe=False)
+        return OrjsonResponse(response, safe=False)
     except ArticlePage.DoesNotExist:
-        return JsonResponse([], safe=False)
+        return OrjsonResponse([], safe=False)
 
 
 def conditions_index(request):
     """Retrieve a complete index of all health conditions"""
-    conditions = ConditionPage.objects.live().order_by('title')
+    conditions = listing_queryset(ConditionPage).order_by('title')
 
     response = []
     for condition in conditions:
@@ -227,62 +238,39 @@ def conditions_index(request):
         }
         response.append(condition_data)
 
-    return JsonResponse(response, safe=False)
+    return OrjsonResponse(response, safe=False)
 
 
 def conditions_paths(request):
     """Get all condition slugs for static path generation"""
     conditions = ConditionPage.objects.live().values_list('slug', flat=True)
-    return JsonResponse(list(conditions), safe=False)
+    return OrjsonResponse(list(conditions), safe=False)
 
 
 def condition_detail(request, slug):
     """Get a single condition by its slug"""
     try:
-        condition = ConditionPage.objects.live().get(slug=slug)
-
-        lang = request.GET.get('lang', 'en')
-
-        condition_data = {
-            'id': condition.id,
-            'name': condition.title,
-            'slug': condition.slug,
-            'subtitle': condition.subtitle_hi if lang == 'hi' and hasattr(condition, 'subtitle_hi') and condition.subtitle_hi else condition.subtitle,
-            'overview': condition.overview_hi if lang == 'hi' and hasattr(condition, 'overview_hi') and condition.overview_hi else condition.overview,
-            'symptoms': condition.symptoms_hi if lang == 'hi' and hasattr(condition, 'symptoms_hi') and condition.symptoms_hi else condition.symptoms,
-            'causes': condition.causes_hi if lang == 'hi' and hasattr(condition, 'causes_hi') and condition.causes_hi else condition.causes,
-            'diagnosis': condition.diagnosis_hi if lang == 'hi' and hasattr(condition, 'diagnosis_hi') and condition.diagnosis_hi else condition.diagnosis,
-            'treatments': condition.treatments_hi if lang == 'hi' and hasattr(condition, 'treatments_hi') and condition.treatments_hi else condition.treatments,
-            'prevention': condition.prevention_hi if lang == 'hi' and hasattr(condition, 'prevention_hi') and condition.prevention_hi else condition.prevention,
-            'complications': condition.complications,
-            'also_known_as': condition.also_known_as,
-            'specialties': condition.specialties,
-            'prevalence': condition.prevalence,
-            'risk_factors': condition.risk_factors,
-            'image': condition.image.get_rendition('fill-800x500').url if condition.image else None,
-            'related_conditions': [
-                {
-                    'name': rc.related_condition.title,
-                    'slug': rc.related_condition.slug,
-                }
-                for rc in condition.related_conditions.all()
-            ],
-        }
+        lang = request_locale(request)
+        page_id, revision_id = ConditionPage.objects.live().values_list('pk', 'live_revision_id').get(slug=slug)
+        payload = get_payload(ConditionPage, page_id, revision_id, lang)
 
         # Update view count
-        condition.view_count += 1
-        condition.save()
+        ConditionPage.objects.filter(pk=page_id).update(view_count=F('view_count') + 1)
 
-        return JsonResponse(condition_data)
+        fields = requested_fields(request)
+        if fields is not None:
+            return OrjsonResponse(sparse(loads(payload[0]), fields))
+        return payload_response(request, payload, lang=lang)
     except ConditionPage.DoesNotExist:
-        return JsonResponse({'message': 'Condition not found'}, status=404)
+        return OrjsonResponse({'message': 'Condition not found'}, status=404)
 
 
 def search_articles(request):
     """Search articles by query string"""
+    started = time.perf_counter()
     query = request.GET.get('q', '')
     if not query:
-        return JsonResponse([], safe=False)
+        return OrjsonResponse([], safe=False)
 
     articles = ArticlePage.objects.live().specific().search(query)
 
@@ -298,14 +286,16 @@ def search_articles(request):
         }
         response.append(article_data)
 
-    return JsonResponse(response, safe=False)
+    search_log.record('search_articles', query, request_locale(request), {'articles': len(response)}, started)
+    return OrjsonResponse(response, safe=False)
 
 
 def search_conditions(request):
     """Search conditions by query string"""
+    started = time.perf_counter()
     query = request.GET.get('q', '')
     if not query:
-        return JsonResponse([], safe=False)
+        return OrjsonResponse([], safe=False)
 
     conditions = ConditionPage.objects.live().specific().search(query)
     conditions = [result.specific for result in conditions]
@@ -320,7 +310,8 @@ def search_conditions(request):
         }
         response.append(condition_data)
 
-    return JsonResponse(response, safe=False)
+    search_log.record('search_conditions', query, request_locale(request), {'conditions': len(response)}, started)
+    return OrjsonResponse(response, safe=False)
 
 
 def well_being(request):
@@ -332,7 +323,7 @@ def well_being(request):
 
     featured_articles = articles.filter(featured=True)[:3]
 
-    return JsonResponse({
+    return OrjsonResponse({
         'featured': [{
             'id': article.id,
             'title': article.title,
@@ -350,31 +341,36 @@ def well_being(request):
             'category': article.category.name if article.category else None,
         } for article in articles[:12]]
     })
-from django.http import JsonResponse
-from django.core.mail import send_mail
 from django.conf import settings
-from pywebpush import webpush, WebPushException
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from notifications.dispatch import provider_of
+from notifications.models import NewsletterSubscriber, PushSubscription
+from tasks.queue import enqueue
 import json
 
 def notification_subscribe(request):
     if request.method == 'POST':
         try:
             subscription_info = json.loads(request.body)
-            # Store subscription info in database
-            # Send confirmation push notification
-            try:
-                webpush(
-                    subscription_info=subscription_info,
-                    data="Thanks for subscribing to notifications!",
-                    vapid_private_key=settings.VAPID_PRIVATE_KEY,
-                    vapid_claims={"sub": "mailto:admin@healthinfo.com"}
-                )
-                return JsonResponse({"status": "success"})
-            except WebPushException as e:
-                return JsonResponse({"status": "error", "message": str(e)}, status=500)
+            endpoint = subscription_info.get('endpoint') if isinstance(subscription_info, dict) else None
+            keys = subscription_info.get('keys') if endpoint else None
+            if not endpoint or not isinstance(keys, dict) or not keys.get('p256dh') or not keys.get('auth'):
+                return OrjsonResponse({"status": "error", "message": "Subscription endpoint and keys required"}, status=400)
+            subscription, created = PushSubscription.objects.update_or_create(
+                endpoint=endpoint,
+                defaults={'p256dh': keys['p256dh'], 'auth': keys['auth'], 'provider': provider_of(endpoint)},
+            )
+            # Confirmation push is sent by the task worker (api.tasks)
+            if created:
+                enqueue('web_push', {
+                    'subscription': subscription.subscription_info,
+                    'data': "Thanks for subscribing to notifications!",
+                })
+            return OrjsonResponse({"status": "accepted"}, status=202)
         except json.JSONDecodeError:
-            return JsonResponse({"status": "error", "message": "Invalid JSON"}, status=400)
-    return JsonResponse({"status": "error", "message": "Method not allowed"}, status=405)
+            return OrjsonResponse({"status": "error", "message": "Invalid JSON"}, status=400)
+    return OrjsonResponse({"status": "error", "message": "Method not allowed"}, status=405)
 
 def newsletter_subscribe(request):
     if request.method == 'POST':
@@ -382,26 +378,36 @@ def newsletter_subscribe(request):
             data = json.loads(request.body)
             email = data.get('email')
             if not email:
-                return JsonResponse({"status": "error", "message": "Email required"}, status=400)
-
-            # Store email in database
-            # Send welcome email
-            send_mail(
-                'Welcome to Health Info Newsletter',
-                'Thank you for subscribing to our newsletter!',
-                'noreply@healthinfo.com',
-                [email],
-                fail_silently=False,
-            )
-            return JsonResponse({"status": "success"})
+                return OrjsonResponse({"status": "error", "message": "Email required"}, status=400)
+            email = email.strip().lower()
+            try:
+                validate_email(email)
+            except ValidationError:
+                return OrjsonResponse({"status": "error", "message": "Invalid email"}, status=400)
+
+            subscriber, created = NewsletterSubscriber.objects.get_or_create(email=email)
+            if not created and subscriber.is_active:
+                return OrjsonResponse({"status": "accepted"}, status=202)
+            if not created:
+                subscriber.is_active = True
+                subscriber.unsubscribed_at = None
+                subscriber.save(update_fields=['is_active', 'unsubscribed_at'])
+            # Welcome email is sent by the task worker (api.tasks)
+            enqueue('send_email', {
+                'subject': 'Welcome to Health Info Newsletter',
+                'body': 'Thank you for subscribing to our newsletter!',
+                'from_email': settings.NEWSLETTER_FROM_EMAIL,
+                'to': [email],
+            })
+            return OrjsonResponse({"status": "accepted"}, status=202)
         except json.JSONDecodeError:
-            return JsonResponse({"status": "error", "message": "Invalid JSON"}, status=400)
-    return JsonResponse({"status": "error", "message": "Method not allowed"}, status=405)
+            return OrjsonResponse({"status": "error", "message": "Invalid JSON"}, status=400)
+    return OrjsonResponse({"status": "error", "message": "Method not allowed"}, status=405)
 
 
 def drugs_index(request):
     """Retrieve a listing of all drugs"""
-    drugs = DrugPage.objects.live().order_by('title')
+    drugs = listing_queryset(DrugPage).order_by('title')
 
     response = []
     for drug in drugs:
@@ -416,13 +422,13 @@ def drugs_index(request):
         }
         response.append(drug_data)
 
-    return JsonResponse(response, safe=False)
+    return OrjsonResponse(response, safe=False)
 
 
 def conditions_index(request):
     """Get all conditions for index page"""
     try:
-        conditions = ConditionPage.objects.live().order_by('title')
+        conditions = listing_queryset(ConditionPage).order_by('title')
         data = []
         for condition in conditions:
             data.append({
@@ -431,14 +437,14 @@ def conditions_index(request):
                 'slug': condition.slug,
                 'subtitle': condition.subtitle,
             })
-        return JsonResponse(data, safe=False)
+        return OrjsonResponse(data, safe=False)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return OrjsonResponse({'error': str(e)}, status=500)
 
 def drugs_index(request):
     """Get all drugs for index page"""
     try:
-        drugs = DrugPage.objects.live().order_by('title')
+        drugs = listing_queryset(DrugPage).order_by('title')
         data = []
         for drug in drugs:
             data.append({
@@ -450,53 +456,39 @@ def drugs_index(request):
                 'drug_class': drug.drug_class,
                 'meta': {'slug': drug.slug}
             })
-        return JsonResponse(data, safe=False)
+        return OrjsonResponse(data, safe=False)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return OrjsonResponse({'error': str(e)}, status=500)
 
 def drugs_paths(request):
     """Get all drug slugs for static path generation"""
     drugs = DrugPage.objects.live().values_list('slug', flat=True)
-    return JsonResponse(list(drugs), safe=False)
+    return OrjsonResponse(list(drugs), safe=False)
 
 
 def drug_detail(request, slug):
     """Get a single drug by its slug"""
     try:
-        drug = DrugPage.objects.live().get(slug=slug)
-
-        drug_data = {
-            'id': drug.id,
-            'title': drug.title,
-            'slug': drug.slug,
-            'generic_name': drug.generic_name,
-            'brand_names': drug.brand_names,
-            'drug_class': drug.drug_class,
-            'overview': drug.overview,
-            'uses': drug.uses,
-            'dosage': drug.dosage,
-            'side_effects': drug.side_effects,
-            'warnings': drug.warnings,
-            'interactions': drug.interactions,
-            'storage': drug.storage,
-            'pregnancy_category': drug.pregnancy_category,
-            'image': drug.image.get_rendition('fill-800x500').url if drug.image else None,
-        }
+        lang = request_locale(request)
+        page_id, revision_id = DrugPage.objects.live().values_list('pk', 'live_revision_id').get(slug=slug)
+        payload = get_payload(DrugPage, page_id, revision_id, lang)
 
         # Update view count
-        drug.view_count += 1
-        drug.save()
+        DrugPage.objects.filter(pk=page_id).update(view_count=F('view_count') + 1)
 
-        return JsonResponse(drug_data)
+        fields = requested_fields(request)
+        if fields is not None:
+            return OrjsonResponse(sparse(loads(payload[0]), fields))
+        return payload_response(request, payload, lang=lang)
     except DrugPage.DoesNotExist:
-        return JsonResponse({'message': 'Drug not found'}, status=404)
+        return OrjsonResponse({'message': 'Drug not found'}, status=404)
 
 
 def news_latest(request):
     """Retrieve latest news articles"""
     try:
         limit = int(request.GET.get('limit', 6))
-        news = NewsPage.objects.live().order_by('-first_published_at')[:limit]
+        news = listing_queryset(NewsPage, 'fill-800x500').order_by('-first_published_at')[:limit]
 
         response = []
         for article in news:
@@ -516,15 +508,15 @@ def news_latest(request):
             }
             response.append(article_data)
 
-        return JsonResponse(response, safe=False)
+        return OrjsonResponse(response, safe=False)
     except Exception as e:
-        return JsonResponse({'error': str(e), 'news': []}, status=500)
+        return OrjsonResponse({'error': str(e), 'news': []}, status=500)
 
 
 def news_paths(request):
     """Get all news slugs for static path generation"""
     news = NewsPage.objects.live().values_list('slug', flat=True)
-    return JsonResponse(list(news), safe=False)
+    return OrjsonResponse(list(news), safe=False)
 
 
 def news_related(request, slug):
@@ -556,24 +548,29 @@ def news_related(request, slug):
             }
             response.append(news_data)
 
-        return JsonResponse(response, safe=False)
+        return OrjsonResponse(response, safe=False)
     except NewsPage.DoesNotExist:
-        return JsonResponse([], safe=False)
+        return OrjsonResponse([], safe=False)
 
 
 def news_detail(request, slug):
     """Get a single news article by its slug"""
     try:
-        article = NewsPage.objects.live().get(slug=slug)
-
-        article_data = {
+        fields = requested_fields(request)
+        # The body is served from the stored rendering, so its raw column is never needed
+        article = defer_unrequested(
+            NewsPage.objects.live().defer('body'), fields, NEWS_DETAIL_SOURCES
+        ).get(slug=slug)
+
+        html = rendered_html(article) if wants(fields, 'body') else {}
+        article_data = sparse({
             'id': article.id,
             'title': article.title,
             'slug': article.slug,
             'subtitle': article.subtitle,
-            'summary': article.summary,
-            'body': article.body,
-            'image': article.image.get_rendition('fill-1200x600').url if article.image else None,
+            'summary': article.summary if wants(fields, 'summary') else '',
+            'body': html.get('body', ''),
+            'image': article.image.get_rendition('fill-1200x600').url if wants(fields, 'image') and article.image else None,
             'category': {
                 'name': article.category.name,
                 'slug': article.category.slug,
@@ -581,22 +578,22 @@ def news_detail(request, slug):
             'publish_date': article.first_published_at,
             'source': article.source,
             'featured': article.featured,
-        }
+        }, fields)
 
         # Update view count
-        article.view_count += 1
-        article.save()
+        NewsPage.objects.filter(pk=article.pk).update(view_count=F('view_count') + 1)
 
-        return JsonResponse(article_data)
+        return OrjsonResponse(article_data)
     except NewsPage.DoesNotExist:
-        return JsonResponse({'message': 'News article not found'}, status=404)
+        return OrjsonResponse({'message': 'News article not found'}, status=404)
 
 
 def search_drugs(request):
     """Search drugs by query string"""
+    started = time.perf_counter()
     query = request.GET.get('q', '')
     if not query:
-        return JsonResponse([], safe=False)
+        return OrjsonResponse([], safe=False)
 
     drugs = DrugPage.objects.live().specific().search(query)
 
@@ -612,14 +609,16 @@ def search_drugs(request):
         }
         response.append(drug_data)
 
-    return JsonResponse(response, safe=False)
+    search_log.record('search_drugs', query, request_locale(request), {'drugs': len(response)}, started)
+    return OrjsonResponse(response, safe=False)
 
 
 def search_news(request):
     """Search news by query string"""
+    started = time.perf_counter()
     query = request.GET.get('q', '')
     if not query:
-        return JsonResponse([], safe=False)
+        return OrjsonResponse([], safe=False)
 
     news = NewsPage.objects.live().specific().search(query)
 
@@ -636,7 +635,8 @@ def search_news(request):
         }
         response.append(article_data)
 
-    return JsonResponse(response, safe=False)
+    search_log.record('search_news', query, request_locale(request), {'news': len(response)}, started)
+    return OrjsonResponse(response, safe=False)
 
 
 def remedies_latest(request):
@@ -646,14 +646,20 @@ def remedies_latest(request):
 
         limit = int(request.GET.get('limit', 20))
         remedy_type = request.GET.get('type', 'all')
-        lang = request.GET.get('lang', 'en')
+        lang = request_locale(request)
 
-        remedies = RemedyPage.objects.live().order_by('-first_published_at')
+        remedies = (
+            listing_queryset(RemedyPage, 'fill-800x500')
+            .prefetch_related('categories')
+            .order_by('-first_published_at')
+        )
 
         if remedy_type != 'all':
             remedies = remedies.filter(remedy_type__name__iexact=remedy_type)
 
-        remedies = remedies[:limit]
+        remedies = list(remedies[:limit])
+        # Overviews come from the stored renderings rather than the raw column
+        html = rendered_html_many(remedies, lang)
 
         response = []
         for remedy in remedies:
@@ -663,7 +669,7 @@ def remedies_latest(request):
                 'slug': remedy.slug,
                 'subtitle': remedy.subtitle,
                 'also_known_as': remedy.also_known_as,
-                'overview': remedy.overview,
+                'overview': html[remedy.pk]['overview'],
                 'image': remedy.image.get_rendition('fill-800x500').url if remedy.image else None,
                 'remedy_type': {
                     'name': remedy.remedy_type.name,
@@ -674,10 +680,10 @@ def remedies_latest(request):
             }
             response.append(remedy_data)
 
-        return JsonResponse(response, safe=False)
+        return OrjsonResponse(response, safe=False)
     except Exception as e:
         print(f"Error in remedies_latest: {e}")
-        return JsonResponse({'error': str(e)}, status=500)
+        return OrjsonResponse({'error': str(e)}, status=500)
 
 
 def remedy_detail(request, slug):
@@ -686,21 +692,22 @@ def remedy_detail(request, slug):
         from remedies.models import RemedyPage
 
         remedy = RemedyPage.objects.live().get(slug=slug)
-        lang = request.GET.get('lang', 'en')
+        lang = request_locale(request)
 
+        html = rendered_html(remedy, lang)
         remedy_data = {
             'id': remedy.id,
             'title': remedy.title,
             'slug': remedy.slug,
             'subtitle': remedy.subtitle,
             'also_known_as': remedy.also_known_as,
-            'overview': remedy.overview,
-            'uses': remedy.uses,
-            'dosage': remedy.dosage,
-            'benefits': remedy.benefits,
-            'side_effects': getattr(remedy, 'side_effects', ''),
-            'precautions': getattr(remedy, 'precautions', ''),
-            'ingredients': getattr(remedy, 'ingredients', ''),
+            'overview': html['overview'],
+            'uses': html['uses'],
+            'dosage': html['dosage'],
+            'benefits': html['benefits'],
+            'side_effects': html.get('side_effects', ''),
+            'precautions': html.get('precautions', ''),
+            'ingredients': html.get('ingredients', ''),
             'potency': getattr(remedy, 'potency', ''),
             'dosha_effect': getattr(remedy, 'dosha_effect', ''),
             'image': remedy.image.get_rendition('fill-800x500').url if remedy.image else None,
@@ -712,9 +719,9 @@ def remedy_detail(request, slug):
             'published_date': remedy.first_published_at,
         }
 
-        return JsonResponse(remedy_data)
+        return OrjsonResponse(remedy_data)
     except Exception as e:
-        return JsonResponse({'message': 'Remedy not found', 'error': str(e)}, status=404)
+        return OrjsonResponse({'message': 'Remedy not found', 'error': str(e)}, status=404)
 
 
 def remedies_paths(request):
@@ -723,22 +730,22 @@ def remedies_paths(request):
         from remedies.models import RemedyPage
 
         remedies = RemedyPage.objects.live().values_list('slug', flat=True)
-        return JsonResponse(list(remedies), safe=False)
+        return OrjsonResponse(list(remedies), safe=False)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return OrjsonResponse({'error': str(e)}, status=500)
 
 
 def articles_list(request):
     articles = ArticlePage.objects.live().order_by('-first_published_at')
-    lang = request.GET.get('lang', 'en')
+    lang = request_locale(request)
 
     articles_data = []
     for article in articles:
         articles_data.append({
             'id': article.id,
-            'title': article.title_hi if lang == 'hi' and hasattr(article, 'title_hi') and article.title_hi else article.title,
-            'slug': article.slug_hi if lang == 'hi' and hasattr(article, 'slug_hi') and article.slug_hi else article.slug,
-            'subtitle': article.subtitle_hi if lang == 'hi' and hasattr(article, 'subtitle_hi') and article.subtitle_hi else article.subtitle,
+            'title': translated(article, 'title', lang),
+            'slug': translated(article, 'slug', lang),
+            'subtitle': translated(article, 'subtitle', lang),
             'image': article.header_image.get_rendition('fill-800x500').url if article.header_image else None,
             'published_date': article.first_published_at.isoformat() if article.first_published_at else None,
             'category': article.category.name if hasattr(article, 'category') and article.category else None,
@@ -753,7 +760,7 @@ def articles_list(request):
             'last_updated': article.last_published_at.isoformat() if article.last_published_at else None,
         })
 
-    return JsonResponse(articles_data, safe=False)
+    return OrjsonResponse(articles_data, safe=False)
 
 
 def doctors_list(request):
@@ -787,7 +794,7 @@ def doctors_list(request):
                 'published_date': article.first_published_at.isoformat() if article.first_published_at else None
             })
 
-    return JsonResponse(list(authors.values()), safe=False)
+    return OrjsonResponse(list(authors.values()), safe=False)
 
 
 def doctor_detail(request, slug):
@@ -824,9 +831,9 @@ def doctor_detail(request, slug):
 
     if doctor_data:
         doctor_data['articles'] = doctor_articles
-        return JsonResponse(doctor_data)
+        return OrjsonResponse(doctor_data)
     else:
-        return JsonResponse({'error': 'Doctor not found'}, status=404)
+        return OrjsonResponse({'error': 'Doctor not found'}, status=404)
 
 
 def videos_latest(request):
@@ -835,7 +842,7 @@ def videos_latest(request):
         from social_media.models import VideoPage
 
         limit = int(request.GET.get('limit', 20))
-        lang = request.GET.get('lang', 'en')
+        lang = request_locale(request)
 
         videos = VideoPage.objects.live().order_by('-publish_date')[:limit]
 
@@ -856,9 +863,9 @@ def videos_latest(request):
             }
             response.append(video_data)
 
-        return JsonResponse(response, safe=False)
+        return OrjsonResponse(response, safe=False)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return OrjsonResponse({'error': str(e)}, status=500)
 
 
 def video_detail(request, slug):
@@ -868,6 +875,7 @@ def video_detail(request, slug):
 
         video = VideoPage.objects.live().get(slug=slug)
 
+        html = rendered_html(video)
         video_data = {
             'id': video.id,
             'title': video.title,
@@ -875,8 +883,8 @@ def video_detail(request, slug):
             'video_url': video.video_url,
             'video_embed_code': video.video_embed_code,
             'duration': video.duration,
-            'description': video.description,
-            'transcript': video.transcript,
+            'description': html['description'],
+            'transcript': html['transcript'],
             'thumbnail': video.thumbnail.get_rendition('fill-800x500').url if video.thumbnail else None,
             'published_date': video.publish_date,
             'featured': video.featured,
@@ -885,9 +893,9 @@ def video_detail(request, slug):
 
         video.increase_view_count()
 
-        return JsonResponse(video_data)
+        return OrjsonResponse(video_data)
     except Exception as e:
-        return JsonResponse({'message': 'Video not found', 'error': str(e)}, status=404)
+        return OrjsonResponse({'message': 'Video not found', 'error': str(e)}, status=404)
 
 
 def social_posts_latest(request):
@@ -926,9 +934,9 @@ def social_posts_latest(request):
             }
             response.append(post_data)
 
-        return JsonResponse(response, safe=False)
+        return OrjsonResponse(response, safe=False)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return OrjsonResponse({'error': str(e)}, status=500)
 
 
 def social_post_detail(request, slug):
@@ -938,13 +946,14 @@ def social_post_detail(request, slug):
 
         post = SocialMediaPost.objects.live().get(slug=slug)
 
+        html = rendered_html(post)
         post_data = {
             'id': post.id,
             'title': post.title,
             'slug': post.slug,
             'post_url': post.post_url,
             'embed_code': post.embed_code,
-            'description': post.description,
+            'description': html['description'],
             'thumbnail': post.thumbnail.get_rendition('fill-800x500').url if post.thumbnail else None,
             'platform': {
                 'name': post.platform.name,
@@ -958,6 +967,6 @@ def social_post_detail(request, slug):
 
         post.increase_view_count()
 
-        return JsonResponse(post_data)
+        return OrjsonResponse(post_data)
     except Exception as e:
-        return JsonResponse({'message': 'Post not found', 'error': str(e)}, status=404)
\ No newline at end of file
+        return OrjsonResponse({'message': 'Post not found', 'error': str(e)}, status=404)
\ No newline at end of file
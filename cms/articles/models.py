@@ -156,6 +156,19 @@ class ArticlePage(Page):
 
     reading_time = models.IntegerField(default=5, help_text="Estimated reading time in minutes")
 
+    # Columns loaded for cards and index listings (see api.listing)
+    listing_fields = [
+        'subtitle',
+        'subtitle_hi',
+        'slug_hi',
+        'summary',
+        'summary_hi',
+        'featured',
+        'author',
+        'category',
+        'image',
+    ]
+
     search_fields = Page.search_fields + [
         index.SearchField('title'),
         index.SearchField('subtitle'),
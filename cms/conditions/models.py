@@ -107,6 +107,16 @@ class ConditionPage(Page):
         related_name='+'
     )
 
+    # Columns loaded for cards and index listings (see api.listing)
+    listing_fields = [
+        'subtitle',
+        'subtitle_hi',
+        'also_known_as',
+        'also_known_as_hi',
+        'specialties',
+        'image',
+    ]
+
     search_fields = Page.search_fields + [
         index.SearchField('title'),
         index.SearchField('overview'),
@@ -0,0 +1,141 @@
+"""
+Reading and validating drug monograph rows for the import_drugs command.
+
+Everything here is plain Python with no database access, so chunks of rows
+can be validated in worker processes. A row is a dict from a CSV header or
+a JSON line; recognised keys are
+
+    generic_name (required), title, brand_names, drug_class,
+    overview, uses, dosage, side_effects, warnings, interactions, storage,
+    pregnancy_category, categories
+
+`categories` is a list in JSON or a ';'/'|' separated string in CSV.
+Long text fields that are not already HTML are wrapped in paragraphs.
+"""
+import csv
+import json
+import re
+from itertools import islice
+
+from django.utils.html import escape
+from django.utils.text import slugify
+
+TEXT_FIELDS = ('brand_names', 'drug_class', 'pregnancy_category')
+RICH_TEXT_FIELDS = ('overview', 'uses', 'dosage', 'side_effects', 'warnings', 'interactions', 'storage')
+MAX_LENGTH = 255
+
+# Column name variants seen in exported datasets
+ALIASES = {
+    'generic': 'generic_name',
+    'name': 'generic_name',
+    'brands': 'brand_names',
+    'brand_name': 'brand_names',
+    'class': 'drug_class',
+    'side effects': 'side_effects',
+    'category': 'categories',
+}
+
+_HTML = re.compile(r'^\s*<[a-zA-Z]')
+_CATEGORY_SEPARATORS = re.compile(r'[;|]')
+
+
+class RowError(ValueError):
+    pass
+
+
+def read_rows(path, file_format=None):
+    """Yield (line number, row dict) from a CSV or JSON lines file without loading it whole"""
+    file_format = file_format or ('jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv')
+    with open(path, newline='', encoding='utf-8-sig') as source:
+        if file_format == 'csv':
+            reader = csv.DictReader(source)
+            for row in reader:
+                yield reader.line_num, row
+            return
+        for line_number, line in enumerate(source, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError as e:
+                yield line_number, {'_error': f'invalid JSON: {e}'}
+
+
+def chunked(rows, size):
+    """Split an iterator into lists of `size`"""
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def _paragraphs(text):
+    if _HTML.match(text):
+        return text
+    return ''.join(f'<p>{escape(part.strip())}</p>' for part in re.split(r'\n\s*\n', text) if part.strip())
+
+
+def normalize_name(name):
+    """The key drugs are deduplicated on"""
+    return ' '.join(name.split()).casefold()
+
+
+def validate_row(row):
+    """Return a cleaned row or raise RowError"""
+    if not isinstance(row, dict):
+        raise RowError('expected an object')
+    if '_error' in row:
+        raise RowError(row['_error'])
+    row = {ALIASES.get(key.strip().lower(), key.strip().lower()): value for key, value in row.items() if key}
+
+    generic_name = ' '.join(str(row.get('generic_name') or '').split())
+    if not generic_name:
+        raise RowError('generic_name is required')
+    if len(generic_name) > MAX_LENGTH:
+        raise RowError(f'generic_name is longer than {MAX_LENGTH} characters')
+
+    title = ' '.join(str(row.get('title') or '').split()) or generic_name.title()
+    cleaned = {
+        'generic_name': generic_name,
+        'key': normalize_name(generic_name),
+        'title': title[:MAX_LENGTH],
+        'slug': slugify(title)[:MAX_LENGTH] or slugify(generic_name)[:MAX_LENGTH],
+    }
+    if not cleaned['slug']:
+        raise RowError(f'cannot make a slug from {title!r}')
+
+    for field in TEXT_FIELDS:
+        if field in row:
+            value = ' '.join(str(row[field] or '').split())
+            if len(value) > MAX_LENGTH:
+                raise RowError(f'{field} is longer than {MAX_LENGTH} characters')
+            cleaned[field] = value
+    for field in RICH_TEXT_FIELDS:
+        if field in row:
+            cleaned[field] = _paragraphs(str(row[field] or ''))
+
+    if 'categories' in row:
+        categories = row['categories']
+        if isinstance(categories, str):
+            categories = _CATEGORY_SEPARATORS.split(categories)
+        elif not isinstance(categories, list):
+            raise RowError('categories must be a list or a ;-separated string')
+        names = [' '.join(str(name).split()) for name in categories]
+        for name in names:
+            if len(name) > MAX_LENGTH:
+                raise RowError(f'a category name is longer than {MAX_LENGTH} characters')
+        cleaned['categories'] = [name for name in dict.fromkeys(names) if name and slugify(name)]
+    return cleaned
+
+
+def validate_chunk(chunk):
+    """Validate [(line number, row)]; returns (cleaned rows, [(line number, error)])"""
+    valid, errors = [], []
+    for line_number, row in chunk:
+        try:
+            cleaned = validate_row(row)
+        except RowError as e:
+            errors.append((line_number, str(e)))
+            continue
+        cleaned['line'] = line_number
+        valid.append(cleaned)
+    return valid, errors
@@ -0,0 +1,200 @@
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.text import slugify
+from wagtail.models import Page
+
+from api.bulk import add_children, discard_stored, index_pages, publish_revisions
+from drugs.importing import RICH_TEXT_FIELDS, TEXT_FIELDS, chunked, normalize_name, read_rows, validate_chunk
+from drugs.models import DrugCategory, DrugIndexPage, DrugPage
+from search.cache import search_cache
+
+# Errors printed before the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+
+class Command(BaseCommand):
+    help = 'Import drug monographs from a CSV or JSON lines file, creating or updating DrugPages by generic name'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file with a header row, or JSON lines (.jsonl)')
+        parser.add_argument('--format', choices=('csv', 'jsonl'), help='Defaults to the file extension')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows validated and written per batch')
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Processes validating rows; 1 validates in this process',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Validate and count without writing anything')
+        parser.add_argument(
+            '--republish', action='store_true',
+            help='Update and publish drugs that editors unpublished; by default their rows are skipped',
+        )
+
+    def handle(self, *args, **options):
+        if not os.path.exists(options['path']):
+            raise CommandError(f"No such file: {options['path']}")
+        self.parent = DrugIndexPage.objects.first()
+        if self.parent is None:
+            raise CommandError('Create a drug index page before importing drugs')
+
+        self.dry_run = options['dry_run']
+        # generic name key -> page id, for every drug in the database
+        self.known = {}
+        # Names of drugs withdrawn by editors, left alone unless --republish is given
+        self.withdrawn = set()
+        for page_id, name, live in DrugPage.objects.values_list('pk', 'generic_name', 'live'):
+            if name:
+                self.known[normalize_name(name)] = page_id
+                if not live and not options['republish']:
+                    self.withdrawn.add(normalize_name(name))
+        # Rows for these count as updates; every other name is created by the import
+        self.preexisting = frozenset(self.known)
+        self.slugs = set(Page.objects.child_of(self.parent).values_list('slug', flat=True))
+        self.categories = dict(DrugCategory.objects.values_list('slug', 'pk'))
+        self.seen = set()
+        self.stats = Counter()
+        touched = set()
+
+        chunks = chunked(read_rows(options['path'], options['format']), options['chunk_size'])
+        for valid, errors in self._validated(chunks, options['workers']):
+            self._report(errors)
+            rows = self._deduplicate(valid)
+            if self.dry_run:
+                continue
+            with transaction.atomic():
+                touched.update(self._upsert(rows))
+            self.stdout.write(
+                f"{self.stats['rows']} rows: {self.stats['created']} created, {self.stats['updated']} updated"
+            )
+
+        if touched:
+            # One search-index update and cache purge for the whole import
+            self.stdout.write(f'Indexing {len(touched)} drugs')
+            touched = sorted(touched)
+            for start in range(0, len(touched), 1000):
+                index_pages(DrugPage, DrugPage.objects.filter(pk__in=touched[start:start + 1000]))
+            discard_stored(touched)
+            search_cache.invalidate()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{'Checked' if self.dry_run else 'Imported'} {self.stats['rows']} rows: "
+            f"{self.stats['created']} created, {self.stats['updated']} updated, "
+            f"{self.stats['duplicates']} duplicates, {self.stats['skipped']} unpublished skipped, "
+            f"{self.stats['invalid']} invalid"
+        ))
+
+    def _validated(self, chunks, workers):
+        """validate_chunk over the chunks in order, keeping at most two chunks per worker in flight"""
+        if workers <= 1:
+            for chunk in chunks:
+                yield validate_chunk(chunk)
+            return
+        # Spawned, not forked: workers must not inherit this process's database connection
+        with ProcessPoolExecutor(workers, mp_context=get_context('spawn')) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(validate_chunk, chunk))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _report(self, errors):
+        for line_number, error in errors:
+            self.stats['invalid'] += 1
+            if self.stats['invalid'] <= MAX_REPORTED_ERRORS:
+                self.stderr.write(f'Line {line_number}: {error}')
+            elif self.stats['invalid'] == MAX_REPORTED_ERRORS + 1:
+                self.stderr.write('Further invalid rows are only counted')
+
+    def _deduplicate(self, rows):
+        """
+        Keep the last row for each generic name in a chunk; later chunks update earlier ones.
+
+        Each row is counted once: the first for a name as created or updated,
+        by whether the drug existed before the import, or as skipped when an
+        editor unpublished the drug; any later one as a duplicate.
+        """
+        self.stats['rows'] += len(rows)
+        latest = {}
+        for row in rows:
+            key = row['key']
+            if key in self.seen or key in latest:
+                self.stats['duplicates'] += 1
+            elif key in self.withdrawn:
+                self.stats['skipped'] += 1
+            elif key in self.preexisting:
+                self.stats['updated'] += 1
+            else:
+                self.stats['created'] += 1
+            latest[key] = row
+        self.seen.update(latest)
+        return [row for key, row in latest.items() if key not in self.withdrawn]
+
+    def _upsert(self, rows):
+        """Create and update the chunk's drugs and publish them; returns their page ids"""
+        self._add_categories(rows)
+        new = [row for row in rows if row['key'] not in self.known]
+        existing = [row for row in rows if row['key'] in self.known]
+
+        created = []
+        for row in new:
+            page = DrugPage(title=row['title'], slug=self._unique_slug(row['slug']), generic_name=row['generic_name'])
+            for field in TEXT_FIELDS + RICH_TEXT_FIELDS:
+                setattr(page, field, row.get(field, ''))
+            created.append(page)
+        add_children(self.parent, created)
+        for row, page in zip(new, created):
+            self.known[row['key']] = page.pk
+
+        pages = DrugPage.objects.in_bulk([self.known[row['key']] for row in existing])
+        updated = []
+        for row in existing:
+            page = pages[self.known[row['key']]]
+            values = {field: row[field] for field in ('title', 'generic_name') + TEXT_FIELDS + RICH_TEXT_FIELDS if field in row}
+            values['draft_title'] = values.get('title', page.title)
+            for field, value in values.items():
+                setattr(page, field, value)
+            # Row by row: bulk_update's CASE expressions cost more than the updates
+            DrugPage.objects.filter(pk=page.pk).update(**values)
+            updated.append(page)
+
+        self._set_categories(new + existing, created + updated)
+        publish_revisions(created + updated)
+        return [page.pk for page in created + updated]
+
+    def _unique_slug(self, slug):
+        candidate, number = slug, 1
+        while candidate in self.slugs:
+            number += 1
+            candidate = f'{slug[:240]}-{number}'
+        self.slugs.add(candidate)
+        return candidate
+
+    def _add_categories(self, rows):
+        names = {
+            slugify(name)[:80]: name
+            for row in rows for name in row.get('categories', ())
+        }
+        missing = [DrugCategory(slug=slug, name=name) for slug, name in names.items() if slug not in self.categories]
+        if missing:
+            DrugCategory.objects.bulk_create(missing, ignore_conflicts=True)
+            self.categories.update(
+                DrugCategory.objects.filter(slug__in=[category.slug for category in missing]).values_list('slug', 'pk')
+            )
+
+    def _set_categories(self, rows, pages):
+        """Replace the categories of pages whose rows list them"""
+        through = DrugPage.categories.through
+        listed = [(row, page) for row, page in zip(rows, pages) if 'categories' in row]
+        if not listed:
+            return
+        through.objects.filter(drugpage_id__in=[page.pk for _row, page in listed]).delete()
+        through.objects.bulk_create([
+            through(drugpage_id=page.pk, drugcategory_id=self.categories[slugify(name)[:80]])
+            for row, page in listed for name in row['categories']
+        ], ignore_conflicts=True)
@@ -113,6 +113,14 @@ class DrugPage(Page):
         related_name='+'
     )
 
+    # Columns loaded for cards and index listings (see api.listing)
+    listing_fields = [
+        'generic_name',
+        'brand_names',
+        'drug_class',
+        'image',
+    ]
+
     search_fields = Page.search_fields + [
         index.SearchField('title', boost=10),
         index.SearchField('generic_name', boost=8),
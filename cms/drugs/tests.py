@@ -1,3 +1,82 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from wagtail.models import Page
+
+from .importing import RowError, validate_row
+from .models import DrugCategory, DrugIndexPage, DrugPage
+
+
+class ValidateRowTests(SimpleTestCase):
+    def test_category_longer_than_the_column_is_rejected(self):
+        with self.assertRaises(RowError):
+            validate_row({'generic_name': 'Paracetamol', 'categories': 'x' * 256})
+
+    def test_categories_are_cleaned_and_deduplicated(self):
+        row = validate_row({'generic_name': 'Paracetamol', 'categories': ' Pain  relief;Pain relief|;Fever'})
+        self.assertEqual(row['categories'], ['Pain relief', 'Fever'])
+
+
+class ImportDrugsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.index = Page.get_first_root_node().add_child(instance=DrugIndexPage(title='Drugs', slug='drugs'))
+
+    def import_rows(self, rows, *args):
+        handle, path = tempfile.mkstemp(suffix='.jsonl')
+        self.addCleanup(os.remove, path)
+        with os.fdopen(handle, 'w') as source:
+            for row in rows:
+                source.write(json.dumps(row) + '\n')
+        out = StringIO()
+        call_command('import_drugs', path, '--workers', '1', *args, stdout=out, stderr=StringIO())
+        return out.getvalue()
+
+    def add_drug(self, generic_name, live=True):
+        return self.index.add_child(instance=DrugPage(
+            title=generic_name, slug=generic_name.lower(), generic_name=generic_name, live=live,
+            overview='<p>Old</p>', uses='<p>Old</p>', dosage='<p>Old</p>',
+            side_effects='<p>Old</p>', warnings='<p>Old</p>',
+        ))
+
+    def test_each_row_is_counted_once(self):
+        self.add_drug('Ibuprofen')
+        output = self.import_rows([
+            {'generic_name': 'Paracetamol', 'overview': 'First'},
+            {'generic_name': 'paracetamol ', 'overview': 'Second'},
+            {'generic_name': 'Ibuprofen', 'overview': 'New'},
+            {'generic_name': ''},
+        ])
+        self.assertIn('Imported 3 rows: 1 created, 1 updated, 1 duplicates, 0 unpublished skipped, 1 invalid', output)
+        self.assertEqual(DrugPage.objects.filter(generic_name__iexact='paracetamol').count(), 1)
+        self.assertIn('Second', DrugPage.objects.get(generic_name__iexact='paracetamol').overview)
+        self.assertIn('New', DrugPage.objects.get(generic_name='Ibuprofen').overview)
+
+    def test_unpublished_drugs_are_left_alone(self):
+        self.add_drug('Aspirin', live=False)
+        output = self.import_rows([{'generic_name': 'Aspirin', 'overview': 'New'}])
+        self.assertIn('0 updated, 0 duplicates, 1 unpublished skipped', output)
+        page = DrugPage.objects.get(generic_name='Aspirin')
+        self.assertFalse(page.live)
+        self.assertIn('Old', page.overview)
+
+    def test_republish_updates_unpublished_drugs(self):
+        self.add_drug('Aspirin', live=False)
+        output = self.import_rows([{'generic_name': 'Aspirin', 'overview': 'New'}], '--republish')
+        self.assertIn('1 updated', output)
+        page = DrugPage.objects.get(generic_name='Aspirin')
+        self.assertTrue(page.live)
+        self.assertIn('New', page.overview)
+
+    def test_long_category_is_an_invalid_row(self):
+        output = self.import_rows([
+            {'generic_name': 'Paracetamol', 'categories': ['Pain relief', 'x' * 256]},
+            {'generic_name': 'Ibuprofen', 'categories': ['Pain relief']},
+        ])
+        self.assertIn('1 created', output)
+        self.assertIn('1 invalid', output)
+        self.assertEqual(list(DrugCategory.objects.values_list('name', flat=True)), ['Pain relief'])
@@ -1,12 +1,18 @@
+import time
 
-from django.http import JsonResponse
-from django.db.models import Q
+from api.renderers import OrjsonResponse, loads
+from django.db.models import F, Q
+from api.fields import requested_fields, sparse
+from api.listing import listing_queryset
+from api.locale import request_locale
+from api.payloads import get_payload, payload_response
+from search.analytics import search_log
 from .models import DrugPage, DrugCategory
 
 def drugs_index(request):
     """Get all drugs listing"""
     try:
-        drugs = DrugPage.objects.live().order_by('title')
+        drugs = listing_queryset(DrugPage, 'fill-800x500').prefetch_related('categories').order_by('title')
         
         data = []
         for drug in drugs:
@@ -22,50 +28,35 @@ def drugs_index(request):
             }
             data.append(drug_data)
         
-        return JsonResponse(data, safe=False)
+        return OrjsonResponse(data, safe=False)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return OrjsonResponse({'error': str(e)}, status=500)
 
 def drug_detail(request, slug):
     """Get a single drug by slug"""
     try:
-        drug = DrugPage.objects.live().get(slug=slug)
-        
-        drug_data = {
-            'id': drug.id,
-            'title': drug.title,
-            'slug': drug.slug,
-            'generic_name': drug.generic_name,
-            'brand_names': drug.brand_names,
-            'drug_class': drug.drug_class,
-            'overview': drug.overview,
-            'uses': drug.uses,
-            'dosage': drug.dosage,
-            'side_effects': drug.side_effects,
-            'warnings': drug.warnings,
-            'interactions': drug.interactions,
-            'storage': drug.storage,
-            'pregnancy_category': drug.pregnancy_category,
-            'image': drug.image.get_rendition('fill-800x500').url if drug.image else None,
-            'categories': [{'name': cat.name, 'slug': cat.slug} for cat in drug.categories.all()],
-            'view_count': drug.view_count,
-        }
+        lang = request_locale(request)
+        page_id, revision_id = DrugPage.objects.live().values_list('pk', 'live_revision_id').get(slug=slug)
+        payload = get_payload(DrugPage, page_id, revision_id, lang)
         
         # Update view count
-        drug.view_count += 1
-        drug.save()
+        DrugPage.objects.filter(pk=page_id).update(view_count=F('view_count') + 1)
         
-        return JsonResponse(drug_data)
+        fields = requested_fields(request)
+        if fields is not None:
+            return OrjsonResponse(sparse(loads(payload[0]), fields))
+        return payload_response(request, payload, lang=lang)
     except DrugPage.DoesNotExist:
-        return JsonResponse({'message': 'Drug not found'}, status=404)
+        return OrjsonResponse({'message': 'Drug not found'}, status=404)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return OrjsonResponse({'error': str(e)}, status=500)
 
 def drugs_search(request):
     """Search drugs by query string"""
+    started = time.perf_counter()
     query = request.GET.get('q', '')
     if not query:
-        return JsonResponse([], safe=False)
+        return OrjsonResponse([], safe=False)
     
     try:
         drugs = DrugPage.objects.live().filter(
@@ -88,9 +79,10 @@ def drugs_search(request):
             }
             data.append(drug_data)
         
-        return JsonResponse(data, safe=False)
+        search_log.record('drugs_search', query, request_locale(request), {'drugs': len(data)}, started)
+        return OrjsonResponse(data, safe=False)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return OrjsonResponse({'error': str(e)}, status=500)
 
 def drug_categories(request):
     """Get all drug categories"""
@@ -108,6 +100,6 @@ def drug_categories(request):
             }
             data.append(category_data)
         
-        return JsonResponse(data, safe=False)
+        return OrjsonResponse(data, safe=False)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return OrjsonResponse({'error': str(e)}, status=500)
@@ -0,0 +1,31 @@
+"""
+Sentry sampling for the CMS: its route rates on top of the sampler it shares
+with the gateway (shared/sampling.py, which documents how sampling works).
+
+Imported by the settings module before Django is configured, so it reads
+only environment variables and its own config file, never django.conf.
+"""
+import os
+import sys
+from pathlib import Path
+
+# The sampler is shared with the gateway from the repository root
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from shared.sampling import Sampler, env_defaults  # noqa: E402
+
+ROUTES = {
+    '/static/*': 0.0,
+    '/media/*': 0.0,
+    '/favicon.ico': 0.0,
+    '/robots.txt': 0.0,
+    '/api/*/paths': 0.01,
+    '/api/*/paths/': 0.01,
+    '/sitemap.xml': 0.01,
+}
+
+sampler = Sampler(
+    env_defaults(ROUTES),
+    config_file=os.getenv('SAMPLING_CONFIG_FILE'),
+    reload_seconds=float(os.getenv('SAMPLING_RELOAD_SECONDS', 5)),
+)
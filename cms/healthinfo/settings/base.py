@@ -3,6 +3,8 @@ from pathlib import Path
 import sentry_sdk
 from sentry_sdk.integrations.django import DjangoIntegration
 
+from healthinfo.sampling import sampler
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
@@ -12,8 +14,10 @@ sentry_sdk.init(
     integrations=[
         DjangoIntegration(),
     ],
-    traces_sample_rate=1.0,
-    profiles_sample_rate=1.0,
+    # Per-route, adjustable at runtime (see healthinfo.sampling)
+    traces_sampler=sampler.traces_sampler,
+    profiles_sampler=sampler.profiles_sampler,
+    before_send_transaction=sampler.before_send_transaction,
     send_default_pii=True
 )
 
@@ -51,6 +55,8 @@ INSTALLED_APPS = [
     'taggit',
     'rest_framework',
     'api',  # Custom API app
+    'tasks',  # Background task queue
+    'notifications',  # Newsletter and web-push subscribers
     'remedies', # Added remedies app
 
     'django.conf.locale',
@@ -79,6 +85,7 @@ CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOW_ALL_ORIGINS = True  # For development only
 
 MIDDLEWARE = [
+    'api.instrumentation.QueryInstrumentationMiddleware',  # first, so total covers the whole stack
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
@@ -190,6 +197,63 @@ WAGTAILSEARCH_BACKENDS = {
     }
 }
 
+# Search result cache (entries per locale, seconds)
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv('SEARCH_CACHE_MAX_ENTRIES', 500))
+SEARCH_CACHE_TIMEOUT = int(os.getenv('SEARCH_CACHE_TIMEOUT', 300))
+
+# Search analytics event log (JSON lines, appended in batches)
+SEARCH_ANALYTICS_ENABLED = os.getenv('SEARCH_ANALYTICS_ENABLED', 'True').lower() == 'true'
+SEARCH_ANALYTICS_LOG = os.getenv('SEARCH_ANALYTICS_LOG', os.path.join(BASE_DIR, 'search_events.jsonl'))
+SEARCH_ANALYTICS_BATCH_SIZE = 200
+SEARCH_ANALYTICS_FLUSH_INTERVAL = 5
+
+# Queue search-index updates instead of writing them during the save (see search.indexing).
+# Off by default: with it on, run `manage.py process_search_queue` as a service to apply
+# them, or nothing reaches the index. The worker thread drains the queue inside each
+# process instead; it never starts on SQLite, whose single writer it would hold while
+# other requests and commands write.
+SEARCH_INDEX_QUEUE_ENABLED = os.getenv('SEARCH_INDEX_QUEUE_ENABLED', 'False').lower() == 'true'
+SEARCH_INDEX_WORKER_THREAD = os.getenv('SEARCH_INDEX_WORKER_THREAD', 'False').lower() == 'true'
+SEARCH_INDEX_BATCH_SIZE = 500
+SEARCH_INDEX_FLUSH_INTERVAL = 2
+
+# Background tasks (see tasks.queue); run `manage.py run_tasks` as a worker
+TASKS_BATCH_SIZE = 100
+TASKS_POLL_INTERVAL = 1
+TASKS_MAX_ATTEMPTS = int(os.getenv('TASKS_MAX_ATTEMPTS', 5))
+TASKS_RETRY_DELAY = 30  # seconds, doubled after each failed attempt
+TASKS_RETRY_MAX_DELAY = 3600
+TASKS_LEASE = 300  # seconds before a task claimed by a worker that died is due again
+
+# Web push (api.tasks)
+VAPID_PRIVATE_KEY = os.getenv('VAPID_PRIVATE_KEY', '')
+VAPID_CLAIMS_SUB = os.getenv('VAPID_CLAIMS_SUB', 'mailto:admin@healthinfo.com')
+WEB_PUSH_TIMEOUT = 10
+
+# Subscriber fan-out (see notifications.dispatch)
+NOTIFICATIONS_ANNOUNCE_NEWS = os.getenv('NOTIFICATIONS_ANNOUNCE_NEWS', 'True').lower() == 'true'
+NOTIFICATIONS_CHUNK_SIZE = 1000
+NOTIFICATIONS_PUSH_CONCURRENCY = 8  # requests in flight per push service
+NOTIFICATIONS_EMAIL_CONCURRENCY = 4  # mail server connections
+NOTIFICATIONS_MAX_WORKERS = 32
+NEWSLETTER_FROM_EMAIL = os.getenv('NEWSLETTER_FROM_EMAIL', 'noreply@healthinfo.com')
+# Public site, for links in notifications
+SITE_URL = os.getenv('SITE_URL', 'http://localhost:3000')
+
+# Publish events for live clients, POSTed to the gateway (see api.live); unset to disable
+LIVE_EVENTS_URL = os.getenv('LIVE_EVENTS_URL', '')
+LIVE_EVENTS_TOKEN = os.getenv('LIVE_EVENTS_TOKEN', '')
+LIVE_EVENTS_TIMEOUT = 2
+
+# Per-request query counts and Server-Timing headers (see api.instrumentation)
+QUERY_INSTRUMENTATION_ENABLED = os.getenv('QUERY_INSTRUMENTATION_ENABLED', 'False').lower() == 'true'
+QUERY_INSTRUMENTATION_SAMPLE_RATE = float(os.getenv('QUERY_INSTRUMENTATION_SAMPLE_RATE', 0.01))
+QUERY_INSTRUMENTATION_PATHS = ['/api/']
+SLOW_REQUEST_QUERIES = int(os.getenv('SLOW_REQUEST_QUERIES', 50))
+SLOW_REQUEST_DB_MS = int(os.getenv('SLOW_REQUEST_DB_MS', 200))
+SLOW_REQUEST_MS = int(os.getenv('SLOW_REQUEST_MS', 1000))
+SLOW_QUERY_MS = int(os.getenv('SLOW_QUERY_MS', 100))
+
 # Meilisearch configuration
 MEILISEARCH_HOST = os.getenv('MEILISEARCH_HOST', 'http://127.0.0.1:7700')
 MEILISEARCH_API_KEY = os.getenv('MEILISEARCH_API_KEY', 'healthinfo_master_key_2024')
@@ -67,6 +67,13 @@ CACHES = {
     }
 }
 
+# Instrument every API request while developing
+QUERY_INSTRUMENTATION_ENABLED = True
+QUERY_INSTRUMENTATION_SAMPLE_RATE = 1.0
+
+# The gateway started with `python main.py` in backend/
+LIVE_EVENTS_URL = os.getenv('LIVE_EVENTS_URL', 'http://localhost:8000/internal/events')
+
 # Logging
 LOGGING = {
     'version': 1,
@@ -81,6 +88,10 @@ LOGGING = {
             'handlers': ['console'],
             'level': 'INFO',
         },
+        'api.instrumentation': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
     },
 }
 
@@ -31,6 +31,24 @@ else:
         }
     }
 
+# Shared by every worker, so invalidations such as the search cache's
+# generation token reach all of them. Redis when REDIS_URL is set (needs the
+# redis package), otherwise a table created with `manage.py createcachetable`
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+        }
+    }
+
 # Email settings - using SMTP
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = os.environ.get('EMAIL_HOST')
@@ -94,6 +112,18 @@ LOGGING = {
             'handlers': ['console'],
             'level': 'INFO',
         },
+        'api.instrumentation': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
+        'search.indexing': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
+        'tasks.queue': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
     }
 }
 
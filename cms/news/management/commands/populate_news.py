@@ -1,3 +1,4 @@
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
 from wagtail.models import Page
@@ -5,9 +6,23 @@ from news.models import NewsPage, NewsCategory, NewsIndexPage
 from wagtail.images.models import Image
 
 class Command(BaseCommand):
-    help = 'Populate news articles for testing'
+    help = 'Populate news articles for testing, or a synthetic corpus for benchmarks with --synthetic'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--synthetic', type=int, default=0, metavar='COUNT',
+            help='Create COUNT synthetic pages per type (e.g. 10000 or 100000) instead of the sample articles',
+        )
+        parser.add_argument('--types', help='Comma-separated page types to seed with --synthetic (default: all)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed; the same seed gives the same corpus')
 
     def handle(self, *args, **options):
+        if options['synthetic']:
+            # Bulk inserts; see api/management/commands/seed_content.py
+            extra = {'types': options['types']} if options['types'] else {}
+            call_command('seed_content', count=options['synthetic'], seed=options['seed'], stdout=self.stdout, **extra)
+            return
+
         # Get or create news index page
         home_page = Page.objects.get(slug='home')
 
@@ -201,4 +216,4 @@ class Command(BaseCommand):
 
                 self.stdout.write(f'Created news article: {article.title}')
 
-        self.stdout.write(self.style.SUCCESS('Successfully populated news articles'))
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS('Successfully populated news articles'))
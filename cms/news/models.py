@@ -87,6 +87,16 @@ class NewsPage(Page):
         related_name='+'
     )
 
+    # Columns loaded for cards and index listings (see api.listing)
+    listing_fields = [
+        'subtitle',
+        'summary',
+        'featured',
+        'source',
+        'category',
+        'image',
+    ]
+
     search_fields = Page.search_fields + [
         index.SearchField('title'),
         index.SearchField('subtitle'),
@@ -1,3 +1,56 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from wagtail.models import Page
 
-# Create your tests here.
+from articles.models import ArticleCategory, ArticlePage
+
+from .models import NewsCategory, NewsPage
+
+
+class SparseFieldsQueryTests(TestCase):
+    """?fields= defers unrequested columns, so it must never add queries"""
+
+    @classmethod
+    def setUpTestData(cls):
+        root = Page.get_first_root_node()
+        news_category = NewsCategory.objects.create(name='Health', slug='health')
+        article_category = ArticleCategory.objects.create(name='Heart', slug='heart')
+        for number in range(6):
+            root.add_child(instance=NewsPage(
+                title=f'News {number}', slug=f'news-{number}', summary='Summary', body='<p>Body</p>',
+                category=news_category,
+            ))
+            root.add_child(instance=ArticlePage(
+                title=f'Article {number}', slug=f'article-{number}', summary='Summary', summary_hi='Saar',
+                body='<p>Body</p>', featured=True, category=article_category,
+            ))
+
+    def count_queries(self, url, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.json()
+
+    def assert_sparse_is_not_dearer(self, url):
+        full, _data = self.count_queries(url)
+        sparse, data = self.count_queries(url, fields='title')
+        self.assertLessEqual(sparse, full)
+        return data
+
+    def test_news_latest(self):
+        data = self.assert_sparse_is_not_dearer('/api/news/latest/')
+        self.assertEqual(set(data[0]), {'id', 'slug', 'title'})
+
+    def test_top_stories(self):
+        data = self.assert_sparse_is_not_dearer('/api/articles/top-stories/')
+        self.assertEqual(set(data[0]), {'id', 'slug', 'title'})
+
+    def test_health_topics(self):
+        data = self.assert_sparse_is_not_dearer('/api/articles/health-topics/')
+        self.assertEqual(set(data[0]['articles'][0]), {'id', 'slug', 'title'})
+
+    def test_sparse_listing_does_not_grow_with_rows(self):
+        few, _data = self.count_queries('/api/news/latest/', fields='title', limit=2)
+        many, _data = self.count_queries('/api/news/latest/', fields='title', limit=6)
+        self.assertEqual(few, many)
@@ -1,23 +1,34 @@
-from django.http import JsonResponse
+from api.renderers import OrjsonResponse
 from django.db.models import Q
 from .models import NewsPage
 from articles.models import ArticlePage
+from api.fields import defer_unrequested, requested_fields, sparse, wants
+from api.listing import listing_queryset
+from api.richtext import rendered_html
+
+# Large columns read by each output key, for ?fields= (see api.fields)
+NEWS_CARD_SOURCES = {'summary': ('summary',)}
+TOP_STORY_SOURCES = {'summary': ('summary', 'summary_hi'), 'body': ('body', 'body_hi')}
 
 def news_latest(request):
     """Get latest news articles"""
     try:
         limit = int(request.GET.get('limit', 6))
-        news = NewsPage.objects.live().order_by('-first_published_at')[:limit]
+        fields = requested_fields(request)
+        news = defer_unrequested(
+            listing_queryset(NewsPage, 'fill-800x500'), fields, NEWS_CARD_SOURCES
+        ).order_by('-first_published_at')[:limit]
         data = []
 
         for article in news:
-            article_data = {
+            article_data = sparse({
                 'id': article.id,
                 'title': article.title,
                 'slug': article.slug,
                 'subtitle': article.subtitle or '',
-                'summary': article.summary or '',
-                'image': request.build_absolute_uri(article.image.get_rendition('fill-800x500').url) if article.image else None,
+                # Deferred unless requested, when reading it would cost a query per row
+                'summary': (article.summary or '') if wants(fields, 'summary') else '',
+                'image': request.build_absolute_uri(article.image.get_rendition('fill-800x500').url) if wants(fields, 'image') and article.image else None,
                 'category': {
                     'name': article.category.name,
                     'slug': article.category.slug,
@@ -25,15 +36,15 @@ def news_latest(request):
                 'source': article.source or '',
                 'publish_date': article.first_published_at.isoformat() if article.first_published_at else None,
                 'featured': article.featured,
-            }
+            }, fields)
             data.append(article_data)
 
-        return JsonResponse(data, safe=False)
+        return OrjsonResponse(data, safe=False)
     except Exception as e:
         print(f"Error in news_latest: {e}")
         import traceback
         traceback.print_exc()
-        return JsonResponse({'error': str(e)}, status=500)
+        return OrjsonResponse({'error': str(e)}, status=500)
 
 def news_detail(request, slug):
     """Get a single news article by slug"""
@@ -49,20 +60,21 @@ def news_detail(request, slug):
             available_slugs = list(NewsPage.objects.live().values_list('slug', flat=True)[:10])
             print(f"News article not found with slug: '{decoded_slug}'")
             print(f"Available news slugs: {available_slugs}")
-            return JsonResponse({
+            return OrjsonResponse({
                 'message': 'News article not found',
                 'requested_slug': decoded_slug,
                 'available_slugs': available_slugs
             }, status=404)
 
         # Build article data
+        html = rendered_html(article)
         article_data = {
             'id': article.id,
             'title': article.title,
             'slug': article.slug,
             'subtitle': article.subtitle or '',
             'summary': article.summary or article.subtitle or '',
-            'body': article.body,
+            'body': html['body'],
             'image': request.build_absolute_uri(article.image.get_rendition('fill-800x500').url) if article.image else None,
             'author': {
                 'name': article.author_name or 'Health News Team',
@@ -80,20 +92,20 @@ def news_detail(request, slug):
         article.view_count += 1
         article.save(update_fields=['view_count'])
 
-        return JsonResponse(article_data)
+        return OrjsonResponse(article_data)
     except Exception as e:
         print(f"Error in news_detail: {e}")
         import traceback
         traceback.print_exc()
-        return JsonResponse({'error': str(e)}, status=500)
+        return OrjsonResponse({'error': str(e)}, status=500)
 
 def news_paths(request):
     """Get all news slugs for static generation"""
     try:
         news = NewsPage.objects.live().values_list('slug', flat=True)
-        return JsonResponse(list(news), safe=False)
+        return OrjsonResponse(list(news), safe=False)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return OrjsonResponse({'error': str(e)}, status=500)
 
 def news_related(request, slug):
     """Get related news articles"""
@@ -120,16 +132,19 @@ def news_related(request, slug):
             }
             data.append(article_data)
 
-        return JsonResponse(data, safe=False)
+        return OrjsonResponse(data, safe=False)
     except NewsPage.DoesNotExist:
-        return JsonResponse({'message': 'News article not found'}, status=404)
+        return OrjsonResponse({'message': 'News article not found'}, status=404)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return OrjsonResponse({'error': str(e)}, status=500)
 
 def articles_top_stories(request):
     """Get top stories (featured articles)"""
     try:
-        articles = ArticlePage.objects.live().filter(featured=True).order_by('-first_published_at')[:6]
+        fields = requested_fields(request)
+        articles = defer_unrequested(
+            ArticlePage.objects.live().filter(featured=True).select_related('category'), fields, TOP_STORY_SOURCES
+        ).order_by('-first_published_at')[:6]
 
         data = []
         for article in articles:
@@ -146,27 +161,28 @@ def articles_top_stories(request):
                     'credentials': '',
                 }
 
-            article_data = {
+            article_data = sparse({
                 'id': article.id,
                 'title': article.title,
                 'slug': article.slug,
-                'summary': article.summary or '',
-                'body': article.body or '',
-                'image': request.build_absolute_uri(article.image.get_rendition('fill-800x500').url) if article.image else None,
+                # Deferred columns are only read when requested, or each would cost a query per row
+                'summary': (article.summary or '') if wants(fields, 'summary') else '',
+                'body': (article.body or '') if wants(fields, 'body') else '',
+                'image': request.build_absolute_uri(article.image.get_rendition('fill-800x500').url) if wants(fields, 'image') and article.image else None,
                 'author': author_data,
                 'category': {
                     'name': article.category.name,
                     'slug': article.category.slug,
                 } if article.category else None,
                 'created_at': article.first_published_at,
-                'tags': [tag.name for tag in article.tags.all()] if hasattr(article, 'tags') else [],
+                'tags': [tag.name for tag in article.tags.all()] if hasattr(article, 'tags') and wants(fields, 'tags') else [],
                 'featured': article.featured,
-            }
+            }, fields)
             data.append(article_data)
 
-        return JsonResponse(data, safe=False)
+        return OrjsonResponse(data, safe=False)
     except Exception as e:
         import traceback
         print(f"Error in articles_top_stories: {str(e)}")
         print(traceback.format_exc())
-        return JsonResponse({'error': str(e)}, status=500)
\ No newline at end of file
+        return OrjsonResponse({'error': str(e)}, status=500)
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""
+Fan-out of announcements to newsletter and web-push subscribers.
+
+Each announce_news task (see notifications.tasks) sends to one chunk of
+subscribers, NOTIFICATIONS_CHUNK_SIZE in primary-key order, and queues the
+next chunk, so a large list is spread over many short tasks and a worker
+restart only repeats one chunk. Within a chunk, messages go out from a
+thread pool:
+
+  * push subscriptions are grouped by push service, with at most
+    NOTIFICATIONS_PUSH_CONCURRENCY requests in flight per service
+  * email goes out over NOTIFICATIONS_EMAIL_CONCURRENCY mail connections
+
+The sending threads do not touch the database. Subscriptions a push service
+reports as gone are deleted afterwards, and each other failed send becomes a
+single-message task (send_email or web_push, see api.tasks) that is retried
+with backoff.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from pywebpush import WebPushException, webpush
+
+from tasks.queue import enqueue
+
+from .models import PushSubscription
+
+# Push services answer these for subscriptions that have expired or been revoked
+GONE_STATUSES = (404, 410)
+
+
+class SubscriptionGone(Exception):
+    pass
+
+
+def provider_of(endpoint):
+    return urlsplit(endpoint).hostname or ''
+
+
+def push(subscription_info, data, session=None):
+    """Send one push message; raises SubscriptionGone for expired subscriptions"""
+    try:
+        webpush(
+            subscription_info=subscription_info,
+            data=data,
+            vapid_private_key=settings.VAPID_PRIVATE_KEY,
+            vapid_claims={"sub": settings.VAPID_CLAIMS_SUB},
+            timeout=settings.WEB_PUSH_TIMEOUT,
+            requests_session=session,
+        )
+    except WebPushException as e:
+        if getattr(e.response, 'status_code', None) in GONE_STATUSES:
+            raise SubscriptionGone(e.message) from e
+        raise
+
+
+def prune(endpoints):
+    """Delete subscriptions their push service no longer accepts"""
+    if endpoints:
+        PushSubscription.objects.filter(endpoint__in=list(endpoints)).delete()
+
+
+def _slices(items, count):
+    """Split items into at most `count` non-empty interleaved lists"""
+    return [items[start::count] for start in range(min(count, len(items)))]
+
+
+def _run(jobs):
+    """Run zero-argument callables in a pool, returning their results concatenated"""
+    if not jobs:
+        return []
+    with ThreadPoolExecutor(max_workers=min(len(jobs), settings.NOTIFICATIONS_MAX_WORKERS)) as pool:
+        return [item for result in pool.map(lambda job: job(), jobs) for item in result]
+
+
+def push_all(subscriptions, data):
+    """
+    Send data to PushSubscriptions; returns (endpoints that are gone,
+    [(subscription, error)] for other failures).
+    """
+    by_provider = {}
+    for subscription in subscriptions:
+        by_provider.setdefault(subscription.provider, []).append(subscription.subscription_info)
+
+    def send(infos):
+        errors = []
+        with requests.Session() as session:
+            for info in infos:
+                try:
+                    push(info, data, session)
+                except Exception as e:
+                    errors.append((info, e))
+        return errors
+
+    limit = settings.NOTIFICATIONS_PUSH_CONCURRENCY
+    errors = _run([
+        lambda infos=infos: send(infos)
+        for infos_by_provider in by_provider.values()
+        for infos in _slices(infos_by_provider, limit)
+    ])
+    gone = [info['endpoint'] for info, error in errors if isinstance(error, SubscriptionGone)]
+    failed = [(info, error) for info, error in errors if not isinstance(error, SubscriptionGone)]
+    return gone, failed
+
+
+def email_all(addresses, subject, body, from_email=None):
+    """Send one email per address; returns [(address, error)] for failed sends"""
+    def send(chunk):
+        errors = []
+        with get_connection() as connection:
+            for address in chunk:
+                try:
+                    connection.send_messages([EmailMessage(subject, body, from_email, [address])])
+                except Exception as e:
+                    errors.append((address, e))
+        return errors
+
+    return _run([
+        lambda chunk=chunk: send(chunk)
+        for chunk in _slices(list(addresses), settings.NOTIFICATIONS_EMAIL_CONCURRENCY)
+    ])
+
+
+def retry_push(failed, data):
+    for info, _error in failed:
+        enqueue('web_push', {'subscription': info, 'data': data}, delay=settings.TASKS_RETRY_DELAY)
+
+
+def retry_email(failed, subject, body, from_email=None):
+    for address, _error in failed:
+        enqueue('send_email', {
+            'subject': subject, 'body': body, 'from_email': from_email, 'to': [address],
+        }, delay=settings.TASKS_RETRY_DELAY)
@@ -0,0 +1,43 @@
+from django.db import models
+
+
+class PushSubscription(models.Model):
+    """A browser's web-push subscription, as sent by PushManager.subscribe()"""
+    endpoint = models.URLField(max_length=500, unique=True)
+    p256dh = models.CharField(max_length=255)
+    auth = models.CharField(max_length=255)
+    # Push service host, for per-service concurrency limits (see notifications.dispatch)
+    provider = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Push Subscription"
+        indexes = [
+            models.Index(fields=['provider'], name='push_subscription_provider'),
+        ]
+
+    def __str__(self):
+        return self.endpoint
+
+    @property
+    def subscription_info(self):
+        return {'endpoint': self.endpoint, 'keys': {'p256dh': self.p256dh, 'auth': self.auth}}
+
+
+class NewsletterSubscriber(models.Model):
+    email = models.EmailField(unique=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    unsubscribed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Newsletter Subscriber"
+        indexes = [
+            # Fan-out walks active subscribers in primary-key order
+            models.Index(fields=['is_active', 'id'], name='newsletter_active'),
+        ]
+
+    def __str__(self):
+        return self.email
+
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.dispatch import receiver
+from wagtail.signals import page_published
+
+from news.models import NewsPage
+
+from .tasks import announce
+
+
+@receiver(page_published, sender=NewsPage)
+def announce_news_page(sender, instance, **kwargs):
+    """Tell subscribers about a news page the first time it is published"""
+    if not settings.NOTIFICATIONS_ANNOUNCE_NEWS:
+        return
+    # Publishing sets both to the same time only when the page had never been published
+    if instance.first_published_at != instance.last_published_at:
+        return
+    # Queued in the publish transaction, so a rolled-back publish announces nothing
+    announce(instance)
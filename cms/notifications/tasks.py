@@ -0,0 +1,47 @@
+import json
+
+from django.conf import settings
+
+from news.models import NewsPage
+from tasks.queue import enqueue, task
+
+from .dispatch import email_all, prune, push_all, retry_email, retry_push
+from .models import NewsletterSubscriber, PushSubscription
+
+CHANNELS = ('email', 'push')
+
+
+def announce(page):
+    """Queue the fan-out of a news page to every subscriber"""
+    for channel in CHANNELS:
+        enqueue('announce_news', {'page_id': page.pk, 'channel': channel, 'after': 0})
+
+
+@task('announce_news')
+def announce_news(payload):
+    """Send a news page to one chunk of a channel's subscribers, then queue the next chunk"""
+    page = NewsPage.objects.live().filter(pk=payload['page_id']).first()
+    if page is None:
+        # Unpublished or deleted before the announcement finished
+        return
+
+    url = f'{settings.SITE_URL}/news/{page.slug}'
+    summary = page.summary or page.subtitle
+    size = settings.NOTIFICATIONS_CHUNK_SIZE
+    if payload['channel'] == 'push':
+        chunk = list(PushSubscription.objects.filter(pk__gt=payload['after']).order_by('pk')[:size])
+        data = json.dumps({'title': page.title, 'body': summary, 'url': url})
+        gone, failed = push_all(chunk, data)
+        prune(gone)
+        retry_push(failed, data)
+    else:
+        chunk = list(
+            NewsletterSubscriber.objects.filter(is_active=True, pk__gt=payload['after'])
+            .order_by('pk').only('pk', 'email')[:size]
+        )
+        subject, body = page.title, f'{summary}\n\nRead more: {url}'
+        failed = email_all([subscriber.email for subscriber in chunk], subject, body, settings.NEWSLETTER_FROM_EMAIL)
+        retry_email(failed, subject, body, settings.NEWSLETTER_FROM_EMAIL)
+
+    if len(chunk) == size:
+        enqueue('announce_news', {**payload, 'after': chunk[-1].pk})
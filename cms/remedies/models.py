@@ -100,6 +100,16 @@ class RemedyPage(Page):
 
     view_count = models.PositiveIntegerField(default=0)
 
+    # Columns loaded for cards and index listings (see api.listing)
+    listing_fields = [
+        'subtitle',
+        'also_known_as',
+        'potency',
+        'dosha_effect',
+        'remedy_type',
+        'image',
+    ]
+
     search_fields = Page.search_fields + [
         index.SearchField('title'),
         index.SearchField('subtitle'),
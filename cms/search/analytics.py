@@ -0,0 +1,116 @@
+"""
+Low-overhead search event log.
+
+Views record one event per search (query, locale, result counts per section
+and latency). Events are buffered in memory and appended to a JSON-lines
+file in batches by a background thread, so recording never waits on disk.
+Every worker process appends to the same file, each batch under an
+exclusive lock so lines from different workers never interleave. The
+`search_report` management command aggregates the file.
+"""
+import atexit
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: a single development server writes the log
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class SearchEventLog:
+    def __init__(self, path=None, batch_size=None, flush_interval=None, max_buffer=None):
+        self._path = path
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_buffer = max_buffer
+        self._buffer = deque()
+        self._wakeup = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def path(self):
+        return self._path or settings.SEARCH_ANALYTICS_LOG
+
+    @property
+    def batch_size(self):
+        return self._batch_size or getattr(settings, 'SEARCH_ANALYTICS_BATCH_SIZE', 200)
+
+    @property
+    def flush_interval(self):
+        return self._flush_interval or getattr(settings, 'SEARCH_ANALYTICS_FLUSH_INTERVAL', 5)
+
+    @property
+    def max_buffer(self):
+        return self._max_buffer or getattr(settings, 'SEARCH_ANALYTICS_MAX_BUFFER', 10000)
+
+    def record(self, endpoint, query, lang, counts, started):
+        """
+        Queue a search event. `started` is the time.perf_counter() value
+        taken when the view began handling the request.
+        """
+        if not getattr(settings, 'SEARCH_ANALYTICS_ENABLED', True):
+            return
+
+        # Shed events rather than grow without bound if the disk is stuck
+        if len(self._buffer) >= self.max_buffer:
+            return
+
+        self._buffer.append({
+            't': round(time.time(), 3),
+            'endpoint': endpoint,
+            'q': query,
+            'lang': lang,
+            'counts': counts,
+            'ms': round((time.perf_counter() - started) * 1000, 2),
+        })
+
+        if self._thread is None:
+            self._start()
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='search-analytics', daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """Append all buffered events to the log file"""
+        with self._flush_lock:
+            events = []
+            while self._buffer:
+                events.append(self._buffer.popleft())
+            if not events:
+                return
+            try:
+                with open(self.path, 'a', encoding='utf-8') as log_file:
+                    if fcntl is not None:
+                        # Released when the file is closed, after the batch is flushed
+                        fcntl.flock(log_file, fcntl.LOCK_EX)
+                    log_file.write(''.join(
+                        json.dumps(event, ensure_ascii=False, separators=(',', ':')) + '\n'
+                        for event in events
+                    ))
+            except OSError as e:
+                logger.error(f"Could not write search analytics to {self.path}: {e}")
+
+
+search_log = SearchEventLog()
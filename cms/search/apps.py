@@ -2,4 +2,11 @@ from django.apps import AppConfig
 
 
 class SearchConfig(AppConfig):
-    name = 'search'
\ No newline at end of file
+    name = 'search'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .indexing import queue_enabled, register_signal_handlers
+
+        if queue_enabled():
+            register_signal_handlers()
@@ -0,0 +1,164 @@
+"""
+In-process cache for search results.
+
+Search traffic is dominated by a few hundred head queries, so results are
+kept per locale under the endpoint's namespace and the case-folded query
+(endpoints shape their results differently) and evicted in
+least-frequently-used order. Publishing, unpublishing or deleting a page
+clears the cache in every worker (see search.signals).
+"""
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+GENERATION_KEY = 'search-cache-generation'
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def clean_query(query):
+    """Collapse whitespace in a raw query string"""
+    return _WHITESPACE_RE.sub(' ', query or '').strip()
+
+
+def normalize_query(query):
+    """
+    Return the cache key form of a query: the query as searched, case-folded.
+    Stemming or dropping punctuation here would let queries the search
+    backend treats differently share an entry.
+    """
+    return clean_query(query).casefold()
+
+
+class LFUCache:
+    """
+    Fixed-size cache that evicts the least frequently used entry.
+
+    Entries with the same use count are evicted oldest first. All operations
+    are O(1).
+    """
+
+    def __init__(self, max_entries, timeout=None):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._entries = {}  # key -> [value, count, expires_at]
+        self._buckets = {}  # count -> OrderedDict of keys
+        self._min_count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _touch(self, key, entry):
+        count = entry[1]
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        entry[1] = count + 1
+        self._buckets.setdefault(count + 1, OrderedDict())[key] = None
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        bucket = self._buckets[entry[1]]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[entry[1]]
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if entry[2] is not None and entry[2] < time.monotonic():
+                self._remove(key)
+                return default
+            self._touch(key, entry)
+            return entry[0]
+
+    def set(self, key, value):
+        if self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + self.timeout if self.timeout else None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[0] = value
+                entry[2] = expires_at
+                self._touch(key, entry)
+                return
+
+            if len(self._entries) >= self.max_entries:
+                bucket = self._buckets.get(self._min_count) or self._buckets[min(self._buckets)]
+                self._remove(next(iter(bucket)))
+
+            self._entries[key] = [value, 1, expires_at]
+            self._buckets.setdefault(1, OrderedDict())[key] = None
+            self._min_count = 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+            self._min_count = 0
+
+
+class SearchCache:
+    """
+    Search results partitioned by locale.
+
+    Each locale gets its own LFU cache so that a burst of Hindi queries
+    cannot evict the English head queries and vice versa. Invalidation is
+    shared between worker processes through a generation token stored in
+    Django's cache, so that cache must be shared too (see CACHES in
+    settings.production).
+    """
+
+    def __init__(self, max_entries=None, timeout=None):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._partitions = {}
+        self._generation = None
+        self._lock = threading.Lock()
+
+    def _partition(self, locale):
+        partition = self._partitions.get(locale)
+        if partition is None:
+            with self._lock:
+                partition = self._partitions.setdefault(locale, LFUCache(
+                    self.max_entries or getattr(settings, 'SEARCH_CACHE_MAX_ENTRIES', 500),
+                    self.timeout or getattr(settings, 'SEARCH_CACHE_TIMEOUT', 300),
+                ))
+        return partition
+
+    def _check_generation(self):
+        generation = cache.get(GENERATION_KEY)
+        if generation != self._generation:
+            self._generation = generation
+            for partition in list(self._partitions.values()):
+                partition.clear()
+
+    def get(self, locale, query, namespace=''):
+        """Cached results for a query; namespace names the endpoint whose results these are"""
+        self._check_generation()
+        return self._partition(locale).get((namespace, normalize_query(query)))
+
+    def set(self, locale, query, results, namespace=''):
+        self._partition(locale).set((namespace, normalize_query(query)), results)
+
+    def invalidate(self):
+        """Drop cached results in this process and every other worker"""
+        self._generation = uuid.uuid4().hex
+        cache.set(GENERATION_KEY, self._generation, None)
+        for partition in list(self._partitions.values()):
+            partition.clear()
+
+
+search_cache = SearchCache()
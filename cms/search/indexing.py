@@ -0,0 +1,190 @@
+"""
+Deferred search-index updates.
+
+Wagtail writes to every auto-updated search backend inside the request that
+saves an object. With SEARCH_INDEX_QUEUE_ENABLED, saves and deletes of
+indexed models only record the object in a queue table (PendingIndexUpdate),
+in the same transaction as the change. The queue is drained in batches:
+repeated saves of one object collapse into one row, and each model's
+objects go to the backends with one add_bulk call.
+
+The queue is off by default. Turning it on needs something to drain it:
+the `process_search_queue` management command running as its own service. With SEARCH_INDEX_WORKER_THREAD, a background
+thread in the process that made the change drains it instead; that thread is
+never started on SQLite, where its writes would hold the database's only
+write lock against bulk loads such as seed_content. `reindex_since`
+reindexes pages changed after a given time, for catching up after the queue
+was not processed.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import close_old_connections, connection, transaction
+from django.db.models.signals import post_delete, post_save
+from wagtail.search import index
+from wagtail.search.backends import get_search_backends_with_name
+
+from .cache import search_cache
+
+logger = logging.getLogger(__name__)
+
+
+def queue_enabled():
+    return getattr(settings, 'SEARCH_INDEX_QUEUE_ENABLED', False)
+
+
+def worker_thread_enabled():
+    return getattr(settings, 'SEARCH_INDEX_WORKER_THREAD', False) and connection.vendor != 'sqlite'
+
+
+def register_signal_handlers():
+    """
+    Queue index updates for every indexed model in place of Wagtail's
+    handlers. Must run before wagtail.search's ready(), which skips models
+    with search_auto_update off.
+
+    The models are collected before any flag is turned off: subclasses such
+    as every Page type inherit the attribute from Page.
+    """
+    enabled = [model for model in index.get_indexed_models() if getattr(model, 'search_auto_update', True)]
+    for model in enabled:
+        model.search_auto_update = False
+        post_save.connect(_enqueue_saved, sender=model)
+        post_delete.connect(_enqueue_deleted, sender=model)
+
+
+def _enqueue_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        enqueue(instance)
+
+
+def _enqueue_deleted(sender, instance, **kwargs):
+    enqueue(instance)
+
+
+def enqueue(instance):
+    """Mark an object for reindexing, or for removal if it no longer exists when the queue is processed"""
+    from .models import PendingIndexUpdate
+
+    PendingIndexUpdate.objects.bulk_create(
+        [PendingIndexUpdate(content_type=ContentType.objects.get_for_model(instance), object_id=str(instance.pk))],
+        ignore_conflicts=True,
+    )
+    if worker_thread_enabled():
+        transaction.on_commit(index_worker.wake)
+
+
+def process_queue(batch_size=None):
+    """
+    Apply one batch of queued updates; returns the number of queue rows handled.
+
+    Rows are deleted before the objects are read, so a save that lands while
+    the batch is being indexed queues the object again rather than being lost.
+    If a backend fails, the batch is put back and the error re-raised.
+    """
+    from .models import PendingIndexUpdate
+
+    batch_size = batch_size or getattr(settings, 'SEARCH_INDEX_BATCH_SIZE', 500)
+    rows = list(
+        PendingIndexUpdate.objects.order_by('pk').values_list('pk', 'content_type_id', 'object_id')[:batch_size]
+    )
+    if not rows:
+        return 0
+    PendingIndexUpdate.objects.filter(pk__in=[pk for pk, _content_type, _object_id in rows]).delete()
+
+    queued = defaultdict(set)
+    for _pk, content_type_id, object_id in rows:
+        queued[content_type_id].add(object_id)
+    try:
+        for content_type_id, object_ids in queued.items():
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            if model is None:
+                continue
+            objects = list(model.get_indexed_objects().filter(pk__in=object_ids))
+            update_index(obj.get_indexed_instance() for obj in objects)
+            found = {str(obj.pk) for obj in objects}
+            remove_from_index(model, object_ids - found)
+    except Exception:
+        PendingIndexUpdate.objects.bulk_create([
+            PendingIndexUpdate(content_type_id=content_type_id, object_id=object_id)
+            for _pk, content_type_id, object_id in rows
+        ], ignore_conflicts=True)
+        raise
+
+    # Results cached since the change was saved may be missing it
+    search_cache.invalidate()
+    return len(rows)
+
+
+def update_index(instances):
+    """Add or update objects in every auto-updated backend, one add_bulk per model"""
+    by_model = defaultdict(list)
+    for instance in instances:
+        if instance is not None:
+            by_model[type(instance)].append(instance)
+    for model, objects in by_model.items():
+        _each_backend(lambda backend: backend.add_bulk(model, objects), f'{len(objects)} {model.__name__} objects')
+
+
+def remove_from_index(model, object_ids):
+    for object_id in object_ids:
+        obj = model(pk=model._meta.pk.to_python(object_id))
+        _each_backend(lambda backend: backend.delete(obj), f'{model.__name__} {object_id}')
+
+
+def _each_backend(operation, description):
+    for backend_name, backend in get_search_backends_with_name(with_auto_update=True):
+        try:
+            operation(backend)
+        except Exception:
+            logger.exception(f"Search index update for {description} failed in the '{backend_name}' backend")
+            # As in wagtail.search.index: database backends must not swallow errors
+            if not backend.catch_indexing_errors:
+                raise
+
+
+class IndexWorker:
+    """Drains the queue in a background thread, a few seconds after changes are committed"""
+
+    def __init__(self):
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def wake(self):
+        if self._thread is None:
+            self._start()
+        self._wakeup.set()
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='search-index', daemon=True)
+                self._thread.start()
+                atexit.register(self.drain)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            # Let a burst of saves collect in the queue before indexing it
+            time.sleep(getattr(settings, 'SEARCH_INDEX_FLUSH_INTERVAL', 2))
+            self.drain()
+
+    def drain(self):
+        close_old_connections()
+        try:
+            while process_queue():
+                pass
+        except Exception:
+            logger.exception('Processing the search index queue failed')
+        finally:
+            close_old_connections()
+
+
+index_worker = IndexWorker()
@@ -0,0 +1,33 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from search.indexing import process_queue
+
+
+class Command(BaseCommand):
+    help = 'Apply queued search-index updates in batches, once or continuously'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Empty the queue and exit')
+        parser.add_argument('--batch-size', type=int, default=None, help='Defaults to SEARCH_INDEX_BATCH_SIZE')
+        parser.add_argument(
+            '--interval', type=float, default=None,
+            help='Seconds to wait when the queue is empty (defaults to SEARCH_INDEX_FLUSH_INTERVAL)',
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval'] or getattr(settings, 'SEARCH_INDEX_FLUSH_INTERVAL', 2)
+        total = 0
+        while True:
+            close_old_connections()
+            while processed := process_queue(options['batch_size']):
+                total += processed
+                if options['verbosity'] > 1:
+                    self.stdout.write(f'Indexed {processed} queued objects')
+            if options['once']:
+                break
+            time.sleep(interval)
+        self.stdout.write(self.style.SUCCESS(f'Processed {total} queued index updates'))
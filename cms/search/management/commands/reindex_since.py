@@ -0,0 +1,57 @@
+import re
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from wagtail.models import Page
+
+from search.cache import search_cache
+from search.indexing import update_index
+
+DURATION_UNITS = {'m': 'minutes', 'h': 'hours', 'd': 'days'}
+
+
+def parse_since(value):
+    """An ISO datetime, or a duration before now such as 30m, 6h or 2d"""
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)([mhd])', value.strip())
+    if match:
+        return timezone.now() - timedelta(**{DURATION_UNITS[match[2]]: float(match[1])})
+    since = parse_datetime(value.strip())
+    if since is None:
+        raise CommandError(f'--since must be an ISO datetime or a duration like 30m, 6h or 2d, not {value!r}')
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+class Command(BaseCommand):
+    help = 'Reindex pages edited or published since a given time, to recover from search-index queue lag'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', required=True, help='ISO datetime, or a duration before now: 30m, 6h, 2d')
+        parser.add_argument('--batch-size', type=int, default=500, help='Pages loaded and indexed at a time')
+
+    def handle(self, *args, **options):
+        since = parse_since(options['since'])
+        page_ids = list(
+            Page.objects.filter(Q(latest_revision_created_at__gte=since) | Q(last_published_at__gte=since))
+            .order_by('pk').values_list('pk', flat=True)
+        )
+        self.stdout.write(f'{len(page_ids)} pages changed since {since.isoformat()}')
+
+        counts = defaultdict(int)
+        batch_size = options['batch_size']
+        for start in range(0, len(page_ids), batch_size):
+            pages = list(Page.objects.filter(pk__in=page_ids[start:start + batch_size]).specific())
+            update_index(pages)
+            for page in pages:
+                counts[type(page).__name__] += 1
+
+        if page_ids:
+            search_cache.invalidate()
+        for name, count in sorted(counts.items()):
+            self.stdout.write(f'  {name}: {count}')
+        self.stdout.write(self.style.SUCCESS(f'Reindexed {len(page_ids)} pages'))
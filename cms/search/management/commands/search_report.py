@@ -0,0 +1,83 @@
+import json
+import math
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from search.cache import normalize_query
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(values)))
+    return values[rank - 1]
+
+
+class Command(BaseCommand):
+    help = 'Summarize the search analytics log: top queries, zero-result queries and latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--log', default=None, help='Path to the event log (defaults to SEARCH_ANALYTICS_LOG)')
+        parser.add_argument('--hours', type=float, default=None, help='Only include events from the last N hours')
+        parser.add_argument('--top', type=int, default=20, help='Number of queries to list')
+        parser.add_argument('--lang', default=None, help='Only include events for this locale')
+
+    def handle(self, *args, **options):
+        path = options['log'] or settings.SEARCH_ANALYTICS_LOG
+        since = time.time() - options['hours'] * 3600 if options['hours'] else None
+
+        queries = Counter()
+        zero_results = Counter()
+        latencies = defaultdict(list)
+        total = 0
+
+        try:
+            log_file = open(path, encoding='utf-8')
+        except FileNotFoundError:
+            self.stderr.write(f'No search events logged yet ({path})')
+            return
+
+        with log_file:
+            for line in log_file:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if since and event.get('t', 0) < since:
+                    continue
+                if options['lang'] and event.get('lang') != options['lang']:
+                    continue
+
+                total += 1
+                key = (event.get('lang', 'en'), normalize_query(event.get('q', '')))
+                queries[key] += 1
+                if not sum(event.get('counts', {}).values()):
+                    zero_results[key] += 1
+                latencies[event.get('endpoint', 'unknown')].append(event.get('ms', 0))
+
+        if not total:
+            self.stdout.write('No matching search events')
+            return
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'{total} searches'))
+
+        self.stdout.write(self.style.MIGRATE_HEADING('\nLatency by endpoint (ms)'))
+        self.stdout.write(f"{'endpoint':<20} {'count':>8} {'p50':>8} {'p95':>8} {'max':>8}")
+        for endpoint, values in sorted(latencies.items()):
+            self.stdout.write(
+                f'{endpoint:<20} {len(values):>8} {percentile(values, 50):>8.1f} '
+                f'{percentile(values, 95):>8.1f} {max(values):>8.1f}'
+            )
+
+        self.stdout.write(self.style.MIGRATE_HEADING('\nTop queries'))
+        for (lang, query), count in queries.most_common(options['top']):
+            self.stdout.write(f'{count:>8}  [{lang}] {query}')
+
+        self.stdout.write(self.style.MIGRATE_HEADING('\nTop zero-result queries'))
+        for (lang, query), count in zero_results.most_common(options['top']):
+            self.stdout.write(f'{count:>8}  [{lang}] {query}')
@@ -0,0 +1,18 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+
+
+class PendingIndexUpdate(models.Model):
+    """
+    An object whose search-index entry is out of date. Saving the same
+    object again before the queue is processed leaves a single row.
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, related_name='+')
+    object_id = models.CharField(max_length=255)
+    queued_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Pending Index Update"
+        constraints = [
+            models.UniqueConstraint(fields=['content_type', 'object_id'], name='unique_pending_index_update'),
+        ]
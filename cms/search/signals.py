@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from wagtail.models import Page
+from wagtail.signals import page_published, page_unpublished
+
+from .cache import search_cache
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+@receiver(post_delete, sender=Page)
+def invalidate_search_cache(sender, **kwargs):
+    """Cached search results may include or omit the changed page"""
+    search_cache.invalidate()
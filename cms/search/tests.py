@@ -0,0 +1,77 @@
+from django.db.models.signals import post_delete, post_save
+from django.test import TestCase, override_settings
+from wagtail.search import index
+
+from remedies.models import RemedyIndexPage, RemedyPage
+
+from .cache import LFUCache, SearchCache, search_cache
+from .indexing import _enqueue_deleted, _enqueue_saved, register_signal_handlers
+
+
+class LFUCacheTests(TestCase):
+    def test_evicts_least_frequently_used_then_oldest(self):
+        lfu = LFUCache(max_entries=2)
+        lfu.set('a', 1)
+        lfu.set('b', 2)
+        lfu.get('a')
+        lfu.set('c', 3)
+        self.assertEqual(lfu.get('a'), 1)
+        self.assertIsNone(lfu.get('b'))
+        self.assertEqual(lfu.get('c'), 3)
+
+
+class SearchCacheTests(TestCase):
+    def test_queries_differing_in_case_and_spacing_share_an_entry(self):
+        cache = SearchCache(max_entries=10, timeout=60)
+        cache.set('en', '  Back   Pain ', ['result'])
+        self.assertEqual(cache.get('en', 'back pain'), ['result'])
+        self.assertIsNone(cache.get('hi', 'back pain'))
+
+    def test_namespaces_are_kept_apart(self):
+        cache = SearchCache(max_entries=10, timeout=60)
+        cache.set('en', 'health', {'shape': 'search'}, namespace='search')
+        self.assertIsNone(cache.get('en', 'health', namespace='api'))
+
+
+@override_settings(SEARCH_ANALYTICS_ENABLED=False)
+class SearchEndpointCacheTests(TestCase):
+    def setUp(self):
+        search_cache.invalidate()
+
+    def test_search_and_api_search_do_not_share_results(self):
+        self.client.get('/search/', {'q': 'health'})
+        response = self.client.get('/api/search/', {'q': 'health'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('news', response.json())
+
+        search_cache.invalidate()
+        self.client.get('/api/search/', {'q': 'health'})
+        response = self.client.get('/search/', {'q': 'health'})
+        self.assertNotIn('news', response.json())
+
+
+class SignalHandlerTests(TestCase):
+    def test_every_auto_updated_model_is_queued(self):
+        enabled = [model for model in index.get_indexed_models() if getattr(model, 'search_auto_update', True)]
+        self.assertIn(RemedyPage, enabled)
+        self.assertIn(RemedyIndexPage, enabled)
+        flags = {model: model.__dict__.get('search_auto_update') for model in enabled}
+        self.addCleanup(self.restore_flags, flags)
+
+        register_signal_handlers()
+
+        for model in enabled:
+            with self.subTest(model=model.__name__):
+                self.assertFalse(model.search_auto_update)
+                # Disconnecting also cleans up, and returns whether the handler was connected
+                self.assertTrue(post_save.disconnect(_enqueue_saved, sender=model))
+                self.assertTrue(post_delete.disconnect(_enqueue_deleted, sender=model))
+
+    @staticmethod
+    def restore_flags(flags):
+        for model, flag in flags.items():
+            if flag is None:
+                if 'search_auto_update' in model.__dict__:
+                    delattr(model, 'search_auto_update')
+            else:
+                model.search_auto_update = flag
@@ -1,27 +1,43 @@
 import os
-from django.http import JsonResponse
+import time
+from api.locale import request_locale
+from api.renderers import OrjsonResponse
 from django.db.models import Q
 from django.conf import settings
 import logging
 
+from .analytics import search_log
+from .cache import search_cache, clean_query
+
 logger = logging.getLogger(__name__)
 
 # Meilisearch removed - using Wagtail's built-in search
 
+def _section_counts(results):
+    """Number of hits per section of a combined search response"""
+    return {section: len(items) for section, items in results.items()}
+
 def search(request):
     from articles.models import ArticlePage
     from conditions.models import ConditionPage
     from drugs.models import DrugPage
     
-    search_query = request.GET.get('q', '').strip()
+    started = time.perf_counter()
+    search_query = clean_query(request.GET.get('q', ''))
+    lang = request_locale(request)
 
     if not search_query:
-        return JsonResponse({
+        return OrjsonResponse({
             'articles': [],
             'conditions': [],
             'drugs': []
         })
 
+    cached = search_cache.get(lang, search_query, namespace='search')
+    if cached is not None:
+        search_log.record('search', search_query, lang, _section_counts(cached), started)
+        return OrjsonResponse(cached)
+
     try:
         # Search using Wagtail's built-in search
         articles_results = ArticlePage.objects.live().search(search_query)[:20]
@@ -55,15 +71,19 @@ def search(request):
             'type': drug.drug_class if hasattr(drug, 'drug_class') else '',
         } for drug in drugs_results]
 
-        return JsonResponse({
+        results = {
             'articles': articles,
             'conditions': conditions,
             'drugs': drugs
-        })
+        }
+        search_cache.set(lang, search_query, results, namespace='search')
+        search_log.record('search', search_query, lang, _section_counts(results), started)
+
+        return OrjsonResponse(results)
     except Exception as e:
         logger.error(f'Search error in search view: {str(e)}')
         # Fallback to empty results
-        return JsonResponse({
+        return OrjsonResponse({
             'error': str(e),
             'articles': [],
             'conditions': [],
@@ -77,17 +97,23 @@ def api_search(request):
     from drugs.models import DrugPage
     from news.models import NewsPage
     
-    query = request.GET.get('q', '').strip()
-    lang = request.GET.get('lang', 'en')
+    started = time.perf_counter()
+    query = clean_query(request.GET.get('q', ''))
+    lang = request_locale(request)
 
     if not query:
-        return JsonResponse({
+        return OrjsonResponse({
             'articles': [],
             'conditions': [],
             'drugs': [],
             'news': []
         })
 
+    cached = search_cache.get(lang, query, namespace='api')
+    if cached is not None:
+        search_log.record('api_search', query, lang, _section_counts(cached), started)
+        return OrjsonResponse(cached)
+
     try:
         results = {
             'articles': [],
@@ -95,6 +121,7 @@ def api_search(request):
             'drugs': [],
             'news': []
         }
+        complete = True
 
         # Search articles
         try:
@@ -110,6 +137,7 @@ def api_search(request):
             } for article in articles_results]
         except Exception as e:
             logger.error(f"Error searching articles: {e}")
+            complete = False
 
         # Search conditions
         try:
@@ -122,6 +150,7 @@ def api_search(request):
             } for condition in conditions_results]
         except Exception as e:
             logger.error(f"Error searching conditions: {e}")
+            complete = False
 
         # Search drugs
         try:
@@ -133,6 +162,7 @@ def api_search(request):
             } for drug in drugs_results]
         except Exception as e:
             logger.error(f"Error searching drugs: {e}")
+            complete = False
 
         # Search news
         try:
@@ -145,12 +175,18 @@ def api_search(request):
             } for news in news_results]
         except Exception as e:
             logger.error(f"Error searching news: {e}")
+            complete = False
+
+        # Don't keep partial results around when a section failed
+        if complete:
+            search_cache.set(lang, query, results, namespace='api')
+        search_log.record('api_search', query, lang, _section_counts(results), started)
 
-        return JsonResponse(results)
+        return OrjsonResponse(results)
 
     except Exception as e:
         logger.error(f"API search error: {e}")
-        return JsonResponse({
+        return OrjsonResponse({
             'articles': [],
             'conditions': [],
             'drugs': [],
@@ -0,0 +1,40 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.queue import run_due
+
+
+class Command(BaseCommand):
+    help = 'Run queued background tasks (emails, web push) until stopped, or once with --once'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Run the tasks that are due now and exit')
+        parser.add_argument('--batch-size', type=int, default=None, help='Defaults to TASKS_BATCH_SIZE')
+        parser.add_argument(
+            '--interval', type=float, default=None,
+            help='Seconds to wait when nothing is due (defaults to TASKS_POLL_INTERVAL)',
+        )
+        parser.add_argument('--retry-failed', action='store_true', help='Queue failed tasks again before starting')
+
+    def handle(self, *args, **options):
+        interval = options['interval'] or getattr(settings, 'TASKS_POLL_INTERVAL', 1)
+        if options['retry_failed']:
+            count = Task.objects.filter(failed=True).update(failed=False, attempts=0, run_after=timezone.now())
+            self.stdout.write(f'Queued {count} failed tasks again')
+
+        total = 0
+        while True:
+            close_old_connections()
+            while claimed := run_due(options['batch_size']):
+                total += claimed
+                if options['verbosity'] > 1:
+                    self.stdout.write(f'Ran {claimed} tasks')
+            if options['once']:
+                break
+            time.sleep(interval)
+        self.stdout.write(self.style.SUCCESS(f'Ran {total} tasks'))
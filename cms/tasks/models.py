@@ -0,0 +1,25 @@
+from django.db import models
+
+
+class Task(models.Model):
+    """
+    A queued call to a registered task handler (see tasks.queue). Rows are
+    deleted once the handler succeeds; failed rows are kept for inspection.
+    """
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    attempts = models.PositiveIntegerField(default=0)
+    # Due time; pushed forward while a worker holds the task and between retries
+    run_after = models.DateTimeField()
+    failed = models.BooleanField(default=False)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Task"
+        indexes = [
+            models.Index(fields=['failed', 'run_after'], name='task_due'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} #{self.pk}'
@@ -0,0 +1,135 @@
+"""
+Persistent background tasks.
+
+Handlers are registered by name in an app's tasks module:
+
+    @task('send_email', batch=True)
+    def send_email(payloads):
+        ...
+
+and queued with enqueue('send_email', {...}), which writes a Task row in
+the caller's transaction, so nothing is sent for a request that rolls back.
+The `run_tasks` command claims due tasks in batches, calls each handler once
+per batch of its tasks, deletes the tasks that succeed and retries failures
+with exponential backoff until TASKS_MAX_ATTEMPTS.
+
+A plain handler receives one payload and raises to fail. A batch handler
+receives a list of payloads and returns a list of the same length holding
+None for each payload that succeeded or the exception it failed with;
+raising fails the whole batch. Failing with PermanentError skips the
+remaining retries.
+"""
+import logging
+import random
+from collections import defaultdict, namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+Handler = namedtuple('Handler', 'func batch')
+
+_handlers = {}
+
+
+class PermanentError(Exception):
+    """A failure retrying will not fix, such as an unknown recipient"""
+
+
+def task(name, batch=False):
+    """Register a function as the handler for tasks called `name`"""
+    def register(func):
+        _handlers[name] = Handler(func, batch)
+        return func
+    return register
+
+
+def enqueue(name, payload, delay=0):
+    """Queue a task; the payload must be JSON-serializable"""
+    return Task.objects.create(name=name, payload=payload, run_after=timezone.now() + timedelta(seconds=delay))
+
+
+def retry_delay(attempts):
+    """Seconds before the next attempt: doubling from TASKS_RETRY_DELAY, with jitter so retries spread out"""
+    delay = getattr(settings, 'TASKS_RETRY_DELAY', 30) * 2 ** (attempts - 1)
+    return min(delay, getattr(settings, 'TASKS_RETRY_MAX_DELAY', 3600)) * random.uniform(1, 1.25)
+
+
+def claim(batch_size):
+    """
+    Take up to batch_size due tasks. Claimed tasks are not due again until
+    TASKS_LEASE seconds have passed, so a worker that dies mid-batch only
+    delays them. On databases with SKIP LOCKED, workers never share a task.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        tasks = list(
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(failed=False, run_after__lte=now)
+            .order_by('run_after', 'pk')[:batch_size]
+        )
+        Task.objects.filter(pk__in=[t.pk for t in tasks]).update(
+            attempts=F('attempts') + 1,
+            run_after=now + timedelta(seconds=getattr(settings, 'TASKS_LEASE', 300)),
+        )
+    for t in tasks:
+        t.attempts += 1
+    return tasks
+
+
+def run_due(batch_size=None):
+    """Run one batch of due tasks; returns how many were claimed"""
+    tasks = claim(batch_size or getattr(settings, 'TASKS_BATCH_SIZE', 100))
+    by_name = defaultdict(list)
+    for t in tasks:
+        by_name[t.name].append(t)
+    for name, group in by_name.items():
+        _finish(group, _call(name, group))
+    return len(tasks)
+
+
+def _call(name, tasks):
+    """Run the handler over tasks; returns an error or None per task"""
+    handler = _handlers.get(name)
+    if handler is None:
+        return [PermanentError(f'No handler registered for {name!r}')] * len(tasks)
+    if handler.batch:
+        try:
+            results = list(handler.func([t.payload for t in tasks]))
+        except Exception as e:
+            return [e] * len(tasks)
+        if len(results) != len(tasks):
+            return [RuntimeError(f'{name} returned {len(results)} results for {len(tasks)} tasks')] * len(tasks)
+        return results
+    results = []
+    for t in tasks:
+        try:
+            handler.func(t.payload)
+        except Exception as e:
+            results.append(e)
+        else:
+            results.append(None)
+    return results
+
+
+def _finish(tasks, results):
+    Task.objects.filter(pk__in=[t.pk for t, error in zip(tasks, results) if error is None]).delete()
+    max_attempts = getattr(settings, 'TASKS_MAX_ATTEMPTS', 5)
+    now = timezone.now()
+    for t, error in zip(tasks, results):
+        if error is None:
+            continue
+        message = f'{type(error).__name__}: {error}'
+        if isinstance(error, PermanentError) or t.attempts >= max_attempts:
+            logger.error(f'Task {t} failed after {t.attempts} attempts: {message}')
+            Task.objects.filter(pk=t.pk).update(failed=True, last_error=message)
+        else:
+            delay = retry_delay(t.attempts)
+            logger.warning(f'Task {t} failed, retrying in {delay:.0f}s: {message}')
+            Task.objects.filter(pk=t.pk).update(run_after=now + timedelta(seconds=delay), last_error=message)
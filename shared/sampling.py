@@ -0,0 +1,158 @@
+"""
+Trace and profile sampling for Sentry, shared by the gateway and the CMS.
+
+Each app builds a Sampler with its own route rates (see backend/sampling.py
+and cms/healthinfo/sampling.py); everything else lives here, so both sides
+of a trace reach the same decision.
+
+Tracing every request costs measurable CPU, so transactions are sampled in
+two stages:
+
+1. `traces_sampler` decides at the start of a request. A request's rate is
+   that of the first pattern in `routes` matching its path, else `default`;
+   it is recorded at `candidate_factor` times that rate (at most 1).
+   Requests arriving with an upstream decision keep it.
+2. `before_send_transaction` sees the finished transaction. Failed and slow
+   (>= `slow_seconds`) transactions are always kept. The rest are kept when
+   the trace's sample_rand falls below the rate the head of the trace
+   recorded at, divided by `candidate_factor`.
+
+sample_rand and the head's rate travel with the trace (Sentry's baggage), so
+the gateway and the CMS keep or drop the same ordinary traces: a CMS span is
+sent exactly when the gateway transaction it belongs to is, unless it failed
+or was slow itself. Both apps must use the same `candidate_factor`. Rates
+above 1 / `candidate_factor` are recorded at 1, so at most that share of
+ordinary requests is kept; set `candidate_factor` to 1 to trace everything.
+
+Profiles are taken for `profiles` of the traced transactions.
+
+Rates come from SAMPLING_* environment variables and can be changed without
+a restart by writing JSON to SAMPLING_CONFIG_FILE, e.g.
+
+    {"default": 0.05, "candidate_factor": 5, "slow_seconds": 1.0, "profiles": 0.1,
+     "routes": {"/api/health": 0, "/api/*/paths": 0.01}}
+
+The file is re-read when its modification time changes, checked at most
+every SAMPLING_RELOAD_SECONDS.
+"""
+import fnmatch
+import json
+import logging
+import os
+import random
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Trace statuses that mean the request failed on our side
+FAILED_STATUSES = {"internal_error", "unknown_error", "unknown", "unavailable", "deadline_exceeded", "data_loss", "aborted"}
+
+
+def env_defaults(routes):
+    """Sampling settings from SAMPLING_* environment variables, with the app's route rates"""
+    return {
+        "default": float(os.getenv("SAMPLING_TRACES_RATE", 0.05)),
+        "candidate_factor": float(os.getenv("SAMPLING_CANDIDATE_FACTOR", 5)),
+        "slow_seconds": float(os.getenv("SAMPLING_SLOW_SECONDS", 1.0)),
+        "profiles": float(os.getenv("SAMPLING_PROFILES_RATE", 0.1)),
+        "routes": dict(routes),
+    }
+
+
+class Sampler:
+    def __init__(self, defaults, config_file=None, reload_seconds=5.0, clock=time.monotonic):
+        self.defaults = defaults
+        self.config_file = config_file
+        self.reload_seconds = reload_seconds
+        self.clock = clock
+        self.config = dict(defaults)
+        self._checked_at = None
+        self._mtime = None
+
+    def _reload(self):
+        """Pick up changes to the config file, looking at most every reload_seconds"""
+        if not self.config_file:
+            return
+        now = self.clock()
+        if self._checked_at is not None and now - self._checked_at < self.reload_seconds:
+            return
+        self._checked_at = now
+        try:
+            mtime = os.stat(self.config_file).st_mtime
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+        try:
+            with open(self.config_file) as config_file:
+                overrides = json.load(config_file)
+        except (OSError, ValueError) as exc:
+            logger.error(f"Could not read sampling config {self.config_file}: {exc}")
+            return
+        self.config = {**self.defaults, **overrides}
+        logger.info(f"Loaded sampling config from {self.config_file}: {self.config}")
+
+    def route_rate(self, path):
+        """Sampling rate for a request path: the first matching route pattern, else the default"""
+        self._reload()
+        for pattern, rate in self.config["routes"].items():
+            if fnmatch.fnmatchcase(path, pattern):
+                return float(rate)
+        return float(self.config["default"])
+
+    def _candidate_rate(self, path):
+        return min(1.0, self.route_rate(path) * float(self.config["candidate_factor"]))
+
+    def traces_sampler(self, sampling_context):
+        parent_sampled = sampling_context.get("parent_sampled")
+        if parent_sampled is not None:
+            return float(parent_sampled)
+        # ASGI for the gateway, WSGI for the CMS
+        scope = sampling_context.get("asgi_scope") or {}
+        environ = sampling_context.get("wsgi_environ") or {}
+        return self._candidate_rate(scope.get("path") or environ.get("PATH_INFO", ""))
+
+    def profiles_sampler(self, sampling_context):
+        self._reload()
+        return float(self.config["profiles"])
+
+    def before_send_transaction(self, event, hint):
+        trace = event.get("contexts", {}).get("trace", {})
+        if trace.get("status") in FAILED_STATUSES:
+            return event
+        if _duration(event) >= float(self.config["slow_seconds"]):
+            return event
+
+        # The head of the trace recorded it at head_rate; keep the slice of
+        # traces it would have kept at the route's own rate
+        dsc = trace.get("dynamic_sampling_context") or {}
+        try:
+            head_rate = float(dsc["sample_rate"])
+            sample_rand = float(dsc["sample_rand"])
+        except (KeyError, TypeError, ValueError):
+            # No baggage: judge by this request's own route, with a value
+            # every app derives alike from the trace id
+            path = urlparse(event.get("request", {}).get("url", "")).path
+            head_rate = self._candidate_rate(path)
+            sample_rand = random.Random(trace.get("trace_id")).random()
+        if sample_rand < head_rate / float(self.config["candidate_factor"]):
+            return event
+        return None
+
+
+def _timestamp(value):
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    return float(value or 0)
+
+
+def _duration(event):
+    try:
+        return _timestamp(event.get("timestamp")) - _timestamp(event.get("start_timestamp"))
+    except (TypeError, ValueError):
+        return 0.0